@@ -0,0 +1,137 @@
+"""
+Benchmark of the import time of the package and its submodules.
+
+Each statement (e.g., ``import rs_rating.stock_indices``) is timed in a fresh
+interpreter, so nothing is imported beforehand, and the heavy third-party
+packages it pulls in (pandas, yfinance, requests, ...) are listed. The
+fastest of the runs is reported, and the results are written as JSON so
+that they can be compared across versions.
+
+Usage:
+~~~~~~
+::
+
+    python benchmarks/bench_import.py --repeat 5 --output import.json
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Statements to time, keyed by name
+STATEMENTS = {
+    'rs_rating': 'import rs_rating',
+    'stock_indices': 'import rs_rating.stock_indices',
+    'stock_indices.get_name': (
+        'from rs_rating.stock_indices import get_name; get_name("SPX")'),
+    'ranking_utils': 'import rs_rating.ranking_utils',
+    'ibd_rs': 'import rs_rating.ibd_rs',
+    'rsm': 'import rs_rating.rsm',
+    'ibd_fin': 'import rs_rating.ibd_fin',
+    'yf_utils': 'import rs_rating.yf_utils',
+    'server': 'import rs_rating.server',
+}
+
+# Third-party packages reported when a statement imports them
+HEAVY = ['numpy', 'pandas', 'yfinance', 'requests', 'bs4']
+
+_CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds,
+                  'modules': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+#------------------------------------------------------------------------------
+# Benchmark
+#------------------------------------------------------------------------------
+
+def time_statement(statement, repeat=5):
+    """
+    Time a statement in fresh interpreters.
+
+    Parameters
+    ----------
+    statement: str
+        The Python statement (e.g., 'import rs_rating.ibd_rs').
+    repeat: int, optional
+        Number of interpreters; the fastest run is reported. Defaults to 5.
+
+    Returns
+    -------
+    dict
+        The statement, the fastest time in seconds, and the heavy packages
+        it imported.
+    """
+    code = _CHILD.format(statement=statement, heavy=HEAVY)
+    env = dict(os.environ, PYTHONPATH=ROOT, RS_RATING_NO_CACHE='1')
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], env=env, cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.splitlines()[-1]))
+    return {
+        'statement': statement,
+        'seconds': round(min(run['seconds'] for run in runs), 4),
+        'modules': runs[0]['modules'],
+    }
+
+
+def environment():
+    """Return the versions and the machine of the benchmark."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=ROOT).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--statements', nargs='+', choices=list(STATEMENTS),
+                        default=list(STATEMENTS),
+                        help='statements to time (default: all)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs per statement; the fastest is reported')
+    parser.add_argument('--output', default=None,
+                        help='JSON file of the results (default: stdout)')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.statements:
+        result = {'name': name, **time_statement(STATEMENTS[name],
+                                                 args.repeat)}
+        results.append(result)
+        print(f"{name:24s} {result['seconds'] * 1000:9.1f} ms  "
+              f"{' '.join(result['modules'])}", file=sys.stderr)
+
+    report = json.dumps({'environment': environment(), 'results': results},
+                        indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
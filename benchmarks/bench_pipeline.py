@@ -0,0 +1,373 @@
+"""
+Benchmark of the ranking pipelines on synthetic data.
+
+The network layer is stubbed out: `yf.download` and `yf.Ticker` are replaced
+by a synthetic market that generates prices, info and financials for any
+number of tickers, the local caches are disabled, and the rate limiter lets
+every request through. What is timed is therefore only our own code.
+
+Each run times `ibd_rs.rankings`, `rsm.ranking` and
+`ibd_fin.financial_metric_ranking` end to end, and the stages inside them
+(downloading, info, financials, RS computation, ratings, industry grouping,
+...). Stage times are inclusive (e.g., 'download_prices' is part of
+'download_closes'). The results are written as JSON so that they can be
+compared across versions.
+
+Usage:
+~~~~~~
+::
+
+    python benchmarks/bench_pipeline.py --sizes 100 500 5000 20000 \\
+        --output bench.json
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ['RS_RATING_NO_CACHE'] = '1'     # time our code, not the caches
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import rs_rating
+from rs_rating import ibd_fin, ibd_rs, rsm, yf_utils
+from rs_rating.rate_limit import RateLimiter, set_rate_limiter
+
+
+#------------------------------------------------------------------------------
+# Synthetic Market
+#------------------------------------------------------------------------------
+
+class SyntheticMarket:
+    """
+    Deterministic synthetic prices, info and financials of any ticker.
+
+    Parameters
+    ----------
+    end: str, optional
+        The last date of the bars. Defaults to today.
+    seed: int, optional
+        Seed of the random data. Defaults to 0.
+    """
+    industries = [f'Industry {i}' for i in range(140)]
+    sectors = [f'Sector {i}' for i in range(11)]
+
+    def __init__(self, end=None, seed=0):
+        self.end = pd.Timestamp(end or pd.Timestamp.today().normalize())
+        self.seed = seed
+        self._data = {}
+
+    def prepare(self, tickers, period='2y', intervals=('1d', '1wk')):
+        """
+        Generate the data of tickers in advance, so that generating them is
+        not timed as part of the pipelines.
+        """
+        for ticker in tickers:
+            for interval in intervals:
+                self._bars(ticker, len(self.dates(period, interval)))
+            t = self.ticker(ticker)
+            t.info, t.quarterly_financials, t.financials
+
+    def _rng(self, ticker, salt=0):
+        return np.random.default_rng([self.seed, salt, *ticker.encode()])
+
+    def _cached(self, key, func):
+        if key not in self._data:
+            self._data[key] = func()
+        return self._data[key]
+
+    def _bars(self, ticker, T):
+        """Closes and volumes of the last T bars of a ticker."""
+        def generate():
+            rng = self._rng(ticker)
+            closes = 100 * np.exp(np.cumsum(rng.normal(3e-4, 2e-2, T)))
+            closes[rng.random(T) < 0.005] = np.nan
+            return closes, rng.integers(10**5, 10**7, T).astype(float)
+        return self._cached(('bars', ticker, T), generate)
+
+    def dates(self, period='2y', interval='1d'):
+        start = yf_utils.period_start(period, self.end)
+        freq = {'1d': 'B', '1wk': 'W-FRI', '1mo': 'ME'}[interval]
+        return pd.date_range(start, self.end, freq=freq, name='Date')
+
+    def download(self, tickers, period='2y', interval='1d', start=None,
+                 auto_adjust=True, **kwargs):
+        """Stub of `yf.download` (OHLCV of all tickers)."""
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        index = self.dates(period, interval)
+        T = len(index)
+        bars = [self._bars(ticker, T) for ticker in tickers]
+        closes = np.array([c for c, _ in bars]).reshape(-1, T).T
+        volumes = np.array([v for _, v in bars]).reshape(-1, T).T
+        if start is not None:
+            keep = index >= pd.Timestamp(start)
+            index, closes, volumes = index[keep], closes[keep], volumes[keep]
+
+        fields = {
+            'Close': closes,
+            'High': closes * 1.01,
+            'Low': closes * 0.99,
+            'Open': closes,
+            'Volume': volumes,
+        }
+        columns = pd.MultiIndex.from_product([list(fields), tickers],
+                                             names=['Price', 'Ticker'])
+        return pd.DataFrame(np.concatenate(list(fields.values()), axis=1),
+                            index=index, columns=columns)
+
+    def ticker(self, symbol):
+        """Stub of `yf.Ticker`."""
+        return _SyntheticTicker(self, symbol)
+
+
+class _SyntheticTicker:
+    def __init__(self, market, symbol):
+        self.market = market
+        self.symbol = symbol
+
+    @property
+    def info(self):
+        return self.market._cached(('info', self.symbol), self._info)
+
+    def _info(self):
+        rng = self.market._rng(self.symbol, 1)
+        return {
+            'symbol': self.symbol,
+            'quoteType': 'EQUITY',
+            'longName': f'{self.symbol} Inc.',
+            'sector': rng.choice(self.market.sectors),
+            'industry': rng.choice(self.market.industries),
+            'previousClose': float(rng.uniform(5, 500)),
+            'trailingEps': float(rng.normal(3, 2)),
+            'revenuePerShare': float(rng.uniform(1, 100)),
+            'trailingPE': float(rng.uniform(5, 60)),
+            'marketCap': float(rng.uniform(1e8, 1e12)),
+            'sharesOutstanding': float(rng.uniform(1e7, 1e10)),
+        }
+
+    def _financials(self, n, freq, salt):
+        def generate():
+            rng = self.market._rng(self.symbol, salt)
+            dates = pd.date_range(end=self.market.end, periods=n, freq=freq)
+            return pd.DataFrame({
+                'Basic EPS': rng.normal(1, .5, n).cumsum(),
+                'Operating Revenue': rng.uniform(1e8, 1e9, n).cumsum(),
+                'Net Income': rng.normal(1e7, 5e6, n),
+            }, index=dates).T.iloc[:, ::-1]
+        return self.market._cached((freq, self.symbol), generate)
+
+    @property
+    def quarterly_financials(self):
+        return self._financials(6, 'QE', 2)
+
+    @property
+    def financials(self):
+        return self._financials(4, 'YE', 3)
+
+
+#------------------------------------------------------------------------------
+# Stage Timing
+#------------------------------------------------------------------------------
+
+# Functions timed as stages, by module
+STAGES = {
+    yf_utils: ['download_prices', 'download_tickers_info',
+               'download_financials', 'calc_weighted_metric'],
+    ibd_rs: ['download_closes', 'rs_matrices', 'stock_rs_df',
+             'rank_stock_rs_df', 'append_ratings', 'groupby_industry'],
+    rsm: ['mansfield_relative_strength', 'relative_strength_vs_benchmark',
+          'append_ratings'],
+    ibd_fin: ['metric_strength_vs_benchmark', 'append_ratings'],
+}
+
+
+@contextlib.contextmanager
+def timed_stages(stats):
+    """
+    Time the calls of the stage functions into `stats` ({name: [seconds,
+    calls]}) while in the context.
+    """
+    def timed(name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stat = stats.setdefault(name, [0., 0])
+                stat[0] += time.perf_counter() - t
+                stat[1] += 1
+        return wrapper
+
+    originals = []
+    for module, names in STAGES.items():
+        for name in names:
+            func = getattr(module, name)
+            originals.append((module, name, func))
+            setattr(module, name, timed(name, func))
+    try:
+        yield stats
+    finally:
+        for module, name, func in originals:
+            setattr(module, name, func)
+
+
+#------------------------------------------------------------------------------
+# Benchmarks
+#------------------------------------------------------------------------------
+
+PIPELINES = {
+    'ibd_rs.rankings':
+        lambda tickers: ibd_rs.rankings(tickers, rating_method='rank'),
+    'ibd_rs.rankings[3mo,qcut]':
+        lambda tickers: ibd_rs.rankings(tickers, rating_method='qcut',
+                                        rs_window='3mo'),
+    'ibd_rs.rankings[compact]':
+        lambda tickers: ibd_rs.rankings(tickers, rating_method='rank',
+                                        compact=True),
+    'rsm.ranking':
+        lambda tickers: rsm.ranking(tickers, interval='1wk'),
+    'ibd_fin.financial_metric_ranking':
+        lambda tickers: ibd_fin.financial_metric_ranking(tickers),
+}
+
+
+def run_benchmark(pipeline, n_tickers, repeat=1, market=None):
+    """
+    Time a pipeline on `n_tickers` synthetic tickers.
+
+    Parameters
+    ----------
+    pipeline: str
+        A key of `PIPELINES`.
+    n_tickers: int
+        Number of tickers.
+    repeat: int, optional
+        Number of runs; the fastest one is reported. Defaults to 1.
+    market: SyntheticMarket, optional
+        The synthetic market. Defaults to a new one.
+
+    Returns
+    -------
+    dict
+        The total seconds of the fastest run, the seconds and calls of each
+        stage in it, and the peak RSS of the process.
+    """
+    market = market or SyntheticMarket()
+    tickers = [f'T{i:05d}' for i in range(n_tickers)]
+    market.prepare(tickers)
+    best = None
+    for _ in range(repeat):
+        stats = {}
+        with _stubbed_network(market), timed_stages(stats), \
+                contextlib.redirect_stdout(io.StringIO()):
+            t = time.perf_counter()
+            PIPELINES[pipeline](tickers)
+            total = time.perf_counter() - t
+        if best is None or total < best[0]:
+            best = (total, stats)
+
+    total, stats = best
+    return {
+        'pipeline': pipeline,
+        'n_tickers': n_tickers,
+        'repeat': repeat,
+        'seconds': round(total, 6),
+        'stages': {name: {'seconds': round(s, 6), 'calls': calls}
+                   for name, (s, calls) in sorted(stats.items())},
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+@contextlib.contextmanager
+def _stubbed_network(market):
+    """Replace yfinance's network calls by the synthetic market."""
+    download, ticker = yf.download, yf.Ticker
+    yf.download, yf.Ticker = market.download, market.ticker
+    set_rate_limiter(RateLimiter(rate=1e9, max_rate=1e9, burst=1e9))
+    try:
+        yield
+    finally:
+        yf.download, yf.Ticker = download, ticker
+        set_rate_limiter(None)
+
+
+def _peak_rss_mb():
+    """Peak resident set size of the process in MB (None if unknown)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+
+def environment():
+    """Return the versions and the machine of the benchmark."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'rs_rating': rs_rating.__version__,
+        'ibd_rs': ibd_rs.__version__,
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpus': os.cpu_count(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 500, 5000, 20000],
+                        help='numbers of tickers (default: %(default)s)')
+    parser.add_argument('--pipelines', nargs='+', choices=list(PIPELINES),
+                        default=list(PIPELINES),
+                        help='pipelines to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per benchmark; the fastest is reported')
+    parser.add_argument('--output', default=None,
+                        help='JSON file of the results (default: stdout)')
+    args = parser.parse_args(argv)
+
+    market = SyntheticMarket()
+    results = []
+    for n in args.sizes:
+        for pipeline in args.pipelines:
+            result = run_benchmark(pipeline, n, args.repeat, market)
+            results.append(result)
+            print(f"{pipeline:36s} {n:6d} tickers {result['seconds']:9.3f} s",
+                  file=sys.stderr)
+
+    report = json.dumps({'environment': environment(), 'results': results},
+                        indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
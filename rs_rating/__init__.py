@@ -4,7 +4,7 @@ Initialize widgetify package.
 __software__ = "Google Colab Forms into `ipywidgets` Converter"
 __version__ = "1.0"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/10/04 (initial version) ~ 2024/10/04 (last revision)"
+__date__ = "2024/10/04 (initial version) ~ 2026/10/17 (last revision)"
 
 __all__ = [
     'ibd_rs',
@@ -12,7 +12,35 @@ __all__ = [
     'rsm',
 ]
 
-from . import ibd_rs
-from . import ibd_fin
-from . import rsm
+import importlib
 
+# Submodules are imported on first access (e.g., `rs_rating.ibd_rs`), so that
+# a light one like `stock_indices` or `ranking_utils` does not pull in
+# yfinance with the others.
+_SUBMODULES = {
+    'backtest',
+    'batch',
+    'cache',
+    'ibd_fin',
+    'ibd_rs',
+    'instrument',
+    'ranking_utils',
+    'rate_limit',
+    'results',
+    'rsm',
+    'server',
+    'stock_indices',
+    'yf_utils',
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,371 @@
+"""
+Point-in-Time RS Backtesting
+----------------------------
+
+Checks whether IBD RS ratings predict forward returns. The RS panel of a
+long history (e.g., 20 years of daily closes) is computed once with the
+matrix form of `ibd_rs.relative_strength`, and the tickers are rated on
+every rebalance date with the RS known on that date, instead of one
+download and one `rankings` call per date. The forward returns of the
+stocks are then grouped by RS rank bucket (deciles by default).
+
+A ticker is rated on a date only if it has prices over the whole RS window
+before the date and is not delisted yet, so that the universe of each date
+is point-in-time (given closes that include delisted tickers).
+
+Usage:
+~~~~~~
+::
+
+    from rs_rating import backtest, ibd_rs
+
+    closes = ibd_rs.download_closes(tickers, period='20y')
+    result = backtest.backtest(closes, rebalance='ME', horizon=21)
+
+    print(result['summary'])            # return, hit rate, turnover by decile
+    print(result['spread'].describe())  # top minus bottom decile returns
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+__all__ = [
+    'backtest',
+    'rating_panel',
+    'forward_returns',
+    'rebalance_positions',
+]
+
+import numpy as np
+import pandas as pd
+
+from . import ibd_rs
+from .instrument import stage, staged
+from .ranking_utils import batch_ratings
+
+
+#------------------------------------------------------------------------------
+# Rating Panel
+#------------------------------------------------------------------------------
+
+@staged('backtest.rating_panel')
+def rating_panel(closes, ticker_ref='^GSPC', interval='1d',
+                 rating_method='rank', rs_window='12mo', rebalance='ME',
+                 compact=False):
+    """
+    Rate every ticker on every rebalance date with the RS known on it.
+
+    Parameters
+    ----------
+    closes: pd.DataFrame
+        Closing prices (dates x tickers) including the reference index, as
+        returned by `ibd_rs.download_closes`.
+
+    ticker_ref: str, optional
+        The reference index ticker symbol. Defaults to '^GSPC' (S&P 500).
+
+    interval: str, optional
+        The frequency of the closes ('1d', '1wk' or '1mo'). Defaults to
+        '1d'.
+
+    rating_method: str, optional
+        Method for calculating the ratings ('rank' or 'qcut'). Defaults to
+        'rank'.
+
+    rs_window: str, optional
+        Period for calculating RS ('3mo' or '12mo'). Defaults to '12mo'.
+
+    rebalance: str or int, optional
+        The rebalance dates: a pandas frequency (e.g., 'ME' for the last
+        bar of each month, 'W-FRI' for each week), or a number of bars
+        between them. Defaults to 'ME'.
+
+    compact: bool, optional
+        If True, the closes and the RS panel are float32, which halves the
+        memory of long histories. Defaults to False.
+
+    Returns
+    -------
+    pd.DataFrame
+        int8 ratings (rebalance dates x tickers) ranging from 1 (worst) to
+        99 (best); 0 means not rated on the date (not listed, not enough
+        history or no RS).
+    """
+    rs_df = _rs_panel(closes, ticker_ref, interval, rs_window, rebalance,
+                      compact)
+    with stage('backtest.ratings'):
+        ratings = batch_ratings(rs_df.to_numpy(), rating_method, axis=1)
+    return pd.DataFrame(ratings, index=rs_df.index, columns=rs_df.columns)
+
+
+def _rs_panel(closes, ticker_ref, interval, rs_window, rebalance, compact):
+    """
+    Return the RS (rebalance dates x tickers) of the tickers rated on each
+    rebalance date, NaN for the others (see `rating_panel`).
+    """
+    tickers = [t for t in closes.columns if t != ticker_ref]
+    if compact:
+        closes = closes.astype(np.float32)
+
+    with stage('backtest.relative_strength'):
+        rs_df = ibd_rs.rs_matrices(closes[tickers], closes[[ticker_ref]],
+                                   interval, rs_window)[ticker_ref]
+    positions = rebalance_positions(closes.index, rebalance)
+    rs = rs_df.to_numpy()[positions]
+    del rs_df
+
+    # Rate only the tickers listed over the RS window before each date
+    quarter = ibd_rs.QUARTER_BARS[interval]
+    history = quarter * (4 if rs_window == '12mo' else 1)
+    listed = closes[tickers].notna().to_numpy()
+    first = listed.argmax(axis=0)
+    last = len(listed) - 1 - listed[::-1].argmax(axis=0)
+    rows = positions[:, np.newaxis]
+    rated = listed.any(axis=0) & (first <= rows - history) & (rows <= last)
+    rs[~rated] = np.nan
+    return pd.DataFrame(rs, index=closes.index[positions], columns=tickers)
+
+
+def _rank_buckets(rs, buckets):
+    """
+    Split the non-NaN values of each row into `buckets` buckets of equal
+    size (within one) by rank: 1 holds the lowest values, 0 marks NaN.
+
+    Examples
+    --------
+    >>> _rank_buckets(np.array([[5., np.nan, 1., 3., 2., 4.]]), 3)
+    array([[3, 0, 1, 2, 1, 2]])
+    """
+    valid = ~np.isnan(rs)
+    order = np.argsort(rs, axis=1, kind='stable')   # NaN last
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(rs.shape[1])[np.newaxis],
+                      axis=1)
+    counts = np.maximum(valid.sum(axis=1, keepdims=True), 1)
+    return np.where(valid, ranks * buckets // counts + 1, 0)
+
+
+def rebalance_positions(index, rebalance='ME'):
+    """
+    Return the row positions of the rebalance dates in a DatetimeIndex.
+
+    Parameters
+    ----------
+    index: pd.DatetimeIndex
+        The dates of the bars.
+
+    rebalance: str or int, optional
+        A pandas frequency (the last bar of each period is taken), or a
+        number of bars between the rebalance dates, counted back from the
+        last bar. Defaults to 'ME' (month end).
+
+    Returns
+    -------
+    np.ndarray
+        The increasing row positions.
+
+    Examples
+    --------
+    >>> index = pd.bdate_range('2024-01-25', '2024-03-05')
+    >>> index[rebalance_positions(index, 'ME')].strftime('%m-%d').tolist()
+    ['01-31', '02-29', '03-05']
+    >>> rebalance_positions(index, 10).tolist()
+    [8, 18, 28]
+    """
+    if isinstance(rebalance, (int, np.integer)):
+        return np.arange(len(index) - 1, -1, -rebalance)[::-1]
+    last = pd.Series(np.arange(len(index)), index=index).resample(
+        rebalance).last()
+    return last.dropna().to_numpy(dtype=int)
+
+
+def forward_returns(closes, dates, horizon):
+    """
+    Calculate the returns from the closes of dates to the closes `horizon`
+    bars later.
+
+    Parameters
+    ----------
+    closes: pd.DataFrame
+        Closing prices (dates x tickers). Missing prices are forward-filled,
+        so a ticker delisted within the horizon keeps its last price.
+
+    dates: pd.DatetimeIndex
+        The start dates of the returns (dates of `closes`).
+
+    horizon: int
+        Number of bars of the returns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Forward returns (dates x tickers); NaN where the horizon goes
+        beyond the last bar.
+    """
+    values = closes.ffill().to_numpy(dtype=float)
+    positions = closes.index.get_indexer(dates)
+    end = positions + horizon
+
+    returns = np.full((len(positions), values.shape[1]), np.nan)
+    within = end < len(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[within] = values[end[within]] / values[positions[within]] - 1
+    return pd.DataFrame(returns, index=dates, columns=closes.columns)
+
+
+#------------------------------------------------------------------------------
+# Backtest
+#------------------------------------------------------------------------------
+
+@staged('backtest.backtest')
+def backtest(closes, ticker_ref='^GSPC', interval='1d', rating_method='rank',
+             rs_window='12mo', rebalance='ME', horizon=21, buckets=10,
+             compact=False):
+    """
+    Backtest the RS ratings against the forward returns.
+
+    On each rebalance date, the rated tickers are split by their RS rank
+    into `buckets` buckets of equal size (bucket 1 holds the lowest RS),
+    and the forward returns over `horizon` bars are aggregated by bucket.
+    If the horizon is longer than the time between rebalance dates, the
+    returns of successive dates overlap.
+
+    Parameters
+    ----------
+    closes: pd.DataFrame
+        Closing prices (dates x tickers) including the reference index, as
+        returned by `ibd_rs.download_closes`.
+
+    ticker_ref: str, optional
+        The reference index ticker symbol. Defaults to '^GSPC' (S&P 500).
+
+    interval: str, optional
+        The frequency of the closes ('1d', '1wk' or '1mo'). Defaults to
+        '1d'.
+
+    rating_method: str, optional
+        Method for calculating the ratings ('rank' or 'qcut'). Defaults to
+        'rank'.
+
+    rs_window: str, optional
+        Period for calculating RS ('3mo' or '12mo'). Defaults to '12mo'.
+
+    rebalance: str or int, optional
+        The rebalance dates (see `rebalance_positions`). Defaults to 'ME'.
+
+    horizon: int, optional
+        Number of bars of the forward returns. Defaults to 21 (about a
+        month of daily bars).
+
+    buckets: int, optional
+        Number of RS rank buckets. Defaults to 10 (deciles).
+
+    compact: bool, optional
+        If True, compute the RS panel in float32 (see `rating_panel`).
+        Defaults to False.
+
+    Returns
+    -------
+    dict
+        A dictionary of:
+
+        - 'ratings': The ratings (rebalance dates x tickers) of
+          `rating_panel`.
+        - 'forward_returns': The forward returns (rebalance dates x
+          tickers).
+        - 'benchmark_returns': The forward returns of the reference index.
+        - 'bucket_returns': The mean forward return of each bucket
+          (rebalance dates x buckets).
+        - 'hit_rates': The fraction of the stocks of each bucket that beat
+          the reference index (rebalance dates x buckets).
+        - 'turnover': The fraction of the stocks of each bucket that were
+          not in it on the previous date (rebalance dates x buckets).
+        - 'spread': The return of the top bucket minus that of the bottom
+          one on each date.
+        - 'summary': The mean return, excess return over the reference
+          index, hit rate, turnover and number of stocks of each bucket.
+    """
+    rs_df = _rs_panel(closes, ticker_ref, interval, rs_window, rebalance,
+                      compact)
+    with stage('backtest.ratings'):
+        ratings = pd.DataFrame(
+            batch_ratings(rs_df.to_numpy(), rating_method, axis=1),
+            index=rs_df.index, columns=rs_df.columns)
+    dates = ratings.index
+    with stage('backtest.forward_returns'):
+        returns = forward_returns(closes[ratings.columns], dates, horizon)
+        bench = forward_returns(closes[[ticker_ref]], dates,
+                                horizon)[ticker_ref]
+
+    values = returns.to_numpy()
+    ids = _rank_buckets(rs_df.to_numpy(), buckets)
+    has_return = ~np.isnan(values)
+    beats = values > bench.to_numpy()[:, np.newaxis]
+
+    shape = (len(dates), buckets)
+    means, hits, turnover = np.full(shape, np.nan), np.full(shape, np.nan), \
+        np.full(shape, np.nan)
+    counts = np.zeros(shape, dtype=np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for b in range(buckets):
+            members = ids == b + 1
+            scored = members & has_return
+            counts[:, b] = scored.sum(axis=1)
+            means[:, b] = (np.where(scored, values, 0.).sum(axis=1)
+                           / counts[:, b])
+            hits[:, b] = (scored & beats).sum(axis=1) / counts[:, b]
+            held = members.sum(axis=1)
+            kept = (members[1:] & members[:-1]).sum(axis=1)
+            turnover[1:, b] = 1 - kept / held[1:]
+
+    columns = pd.RangeIndex(1, buckets + 1, name='Bucket')
+    bucket_returns = pd.DataFrame(means, index=dates, columns=columns)
+    hit_rates = pd.DataFrame(hits, index=dates, columns=columns)
+    turnover = pd.DataFrame(turnover, index=dates, columns=columns)
+    counts = pd.DataFrame(counts, index=dates, columns=columns)
+
+    summary = pd.DataFrame({
+        'Mean Return': bucket_returns.mean(),
+        'Excess Return': bucket_returns.sub(bench, axis=0).mean(),
+        'Hit Rate': hit_rates.mean(),
+        'Turnover': turnover.mean(),
+        'Stocks': counts.mean(),
+    })
+
+    return {
+        'ratings': ratings,
+        'forward_returns': returns,
+        'benchmark_returns': bench,
+        'bucket_returns': bucket_returns,
+        'hit_rates': hit_rates,
+        'turnover': turnover,
+        'spread': bucket_returns[buckets] - bucket_returns[1],
+        'summary': summary,
+    }
+
+
+#------------------------------------------------------------------------------
+# Unit Test
+#------------------------------------------------------------------------------
+
+def main(code='SPX', period='10y', horizon=21):
+    from .stock_indices import get_tickers
+
+    tickers = get_tickers(code)
+    closes = ibd_rs.download_closes(tickers, period=period)
+    result = backtest(closes, horizon=horizon)
+
+    print(result['summary'])
+    spread = result['spread'].dropna()
+    print(f"\nTop - bottom decile: {spread.mean():.4f} per {horizon} bars "
+          f"(t = {spread.mean() / spread.std() * len(spread)**.5:.2f})")
+
+
+if __name__ == "__main__":
+    import doctest
+    import time
+
+    doctest.testmod()
+
+    start_time = time.time()
+    main()
+    print(f"Execution time: {time.time() - start_time:.4f} seconds")
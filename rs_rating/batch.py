@@ -0,0 +1,261 @@
+"""
+Batch Runner of Rankings
+------------------------
+
+Runs the rankings of several universes (e.g., SPX, NDX, RUI, RUT, SOX and
+W5000) with several configurations (e.g., the 12-month IBD RS with the rank
+method, the 3-month one with the qcut method, and the weekly RSM) as jobs of
+a process pool, so that the CPU-bound computations after the downloads use
+all the cores.
+
+The prices, info and financials are downloaded once for the union of the
+universes before the pool is started. The workers receive them once
+through the pool initializer (inherited without a copy when the processes
+are forked, and pickled once per worker otherwise), so a job only sends
+the names of its universe and configuration, and receives its tables.
+
+Usage:
+~~~~~~
+::
+
+    from rs_rating import batch
+
+    results = batch.run_batch(
+        ['SPX', 'NDX', 'SOX'],
+        {
+            'rs_12mo': {'method': 'ibd_rs'},
+            'rs_3mo_qcut': {'method': 'ibd_rs', 'rs_window': '3mo',
+                            'rating_method': 'qcut'},
+            'rsm': {'method': 'rsm', 'interval': '1wk'},
+        })
+    stock_df, industry_df = results['SPX', 'rs_12mo']
+    rsm_df = results['SOX', 'rsm']
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+__all__ = [
+    'run_batch',
+]
+
+import concurrent.futures
+import multiprocessing
+
+from . import ibd_rs
+from . import rsm
+from . import yf_utils as yfu
+from .instrument import stage, staged
+
+
+# The default interval of the prices of each method
+INTERVALS = {
+    'ibd_rs': '1d',
+    'rsm': '1wk',
+}
+
+# The data shared by the jobs of a worker process (set by `_init_worker`)
+_data = None
+
+
+#------------------------------------------------------------------------------
+# Batch Runner
+#------------------------------------------------------------------------------
+
+@staged('batch.run_batch')
+def run_batch(universes, configs, period='2y', ticker_ref='^GSPC',
+              max_workers=None, mp_context=None):
+    """
+    Run the rankings of every universe with every configuration on a
+    process pool.
+
+    Parameters
+    ----------
+    universes: dict or list of str
+        A dictionary of the tickers of each universe keyed by its name, or
+        a list of index codes of `stock_indices.get_tickers` (e.g., 'SPX',
+        '^NDX', 'SOX').
+
+    configs: dict
+        A dictionary of configurations keyed by their names. A
+        configuration is a dictionary of the 'method' ('ibd_rs' for
+        `ibd_rs.rankings_from_closes` or 'rsm' for
+        `rsm.ranking_from_prices`) and the keyword arguments of the method
+        (e.g., 'interval', 'ticker_ref', 'rs_window', 'rating_method',
+        'ma', 'lookbacks' and 'compact'). The interval defaults to '1d'
+        for 'ibd_rs' and '1wk' for 'rsm'.
+
+    period: str, optional
+        Duration of the downloaded prices. Defaults to '2y' (two years).
+
+    ticker_ref: str, optional
+        The benchmark of the configurations without a 'ticker_ref'.
+        Defaults to '^GSPC' (S&P 500).
+
+    max_workers: int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+
+    mp_context: str, optional
+        Start method of the worker processes ('fork', 'spawn' or
+        'forkserver'). Defaults to the platform default.
+
+    Returns
+    -------
+    dict
+        A dictionary where each key is a tuple of (universe, configuration)
+        names, and the value is what the method of the configuration
+        returns (the stock and industry ranking tables for 'ibd_rs', and
+        the ranking table for 'rsm').
+
+    Raises
+    ------
+    ValueError
+        If the method of a configuration is not 'ibd_rs' or 'rsm'.
+    """
+    if not isinstance(universes, dict):
+        from .stock_indices import get_tickers
+        universes = {code: get_tickers(code) for code in universes}
+    configs = {name: _resolve_config(config, ticker_ref)
+               for name, config in configs.items()}
+
+    with stage('batch.download'):
+        data = _download(universes, configs, period)
+
+    jobs = [(universe, config) for universe in universes
+            for config in configs]
+    if mp_context is not None:
+        mp_context = multiprocessing.get_context(mp_context)
+
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers, mp_context,
+            initializer=_init_worker, initargs=(data,)) as executor:
+        futures = {executor.submit(_run_job, *job): job for job in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return {job: results[job] for job in jobs}
+
+
+def _resolve_config(config, ticker_ref):
+    """Fill in the defaults of a configuration."""
+    config = dict(config)
+    if config.get('method') not in INTERVALS:
+        raise ValueError("method must be either 'ibd_rs' or 'rsm'")
+    config.setdefault('interval', INTERVALS[config['method']])
+    config.setdefault('ticker_ref', ticker_ref)
+    return config
+
+
+def _download(universes, configs, period):
+    """
+    Download the prices, info and financials needed by the jobs, once for
+    the union of the universes.
+    """
+    tickers = list(dict.fromkeys(
+        ticker for symbols in universes.values() for ticker in symbols))
+    refs = []
+    for config in configs.values():
+        ref = config['ticker_ref']
+        refs += [ref] if isinstance(ref, str) else list(ref)
+    symbols = list(dict.fromkeys(refs + tickers))
+
+    methods = {config['method'] for config in configs.values()}
+    info_fields = ['sector', 'industry']
+    if 'rsm' in methods:
+        info_fields = list(dict.fromkeys(rsm.INFO_FIELDS + info_fields))
+    info = yfu.download_tickers_info(tickers, info_fields)
+
+    # The fields of the prices of each interval
+    fields = {}
+    for config in configs.values():
+        fields.setdefault(config['interval'], set()).update(
+            ['Close', 'Volume'] if config['method'] == 'rsm' else ['Close'])
+
+    prices, closes = {}, {}
+    for interval, interval_fields in fields.items():
+        df = yfu.download_prices(symbols, period, interval,
+                                 fields=sorted(interval_fields))
+        if any(config['method'] == 'rsm' and config['interval'] == interval
+               for config in configs.values()):
+            prices[interval] = df
+        if any(config['method'] == 'ibd_rs'
+               and config['interval'] == interval
+               for config in configs.values()):
+            closes[interval] = df.xs('Close', level='Price', axis=1)
+
+    financials = {}
+    if 'rsm' in methods:
+        equities = [t for t in tickers
+                    if t in info and info[t]['quoteType'] == 'EQUITY']
+        financials = yfu.download_financials(equities, rsm.FINANCIALS_FIELDS)
+
+    return {
+        'universes': universes,
+        'configs': configs,
+        'prices': prices,
+        'closes': closes,
+        'info': info,
+        'financials': financials,
+    }
+
+
+def _init_worker(data):
+    """Keep the data shared by the jobs of a worker process."""
+    global _data
+    _data = data
+
+
+def _run_job(universe, name):
+    """Run the configuration `name` on a universe in a worker process."""
+    tickers = _data['universes'][universe]
+    config = dict(_data['configs'][name])
+    method = config.pop('method')
+    interval = config['interval']
+
+    if method == 'ibd_rs':
+        return ibd_rs.rankings_from_closes(_data['closes'][interval],
+                                           _data['info'], tickers, **config)
+    return rsm.ranking_from_prices(_data['prices'][interval], _data['info'],
+                                   _data['financials'], tickers, **config)
+
+
+#------------------------------------------------------------------------------
+# Unit Test
+#------------------------------------------------------------------------------
+
+def main(codes=('SPX', 'NDX', 'SOX'), out_dir='out'):
+    import os
+    from datetime import datetime
+    from .results import ResultsStore
+
+    configs = {
+        'rs_12mo_rank': {'method': 'ibd_rs'},
+        'rs_3mo_qcut': {'method': 'ibd_rs', 'rs_window': '3mo',
+                        'rating_method': 'qcut'},
+        'rsm_1wk_SMA': {'method': 'rsm'},
+    }
+    results = run_batch(list(codes), configs)
+
+    # Save to CSV
+    print("\n\n***")
+    os.makedirs(out_dir, exist_ok=True)
+    today = datetime.now().strftime('%Y%m%d')
+    store = ResultsStore()
+    for (code, name), tables in results.items():
+        if not isinstance(tables, tuple):
+            tables = (tables,)
+        for table, kind in zip(tables, ['stocks', 'industries']):
+            filename = f'{code}_{name}_{kind}_{today}.csv'
+            table.to_csv(os.path.join(out_dir, filename), index=False)
+            print(f'Your "{filename}" is in the "{out_dir}" folder.')
+            store.append(f'{code}/{name}/{kind}', table)
+    print(f'The tables are appended to "{store.path}".')
+    print("***\n")
+
+
+if __name__ == "__main__":
+    import time
+
+    start_time = time.time()
+    main()
+    print(f"Execution time: {time.time() - start_time:.4f} seconds")
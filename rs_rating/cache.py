@@ -0,0 +1,622 @@
+"""
+Local caches for Yahoo Finance data.
+
+This module keeps downloaded data on disk so that repeated runs do not fetch
+the same data again. The caches are SQLite databases in the directory
+returned by `cache_dir`.
+
+Main Classes:
+~~~~~~~~~~~~~
+- PriceStore: OHLCV bars of tickers, stored column-wise per ticker and
+  interval.
+- InfoCache: Fields of ``yf.Ticker(symbol).info`` with per-field
+  time-to-live.
+- FinancialsStore: Quarterly and annual financial statements, refetched
+  only when a new report is expected.
+
+Environment Variables:
+~~~~~~~~~~~~~~~~~~~~~~
+- RS_RATING_CACHE_DIR: Directory of the cache files. Defaults to
+  ``~/.cache/rs_rating``.
+- RS_RATING_NO_CACHE: If set, the shared caches are disabled and all data
+  are downloaded directly.
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+__all__ = [
+    'cache_dir',
+    'price_store',
+    'info_cache',
+    'financials_store',
+    'PriceStore',
+    'InfoCache',
+    'FinancialsStore',
+]
+
+import contextlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+#------------------------------------------------------------------------------
+# Cache Location
+#------------------------------------------------------------------------------
+
+def cache_dir():
+    """
+    Return the directory of the cache files, creating it if needed.
+
+    Returns
+    -------
+    str
+        The value of the RS_RATING_CACHE_DIR environment variable, or
+        ``~/.cache/rs_rating`` if it is not set.
+    """
+    path = os.environ.get('RS_RATING_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'),
+                                       '.cache', 'rs_rating'))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_enabled():
+    """
+    Return whether the shared caches are enabled (RS_RATING_NO_CACHE unset).
+    """
+    return not os.environ.get('RS_RATING_NO_CACHE')
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_instance(cls):
+    """Return the process-wide instance of a cache class, or None."""
+    if not cache_enabled():
+        return None
+    with _shared_lock:
+        path = os.path.join(cache_dir(), cls.filename)
+        if (cls, path) not in _shared:
+            _shared[cls, path] = cls(path)
+        return _shared[cls, path]
+
+
+class _SQLiteCache:
+    """Base class of the SQLite caches (one connection per operation)."""
+    filename = None
+    schema = ''
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(cache_dir(), self.filename)
+        self.path = path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.schema)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection, commit on success, and close it."""
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+#------------------------------------------------------------------------------
+# Price Store
+#------------------------------------------------------------------------------
+
+class PriceStore(_SQLiteCache):
+    """
+    Local store of OHLCV bars.
+
+    Each (interval, ticker) pair is one row holding the dates and the OHLCV
+    values of all its bars as two binary arrays, so a ticker's history is
+    read and written in one piece. The row also records since when the
+    history is complete and when it was last fetched, which is all
+    `yf_utils.download_prices` needs to download only the missing bars.
+
+    Only the '1d', '1wk' and '1mo' intervals are stored.
+
+    Parameters
+    ----------
+    path: str, optional
+        Path of the SQLite file. Defaults to 'prices.sqlite' in `cache_dir`.
+    """
+    filename = 'prices.sqlite'
+    fields = ['Open', 'High', 'Low', 'Close', 'Volume']
+    intervals = ('1d', '1wk', '1mo')
+    schema = '''
+        CREATE TABLE IF NOT EXISTS bars (
+            interval TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            since INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            dates BLOB NOT NULL,
+            bar_values BLOB NOT NULL,
+            PRIMARY KEY (interval, ticker)
+        ) WITHOUT ROWID;
+    '''
+
+    def coverage(self, tickers, interval):
+        """
+        Return what is stored for each ticker.
+
+        Parameters
+        ----------
+        tickers: list of str
+            Ticker symbols.
+        interval: str
+            Interval of the bars ('1d', '1wk', or '1mo').
+
+        Returns
+        -------
+        dict
+            A dictionary where each key is a stored ticker and the value is
+            a tuple of (since, fetched_at, dates): the date since when the
+            history is complete, the time (seconds since the epoch) of the
+            last fetch, and the dates of the stored bars.
+        """
+        out = {}
+        for ticker, since, fetched_at, dates, _ in self._rows(tickers,
+                                                              interval):
+            out[ticker] = (pd.Timestamp(since), fetched_at,
+                           pd.DatetimeIndex(dates))
+        return out
+
+    def load(self, tickers, interval, start=None, fields=None):
+        """
+        Load stored bars in the layout of `yf.download`.
+
+        Parameters
+        ----------
+        tickers: list of str
+            Ticker symbols.
+        interval: str
+            Interval of the bars ('1d', '1wk', or '1mo').
+        start: pd.Timestamp, optional
+            The first date to load. Defaults to all stored bars.
+        fields: list of str, optional
+            Fields to load ('Open', 'High', 'Low', 'Close', 'Volume').
+            Defaults to all fields.
+
+        Returns
+        -------
+        pd.DataFrame
+            The bars with dates as the index and (Price, Ticker) as the
+            column MultiIndex. Tickers without stored bars are NaN.
+        """
+        fields = sorted(self.fields if fields is None else fields)
+        cols = [self.fields.index(f) for f in fields]
+        rows = {ticker: (dates, values) for ticker, _, _, dates, values
+                in self._rows(tickers, interval)}
+
+        # Union of the dates of all tickers
+        all_dates = [dates for dates, _ in rows.values()]
+        index = np.unique(np.concatenate(all_dates)) if all_dates else (
+            np.array([], dtype='datetime64[ns]'))
+        if start is not None:
+            index = index[index >= np.datetime64(start, 'ns')]
+
+        data = np.full((len(index), len(fields), len(tickers)), np.nan)
+        for j, ticker in enumerate(tickers):
+            if ticker not in rows:
+                continue
+            dates, values = rows[ticker]
+            keep = np.isin(dates, index)
+            pos = np.searchsorted(index, dates[keep])
+            data[pos, :, j] = values[keep][:, cols]
+
+        columns = pd.MultiIndex.from_product([fields, tickers],
+                                             names=['Price', 'Ticker'])
+        return pd.DataFrame(data.reshape(len(index), -1),
+                            index=pd.DatetimeIndex(index, name='Date'),
+                            columns=columns)
+
+    def merge(self, df, interval, since=None, fetched_at=None, replace=False):
+        """
+        Merge downloaded bars into the store.
+
+        Stored bars with the same dates as the new ones are replaced, so a
+        partial bar is overwritten by a later download. Tickers without any
+        bar in `df` (e.g., failed downloads) are left as stored, with their
+        time of the last fetch, so they are downloaded again.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Bars in the layout of `yf.download` (dates x (Price, Ticker)).
+        interval: str
+            Interval of the bars ('1d', '1wk', or '1mo').
+        since: pd.Timestamp, optional
+            The history of the tickers in `df` is complete since this date.
+            Defaults to keeping what is stored (or the first date of `df`
+            for new tickers).
+        fetched_at: float, optional
+            Time of the download in seconds since the epoch. Defaults to
+            now.
+        replace: bool, optional
+            Whether to discard the stored bars of the tickers with bars in
+            `df` instead of merging. Defaults to False.
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+        index = df.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        new_dates = index.to_numpy(dtype='datetime64[ns]')
+        tickers = list(df.columns.get_level_values('Ticker').unique())
+        stored = {} if replace else {
+            ticker: (since_, dates, values) for ticker, since_, _,
+            dates, values in self._rows(tickers, interval)}
+
+        records = []
+        for ticker in tickers:
+            values = np.column_stack([
+                df[(field, ticker)].to_numpy(dtype=float)
+                if (field, ticker) in df.columns
+                else np.full(len(df), np.nan)
+                for field in self.fields
+            ])
+            valid = ~np.isnan(values).all(axis=1)
+            if not valid.any():
+                continue
+            dates, values = new_dates[valid], values[valid]
+
+            if ticker in stored:
+                since_, old_dates, old_values = stored[ticker]
+                keep = ~np.isin(old_dates, dates)
+                dates = np.concatenate([old_dates[keep], dates])
+                values = np.concatenate([old_values[keep], values])
+                order = np.argsort(dates, kind='stable')
+                dates, values = dates[order], values[order]
+            else:
+                since_ = (new_dates[0] if len(new_dates)
+                          else np.datetime64('now', 'ns'))
+            if since is not None:
+                since_ = min(np.datetime64(since, 'ns'),
+                             np.datetime64(since_, 'ns'))
+
+            records.append((
+                interval, ticker, int(np.datetime64(since_, 'ns').astype(
+                    np.int64)), fetched_at,
+                dates.astype('datetime64[ns]').astype(np.int64).tobytes(),
+                np.ascontiguousarray(values, dtype=np.float64).tobytes(),
+            ))
+
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?)',
+                records)
+
+    def _rows(self, tickers, interval):
+        """Return (ticker, since, fetched_at, dates, values) of stored rows."""
+        tickers = list(tickers)
+        rows = []
+        with self._connect() as conn:
+            # Stay below SQLite's limit on the number of host parameters
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i+500]
+                rows += conn.execute(
+                    'SELECT ticker, since, fetched_at, dates, bar_values '
+                    'FROM bars WHERE interval = ? AND ticker IN '
+                    f'({",".join("?" * len(chunk))})',
+                    [interval] + chunk).fetchall()
+
+        return [
+            (ticker, np.datetime64(since, 'ns'), fetched_at,
+             np.frombuffer(dates, dtype=np.int64).astype('datetime64[ns]'),
+             np.frombuffer(values, dtype=np.float64).reshape(
+                 -1, len(self.fields)))
+            for ticker, since, fetched_at, dates, values in rows
+        ]
+
+
+def price_store():
+    """
+    Return the shared PriceStore, or None if the caches are disabled.
+    """
+    return _shared_instance(PriceStore)
+
+
+#------------------------------------------------------------------------------
+# Info Cache
+#------------------------------------------------------------------------------
+
+DAY = 24 * 60 * 60     # seconds in a day
+
+
+class InfoCache(_SQLiteCache):
+    """
+    Local cache of ticker info fields with per-field time-to-live (TTL).
+
+    Fields like 'sector' and 'industry' change rarely and are kept for weeks,
+    while price-dependent fields like 'previousClose' and 'trailingPE' expire
+    within a day. A symbol is served from the cache only if all requested
+    fields are fresh; otherwise its info is fetched again, which refreshes
+    all of its fields.
+
+    Parameters
+    ----------
+    path: str, optional
+        Path of the SQLite file. Defaults to 'info.sqlite' in `cache_dir`.
+    ttls: dict, optional
+        TTLs in seconds of specific fields, overriding the defaults in
+        `InfoCache.ttls`.
+    """
+    filename = 'info.sqlite'
+    schema = '''
+        CREATE TABLE IF NOT EXISTS info (
+            ticker TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (ticker, field)
+        ) WITHOUT ROWID;
+    '''
+
+    # TTL in seconds of each field
+    ttls = {
+        # Fields that rarely change
+        'quoteType': 90 * DAY,
+        'longName': 30 * DAY,
+        'shortName': 30 * DAY,
+        'sector': 30 * DAY,
+        'industry': 30 * DAY,
+        # Fields that change with earnings reports
+        'sharesOutstanding': 7 * DAY,
+        'trailingEps': 7 * DAY,
+        'revenuePerShare': 7 * DAY,
+        # Fields that change with the price
+        'previousClose': DAY / 2,
+        'marketCap': DAY / 2,
+        'trailingPE': DAY / 2,
+    }
+    default_ttl = DAY
+
+    def __init__(self, path=None, ttls=None):
+        super().__init__(path)
+        self.ttls = {**self.ttls, **(ttls or {})}
+
+    def get(self, symbols, fields, now=None):
+        """
+        Look up the fresh info of symbols.
+
+        Parameters
+        ----------
+        symbols: list of str
+            Ticker symbols.
+        fields: list of str
+            Fields to look up.
+        now: float, optional
+            Current time in seconds since the epoch. Defaults to now.
+
+        Returns
+        -------
+        tuple of (dict, list)
+            A dictionary where each key is a symbol with all `fields` fresh
+            and the value is a dictionary of those fields, and the list of
+            the other symbols.
+        """
+        if now is None:
+            now = time.time()
+        symbols = list(symbols)
+        fields = list(fields)
+        rows = []
+        with self._connect() as conn:
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i+500]
+                rows += conn.execute(
+                    'SELECT ticker, field, value, fetched_at FROM info '
+                    f'WHERE ticker IN ({",".join("?" * len(chunk))}) '
+                    f'AND field IN ({",".join("?" * len(fields))})',
+                    chunk + fields).fetchall()
+
+        found = {}
+        for ticker, field, value, fetched_at in rows:
+            if now - fetched_at < self.ttls.get(field, self.default_ttl):
+                found.setdefault(ticker, {})[field] = json.loads(value)
+
+        fresh = {s: {f: found[s][f] for f in fields} for s in symbols
+                 if len(found.get(s, ())) == len(fields)}
+        stale = [s for s in symbols if s not in fresh]
+        return fresh, stale
+
+    def put(self, infos, fetched_at=None):
+        """
+        Store the info of symbols.
+
+        Parameters
+        ----------
+        infos: dict
+            A dictionary where each key is a ticker symbol and the value is
+            a dictionary of its info fields.
+        fetched_at: float, optional
+            Time of the fetch in seconds since the epoch. Defaults to now.
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+        records = [
+            (symbol, field, json.dumps(value, default=str), fetched_at)
+            for symbol, info in infos.items()
+            for field, value in info.items()
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO info VALUES (?, ?, ?, ?)', records)
+
+
+def info_cache():
+    """
+    Return the shared InfoCache, or None if the caches are disabled.
+    """
+    return _shared_instance(InfoCache)
+
+
+#------------------------------------------------------------------------------
+# Financials Store
+#------------------------------------------------------------------------------
+
+class FinancialsStore(_SQLiteCache):
+    """
+    Local store of financial statements that follows the earnings calendar.
+
+    The statements of a ticker only change after the company reports, so
+    each stored statement records when it was fetched and the latest period
+    it contains. A statement is fetched again only when the report of the
+    next period is expected to be out: the latest period plus one period
+    plus a reporting lag (45 days for quarterly reports, 90 days for annual
+    reports). After that date, it is checked at most once a `retry` interval
+    until the new period shows up.
+
+    Parameters
+    ----------
+    path: str, optional
+        Path of the SQLite file. Defaults to 'financials.sqlite' in
+        `cache_dir`.
+    """
+    filename = 'financials.sqlite'
+    schema = '''
+        CREATE TABLE IF NOT EXISTS financials (
+            ticker TEXT NOT NULL,
+            frequency TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            latest_period TEXT,
+            data BLOB NOT NULL,
+            PRIMARY KEY (ticker, frequency)
+        ) WITHOUT ROWID;
+    '''
+
+    # Months of a period and days from the end of a period to its report
+    periods = {
+        'quarterly': (3, 45),
+        'annual': (12, 90),
+    }
+    retry = DAY             # min. seconds between fetches of a due report
+    empty_retry = 7 * DAY   # min. seconds between fetches of empty data
+    max_age = 120 * DAY     # max. seconds a statement is kept without fetch
+
+    def get(self, symbols, frequency, now=None):
+        """
+        Look up the stored statements of symbols that are still current.
+
+        Parameters
+        ----------
+        symbols: list of str
+            Ticker symbols.
+        frequency: str
+            The frequency of the statements ('quarterly' or 'annual').
+        now: float, optional
+            Current time in seconds since the epoch. Defaults to now.
+
+        Returns
+        -------
+        tuple of (dict, list)
+            A dictionary where each key is a symbol with a current statement
+            and the value is the DataFrame of the statement (all fields), and
+            the list of the other symbols.
+        """
+        if now is None:
+            now = time.time()
+        symbols = list(symbols)
+        rows = []
+        with self._connect() as conn:
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i+500]
+                rows += conn.execute(
+                    'SELECT ticker, fetched_at, latest_period, data '
+                    'FROM financials WHERE frequency = ? AND ticker IN '
+                    f'({",".join("?" * len(chunk))})',
+                    [frequency] + chunk).fetchall()
+
+        current = {}
+        for ticker, fetched_at, latest_period, data in rows:
+            if self.is_due(frequency, latest_period, fetched_at, now):
+                continue
+            try:
+                current[ticker] = pickle.loads(data)
+            except Exception:
+                continue    # e.g., pickled by an incompatible pandas
+        return current, [s for s in symbols if s not in current]
+
+    def is_due(self, frequency, latest_period, fetched_at, now):
+        """
+        Return whether a stored statement should be fetched again.
+
+        Parameters
+        ----------
+        frequency: str
+            The frequency of the statement ('quarterly' or 'annual').
+        latest_period: str or None
+            The end date of the latest period in the statement (ISO format),
+            or None if the statement is empty.
+        fetched_at: float
+            Time of the last fetch in seconds since the epoch.
+        now: float
+            Current time in seconds since the epoch.
+
+        Returns
+        -------
+        bool
+            True if the statement should be fetched again.
+        """
+        age = now - fetched_at
+        if age >= self.max_age:
+            return True
+        if latest_period is None:
+            return age >= self.empty_retry
+        if age < self.retry:
+            return False
+        months, lag = self.periods[frequency]
+        expected = (pd.Timestamp(latest_period) + pd.DateOffset(months=months)
+                    + pd.Timedelta(days=lag))
+        return now >= expected.timestamp()
+
+    def put(self, statements, frequency, fetched_at=None):
+        """
+        Store the statements of symbols.
+
+        Parameters
+        ----------
+        statements: dict
+            A dictionary where each key is a ticker symbol and the value is
+            the DataFrame of its statement, one row per period.
+        frequency: str
+            The frequency of the statements ('quarterly' or 'annual').
+        fetched_at: float, optional
+            Time of the fetch in seconds since the epoch. Defaults to now.
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+        records = []
+        for symbol, df in statements.items():
+            latest = None
+            if not df.empty:
+                try:
+                    latest = pd.Timestamp(df.index.max()).isoformat()
+                except (TypeError, ValueError):
+                    pass
+            records.append((symbol, frequency, fetched_at, latest,
+                            pickle.dumps(df)))
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO financials VALUES (?, ?, ?, ?, ?)',
+                records)
+
+
+def financials_store():
+    """
+    Return the shared FinancialsStore, or None if the caches are disabled.
+    """
+    return _shared_instance(FinancialsStore)
@@ -27,7 +27,7 @@ For example:
 """
 __version__ = "1.5"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/09/15 (initial version) ~ 2024/10/07 (last revision)"
+__date__ = "2024/09/15 (initial version) ~ 2026/10/17 (last revision)"
 
 __all__ = [
     'metric_strength_vs_benchmark',
@@ -38,12 +38,14 @@ import numpy as np
 import pandas as pd
 
 from . import yf_utils as yfu
+from .instrument import staged
 from .ranking_utils import append_ratings
 
 #------------------------------------------------------------------------------
 # Financial Metric Relative Strength
 #------------------------------------------------------------------------------
 
+@staged('ibd_fin.metric_strength_vs_benchmark')
 def metric_strength_vs_benchmark(quarterly_metric, annual_metric,
                                  quarterly_bench, annual_bench):
     """
@@ -206,6 +208,7 @@ def qoq_growth(data_series):
 # Financial Metric Ranking
 #------------------------------------------------------------------------------
 
+@staged('ibd_fin.financial_metric_ranking')
 def financial_metric_ranking(tickers):
     # Fetch info for stocks
     info = yfu.download_tickers_info(
@@ -294,6 +297,7 @@ def financial_metric_ranking(tickers):
 def main(out_dir='out'):
     import os
     from datetime import datetime
+    from .results import ResultsStore
     from .stock_indices import get_tickers
 
     code = 'SOX'
@@ -312,6 +316,9 @@ def main(out_dir='out'):
     filename = f'{code}_stocks_fin_{today}.csv'
     rank.to_csv(os.path.join(out_dir, filename), index=False)
     print(f'Your "{filename}" is in the "{out_dir}" folder.')
+    store = ResultsStore()
+    store.append(f'{code}/fin/stocks', rank)
+    print(f'The table is appended to "{store.path}".')
     print("***\n")
 
 
@@ -45,20 +45,68 @@ See Also:
 """
 __version__ = "5.2"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/05 (initial version) ~ 2025/07/19 (last revision)"
+__date__ = "2024/08/05 (initial version) ~ 2026/10/17 (last revision)"
 
 __all__ = [
     'relative_strength',
     'relative_strength_3m',
+    'relative_strength_matrix',
+    'relative_strength_3m_matrix',
     'rankings',
+    'multi_rankings',
+    'rankings_from_closes',
+    'rating_history',
+    'RSUpdater',
+    'RSStream',
 ]
 
+import time
+
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
 from . import yf_utils as yfu
-from .ranking_utils import append_ratings, groupby_industry
+from .instrument import stage, staged
+from .ranking_utils import (append_ratings, batch_ratings,
+                            cross_sectional_ratings, groupby_industry,
+                            lookback_snapshots)
+
+
+# The lookback columns of the ranking tables ('1 Month Ago', ...)
+LOOKBACKS = [pd.DateOffset(months=n) for n in (1, 3, 6)]
+
+# Number of bars in a quarter (3 months) of each interval, based on 252
+# trading days in a year and 6.5-hour regular sessions (Yahoo's hourly bars
+# start on the half hour, so a session has seven of them)
+QUARTER_BARS = {
+    '1m': 63 * 390,
+    '2m': 63 * 195,
+    '5m': 63 * 78,
+    '15m': 63 * 26,
+    '30m': 63 * 13,
+    '60m': 63 * 7,
+    '1h': 63 * 7,
+    '90m': 63 * 5,
+    '1d': 252//4,   # 252 trading days in a year
+    '1wk': 52//4,   # 52 weeks in a year
+    '1mo': 12//4,   # 12 months in a year
+}
+
+# Intervals whose RS is taken over the available history when it is shorter
+# than the RS window. The intraday ones must cover the window instead: Yahoo
+# serves only about 60 days of bars of 90m and shorter, less than a quarter.
+_LONG_INTERVALS = ('1d', '1wk', '1mo')
+
+
+def _check_history(length, interval, periods):
+    """
+    Raise ValueError if `length` closes of an intraday interval do not cover
+    `periods` bars (plus the last one).
+    """
+    if interval not in _LONG_INTERVALS and length <= periods:
+        raise ValueError(
+            f"{length} bars of interval '{interval}' do not cover the "
+            f"{periods + 1} bars of the RS window")
 
 
 #------------------------------------------------------------------------------
@@ -89,7 +137,8 @@ def relative_strength(closes, closes_ref, interval='1d'):
     Here gf means "growth factor", i.e., "price ratio"
 
     The quarter-weighted growth is calculated using the `weighted_growth`
-    function.
+    function. This is a single-series wrapper over
+    `relative_strength_matrix`.
 
     Parameters
     ----------
@@ -101,7 +150,9 @@ def relative_strength(closes, closes_ref, interval='1d'):
 
     interval: str, optional
         The frequency of the data points. Must be one of '1d' for daily data,
-        '1wk' for weekly data, or '1mo' for monthly data. Defaults to '1d'.
+        '1wk' for weekly data, '1mo' for monthly data, or an intraday
+        interval of `QUARTER_BARS` (e.g., '5m' or '1h'), whose closes must
+        cover the RS window. Defaults to '1d'.
 
     Returns
     -------
@@ -115,10 +166,8 @@ def relative_strength(closes, closes_ref, interval='1d'):
     >>> rs = relative_strength(stock_closes, index_closes)
 
     """
-    ret_stock = weighted_growth(closes, interval)
-    ret_ref = weighted_growth(closes_ref, interval)
-    rs = (1 + ret_stock) / (1 + ret_ref) * 100
-    return round(rs, 2)
+    rs = relative_strength_matrix(closes.to_frame(), closes_ref, interval)
+    return rs.iloc[:, 0].rename(closes.name)
 
 
 def weighted_growth(closes, interval):
@@ -146,7 +195,9 @@ def weighted_growth(closes, interval):
         Closing prices of the stock/index.
     interval: str, optional
         The frequency of the data points. Must be one of '1d' for daily
-        data, '1wk' for weekly data, or '1mo' for monthly data.
+        data, '1wk' for weekly data, '1mo' for monthly data, or an intraday
+        interval of `QUARTER_BARS` (e.g., '5m' or '1h'), whose closes must
+        cover the RS window.
 
     Returns
     -------
@@ -171,7 +222,8 @@ def quarters_growth(closes, n, interval):
 
     This function uses 63 trading days (252 / 4) as an approximation for
     one quarter. This is based on the common assumption of 252 trading
-    days in a year.
+    days in a year. The number of bars of a quarter of each interval is
+    given by `QUARTER_BARS`.
 
     Parameters
     ----------
@@ -183,7 +235,9 @@ def quarters_growth(closes, n, interval):
 
     interval: str, optional
         The frequency of the data points. Must be one of '1d' for daily data,
-        '1wk' for weekly data, or '1mo' for monthly data.
+        '1wk' for weekly data, '1mo' for monthly data, or an intraday
+        interval of `QUARTER_BARS` (e.g., '5m' or '1h'), whose closes must
+        cover the RS window.
 
     Returns
     -------
@@ -195,11 +249,8 @@ def quarters_growth(closes, n, interval):
     >>> closes = pd.Series([100, 102, 105, 103, 107, 110, 112])
     >>> quarterly_growth = quarters_growth(closes, 1)
     """
-    quarter = {
-        '1d': 252//4,   # 252 trading days in a year
-        '1wk': 52//4,   # 52 weeks in a year
-        '1mo': 12//4,   # 12 months in a year
-    }[interval]
+    quarter = QUARTER_BARS[interval]
+    _check_history(len(closes), interval, quarter * n)
     periods = min(len(closes) - 1, quarter * n)
 
     growth = closes.ffill().pct_change(periods=periods, fill_method=None)
@@ -220,6 +271,8 @@ def relative_strength_3m(closes, closes_ref, interval='1d'):
     period. This rating is designed to help investors quickly gauge the
     strength of a stock's performance relative to the market.
 
+    This is a single-series wrapper over `relative_strength_3m_matrix`.
+
     Parameters
     ----------
     closes: pd.Series
@@ -230,7 +283,9 @@ def relative_strength_3m(closes, closes_ref, interval='1d'):
 
     interval: str, optional
         The frequency of the data points. Must be one of '1d' for daily data,
-        '1wk' for weekly data, or '1mo' for monthly data. Defaults to '1d'.
+        '1wk' for weekly data, '1mo' for monthly data, or an intraday
+        interval of `QUARTER_BARS` (e.g., '5m' or '1h'), whose closes must
+        cover the RS window. Defaults to '1d'.
 
     Returns
     -------
@@ -239,37 +294,334 @@ def relative_strength_3m(closes, closes_ref, interval='1d'):
         places. The values represent the stock's performance relative to the
         benchmark index, with 100 indicating parity.
     """
-    # Determine the number of trading days for the specified interval
-    span = {
-        '1d': 252 // 4,  # a 3-month period based on 252 trading days in a year
-        '1wk': 52 // 4,  # 13 weeks (3 months) for weekly data
-        '1mo': 12 // 4,  # 3 months for monthly data
-    }[interval]
+    rs = relative_strength_3m_matrix(closes.to_frame(), closes_ref, interval)
+    return rs.iloc[:, 0].rename(closes.name)
+
+
+#------------------------------------------------------------------------------
+# Matrix RS Engine (dates x tickers)
+#------------------------------------------------------------------------------
+
+def relative_strength_matrix(closes, closes_ref, interval='1d'):
+    """
+    Calculate the relative strength of many stocks at once.
+
+    This is the matrix form of `relative_strength`. Instead of evaluating one
+    stock per call, it takes the whole table of closing prices (dates x
+    tickers) and computes the quarter-weighted growths of all columns with a
+    few column-wise NumPy operations. The benchmark-side growth is computed
+    only once.
+
+    Parameters
+    ----------
+    closes: pd.DataFrame
+        Closing prices of the stocks, one column per ticker.
+
+    closes_ref: pd.Series
+        Closing prices of the reference index. It is aligned to the index of
+        `closes` after its growth is computed.
+
+    interval: str, optional
+        The frequency of the data points. Must be one of '1d' for daily data,
+        '1wk' for weekly data, '1mo' for monthly data, or an intraday
+        interval of `QUARTER_BARS` (e.g., '5m' or '1h'), whose closes must
+        cover the RS window. Defaults to '1d'.
+
+    Returns
+    -------
+    pd.DataFrame
+        Relative strength values, with the same index and columns as
+        `closes`.
+
+    Example
+    -------
+    >>> closes = pd.DataFrame({'A': [100, 102, 105, 103, 107],
+    ...                        'B': [50, 49, 51, 53, 52]})
+    >>> index_closes = pd.Series([1000, 1010, 1015, 1005, 1020])
+    >>> rs = relative_strength_matrix(closes, index_closes)
+    """
+    return rs_matrices(closes, {None: closes_ref}, interval, '12mo')[None]
+
+
+def relative_strength_3m_matrix(closes, closes_ref, interval='1d'):
+    """
+    Calculate the 3-Month Relative Strength of many stocks at once.
+
+    This is the matrix form of `relative_strength_3m`. The EMA recursion runs
+    once over the dates with every ticker handled as one column of a NumPy
+    array, and the rolling sums are taken from cumulative sums.
+
+    Parameters
+    ----------
+    closes: pd.DataFrame
+        Closing prices of the stocks, one column per ticker.
+
+    closes_ref: pd.Series
+        Closing prices of the reference index. It is aligned to the index of
+        `closes` after its growth is computed.
+
+    interval: str, optional
+        The frequency of the data points. Must be one of '1d' for daily data,
+        '1wk' for weekly data, '1mo' for monthly data, or an intraday
+        interval of `QUARTER_BARS` (e.g., '5m' or '1h'), whose closes must
+        cover the RS window. Defaults to '1d'.
+
+    Returns
+    -------
+    pd.DataFrame
+        3-Month relative strength values, rounded to two decimal places,
+        with the same index and columns as `closes`.
+    """
+    return rs_matrices(closes, {None: closes_ref}, interval, '3mo')[None]
+
+
+def rs_matrices(closes, closes_refs, interval='1d', rs_window='12mo'):
+    """
+    Calculate the relative strength of many stocks against several reference
+    indexes at once.
+
+    The stock-side growths are computed only once and divided by the growth
+    of each reference index in turn.
+
+    Parameters
+    ----------
+    closes: pd.DataFrame
+        Closing prices of the stocks, one column per ticker.
+
+    closes_refs: dict or pd.DataFrame
+        Closing prices of the reference indexes: a dictionary of pd.Series
+        or a DataFrame with one column per index. Each index is aligned to
+        the index of `closes` after its growth is computed.
+
+    interval: str, optional
+        The frequency of the data points. Must be one of '1d' for daily data,
+        '1wk' for weekly data, '1mo' for monthly data, or an intraday
+        interval of `QUARTER_BARS` (e.g., '5m' or '1h'), whose closes must
+        cover the RS window. Defaults to '1d'.
+
+    rs_window: str, optional
+        The period for calculating RS. Either '3mo' (see
+        `relative_strength_3m_matrix`) or '12mo' (see
+        `relative_strength_matrix`). Defaults to '12mo'.
+
+    Returns
+    -------
+    dict
+        A dictionary where each key is a key (column) of `closes_refs` and
+        the value is the RS panel against that index, with the same index
+        and columns as `closes`.
+
+    Raises
+    ------
+    ValueError
+        If the closes of an intraday interval do not cover the RS window
+        (e.g., 60 days of '5m' bars for the 12-month RS).
+
+    Example
+    -------
+    >>> closes = pd.DataFrame({'A': [100, 102, 105, 103, 107],
+    ...                        'B': [50, 49, 51, 53, 52]})
+    >>> refs = pd.DataFrame({'X': [1000, 1010, 1015, 1005, 1020],
+    ...                      'Y': [500, 505, 499, 510, 515]})
+    >>> list(rs_matrices(closes, refs))
+    ['X', 'Y']
+    """
+    factor = _rs_factor_values(_to_values(closes), interval, rs_window)
+
+    rs_dfs = {}
+    for key, closes_ref in closes_refs.items():
+        factor_ref = _rs_factor_values(_to_values(closes_ref), interval,
+                                       rs_window)
+        factor_ref = _align_ref(factor_ref, closes_ref.index, closes.index)
+        if rs_window == '3mo':
+            factor_ref = np.abs(factor_ref)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = factor / factor_ref * 100
+        rs_dfs[key] = pd.DataFrame(np.round(rs, 2),
+                                   index=closes.index, columns=closes.columns)
+    return rs_dfs
+
+
+def _rs_factor_values(values, interval, rs_window):
+    """
+    Growth factors (growth + 1) of a 2D array of closing prices, whose
+    ratio to those of a reference index is the RS of an RS window.
+    """
+    if rs_window not in ('3mo', '12mo'):
+        raise ValueError("rs_window must be either '3mo' or '12mo'")
+    span = QUARTER_BARS[interval]
+    _check_history(len(values), interval,
+                   span * (4 if rs_window == '12mo' else 1))
+    if rs_window == '12mo':
+        return 1 + _weighted_growth_values(values, interval)
+
+    # The number of bars of a 3-month period for the interval
+    return _ema_growth_sum_values(values, span) + 1
+
+
+def _to_values(closes):
+    """
+    Return closing prices as a 2D float array (dates x tickers), float32 if
+    the prices are (see the `compact` option of `build_stock_rs_df`).
+    """
+    dtypes = closes.dtypes if isinstance(closes, pd.DataFrame) else \
+        pd.Series([closes.dtype])
+    dtype = np.float32 if (dtypes == np.float32).all() else float
+    values = closes.to_numpy(dtype=dtype)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    return values
+
+
+def _align_ref(values, index_ref, index):
+    """Align the single-column array of a reference series to `index`."""
+    if index_ref.equals(index):
+        return values
+    aligned = pd.Series(values[:, 0], index=index_ref).reindex(index)
+    return aligned.to_numpy()[:, np.newaxis]
+
+
+def _ffill_values(values):
+    """Forward-fill NaNs down each column of a 2D array."""
+    rows = np.arange(len(values))[:, np.newaxis]
+    idx = np.where(np.isnan(values), 0, rows)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return np.take_along_axis(values, idx, axis=0)
+
+
+def _pct_change_values(values, periods):
+    """Column-wise `pct_change(periods, fill_method=None).fillna(0)`."""
+    growth = np.zeros_like(values)
+    if periods > 0:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth[periods:] = values[periods:] / values[:-periods] - 1
+    growth[np.isnan(growth)] = 0
+    return growth
+
+
+def _weighted_growth_values(values, interval):
+    """
+    Matrix form of `weighted_growth` on a 2D array of closing prices.
+
+    The prices are forward-filled once, and the growths over the last one to
+    four quarters are taken for all columns at the same time.
+    """
+    quarter = QUARTER_BARS[interval]
+    values = _ffill_values(values)
+    p1, p2, p3, p4 = (
+        _pct_change_values(values, min(len(values) - 1, quarter * n))
+        for n in (1, 2, 3, 4)
+    )
+    return (2 * p1 + p2 + p3 + p4) / 5
+
 
-    # Calculate daily growths (returns) for the stock and reference index
-    growth_stock = closes.pct_change(fill_method=None).fillna(0)
-    growth_ref = closes_ref.pct_change(fill_method=None).fillna(0)
+def _ema_growth_sum_values(values, span):
+    """
+    Rolling sum (over `span` rows) of the EMA of one-period growths.
+
+    This is the per-column core of `relative_strength_3m`, with the same
+    semantics as ``pct_change(fill_method=None).fillna(0)`` followed by
+    ``ewm(span=span, adjust=False).mean()`` and
+    ``rolling(window=span, min_periods=1).sum()``.
+    """
+    ema = _ema_values(_pct_change_values(values, 1), span)
 
-    # Calculate the Exponential Moving Average (EMA) of the growths
-    ema_growth_stock = growth_stock.ewm(span=span, adjust=False).mean()
-    ema_growth_ref = growth_ref.ewm(span=span, adjust=False).mean()
+    # Rolling sums from the cumulative sums
+    cum = np.cumsum(ema, axis=0)
+    cum[span:] = cum[span:] - cum[:-span]
+    return cum
 
-    # Calculate the cumulative sums
-    cum_sotck = ema_growth_stock.rolling(window=span, min_periods=1).sum()
-    cum_ref = ema_growth_ref.rolling(window=span, min_periods=1).sum()
 
-    # Calculate the relative strength (RS).
-    rs = (cum_sotck + 1) / (cum_ref + 1).abs() * 100
+def _ema_values(growth, span, ema_prev=None):
+    """
+    Column-wise ``ewm(span=span, adjust=False).mean()`` of a 2D array.
 
-    return rs.round(2)  # Return the RS values rounded to two decimal places
+    The recursion runs over the dates, vectorized over the tickers. If
+    `ema_prev` (the EMA row before `growth`) is given, the recursion is
+    continued from it.
+    """
+    alpha = 1. / (1. + (span - 1) / 2.)
+    old_wt, new_wt = 1. - alpha, alpha
+    ema = np.empty_like(growth)
+    for i in range(len(growth)):
+        if i > 0:
+            ema_prev = ema[i-1]
+        elif ema_prev is None:
+            ema[0] = growth[0]
+            continue
+        ema[i] = (old_wt * ema_prev + new_wt * growth[i]) / (old_wt + new_wt)
+    return ema
 
 
 #------------------------------------------------------------------------------
 # IBD RS Rankings (with RS rating)
 #------------------------------------------------------------------------------
 
+@staged('ibd_rs.download_closes')
+def download_closes(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
+                    max_age=None, compact=False):
+    """
+    Batch download the closing prices of stocks and a reference index.
+
+    Parameters
+    ----------
+    tickers : list
+        List of stock tickers.
+
+    ticker_ref : str or list of str, optional
+        The reference index ticker symbol, or a list of them. Default is
+        '^GSPC' (S&P 500).
+
+    period : str, optional
+        The duration for which historical stock data is fetched. Default is
+        '2y' (two years).
+
+    interval : str, optional
+        The time interval between data points. Can be '1d' (daily), '1wk'
+        (weekly), or '1mo' (monthly). Default is '1d'.
+
+    max_age : float, optional
+        Maximum age in seconds of locally stored prices that are used
+        without a download. Default is None (prices fetched earlier on the
+        same day are used). See `yf_utils.download_prices`.
+
+    compact : bool, optional
+        If True, the closing prices are returned as float32. Default is
+        False.
+
+    Returns
+    -------
+    pd.DataFrame
+        Closing prices (dates x tickers), including the reference index.
+    """
+    df = yfu.download_prices(_ref_list(ticker_ref) + tickers, period,
+                             interval, fields=['Close'], max_age=max_age)
+    closes = df.xs('Close', level='Price', axis=1)
+    return closes.astype(np.float32) if compact else closes
+
+
+def _ref_list(ticker_ref):
+    """Return the reference index ticker(s) as a list."""
+    if isinstance(ticker_ref, str):
+        return [ticker_ref]
+    return list(ticker_ref)
+
+
+def rs_matrix_func(rs_window):
+    """
+    Select the matrix RS function for an RS window ('3mo' or '12mo').
+    """
+    return {
+        '3mo': relative_strength_3m_matrix,
+        '12mo': relative_strength_matrix,
+    }[rs_window]
+
+
+@staged('ibd_rs.build_stock_rs_df')
 def build_stock_rs_df(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
-                      rs_window='12mo'):
+                      rs_window='12mo', chunk_size=None, lookbacks=None,
+                      compact=False):
     """
     Calculates the Relative Strength (RS) of a list of stock tickers compared
     to a reference index and returns a DataFrame of stock rankings.
@@ -279,8 +631,10 @@ def build_stock_rs_df(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
     tickers : list
         List of stock tickers to analyze.
 
-    ticker_ref : str, optional
+    ticker_ref : str or list of str, optional
         The reference index ticker symbol. Default is '^GSPC' (S&P 500).
+        If a list is given, the stock prices are downloaded and their
+        growths computed once, and the RS is computed against each index.
 
     period : str, optional
         The duration for which historical stock data is fetched. Default is
@@ -294,10 +648,31 @@ def build_stock_rs_df(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
         The period for calculating RS. Either '3mo' or '12mo'. Default is
         '12mo'.
 
+    chunk_size : int, optional
+        If given, the closing prices are downloaded and the RS is computed
+        for `chunk_size` tickers at a time, and only the per-ticker results
+        are kept, so that the peak memory does not grow with the number of
+        tickers. The reference index is downloaded once, and every chunk is
+        aligned to its dates. Default is None (all tickers at once).
+
+    lookbacks : dict or list, optional
+        The lookback offsets of the past RS columns (see
+        `ranking_utils.lookback_snapshots`). Default is `LOOKBACKS` (1, 3
+        and 6 months ago).
+
+    compact : bool, optional
+        If True, the closing prices and RS are computed and stored as
+        float32 instead of float64, and 'Sector' and 'Industry' are
+        categorical, which about halves the memory of the panels. The RS
+        values may differ from the float64 ones in the last rounded digit.
+        Default is False.
+
     Returns
     -------
-    pd.DataFrame
-        DataFrame containing stock information and RS values:
+    pd.DataFrame or dict
+        DataFrame containing stock information and RS values (or, if
+        `ticker_ref` is a list, a dictionary of such DataFrames keyed by
+        the reference index ticker):
         - 'Ticker': Stock ticker
         - 'Price': Latest stock price
         - 'Sector': Sector of the stock
@@ -307,45 +682,118 @@ def build_stock_rs_df(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
         - '3 Months Ago': RS value three months ago
         - '6 Months Ago': RS value six months ago
     """
-    # Select the appropriate relative strength function based on the rs_window
-    rs_func = {
-        '3mo': relative_strength_3m,
-        '12mo': relative_strength,
-    }[rs_window]
+    refs = _ref_list(ticker_ref)
+    if chunk_size is not None:
+        stock_dfs = _build_stock_rs_df_chunked(tickers, refs, period,
+                                               interval, rs_window, chunk_size,
+                                               lookbacks, compact)
+    else:
+        # Batch download stock data
+        df = download_closes(tickers, refs, period, interval,
+                             compact=compact)
+
+        # Batch download stock info
+        info = yfu.download_tickers_info(tickers, ['sector', 'industry'])
+
+        stock_dfs = _stock_rs_dfs(df, info, tickers, refs, interval,
+                                  rs_window, lookbacks)
+
+    if compact:
+        stock_dfs = {ref: _categorize(df) for ref, df in stock_dfs.items()}
+
+    if isinstance(ticker_ref, str):
+        return stock_dfs[ticker_ref]
+    return stock_dfs
+
+
+def _stock_rs_dfs(df, info, tickers, refs, interval, rs_window, lookbacks):
+    """
+    Create the stock DataFrames of `build_stock_rs_df` from downloaded
+    closing prices; return a dictionary of them keyed by `refs`.
+    """
+    # Calculate the RS panels (dates x tickers) for all stocks at once
+    closes = df[tickers]
+    with stage('ibd_rs.relative_strength'):
+        rs_dfs = rs_matrices(closes, df[refs], interval, rs_window)
+
+    prices = closes.ffill().iloc[-1]
+    return {ref: stock_rs_df(prices, rs_df, info, lookbacks)
+            for ref, rs_df in rs_dfs.items()}
 
-    # Batch download stock data
-    df = yf.download([ticker_ref] + tickers, period=period, interval=interval,
-                     auto_adjust=True)
-    df = df.xs('Close', level='Price', axis=1)
 
-    # Batch download stock info
+def _build_stock_rs_df_chunked(tickers, refs, period, interval, rs_window,
+                               chunk_size, lookbacks, compact):
+    """
+    `build_stock_rs_df` that downloads and computes `chunk_size` tickers at
+    a time; return a dictionary of the stock DataFrames keyed by `refs`.
+    """
+    closes_refs = download_closes([], refs, period, interval,
+                                  compact=compact)[refs]
     info = yfu.download_tickers_info(tickers, ['sector', 'industry'])
 
-    # Calculate RS values for all stocks
-    rs_data = []
-    for ticker in tickers:
-        rs_series = rs_func(df[ticker], df[ticker_ref], interval)
-        end_date = rs_series.index[-1]
-
-        rs_data.append({
-            'Ticker': ticker,
-            'Price': df[ticker].asof(end_date).round(2),
-            'Sector': info[ticker]['sector'],
-            'Industry': info[ticker]['industry'],
-            'RS': rs_series.asof(end_date),
-            '1 Month Ago': rs_series.asof(end_date - pd.DateOffset(months=1)),
-            '3 Months Ago': rs_series.asof(end_date - pd.DateOffset(months=3)),
-            '6 Months Ago': rs_series.asof(end_date - pd.DateOffset(months=6)),
-        })
+    frames = {ref: [] for ref in refs}
+    for _, df in yfu.download_price_chunks(tickers, chunk_size, period,
+                                           interval, fields=['Close'],
+                                           index=closes_refs.index):
+        closes = df.xs('Close', level='Price', axis=1)
+        if compact:
+            closes = closes.astype(np.float32)
+        with stage('ibd_rs.relative_strength'):
+            rs_dfs = rs_matrices(closes, closes_refs, interval, rs_window)
+        prices = closes.ffill().iloc[-1]
+        for ref, rs_df in rs_dfs.items():
+            frames[ref].append(stock_rs_df(prices, rs_df, info, lookbacks))
+    return {ref: pd.concat(frames[ref], ignore_index=True) for ref in refs}
+
+
+def _categorize(stock_df):
+    """Store the 'Sector' and 'Industry' columns as categoricals."""
+    return stock_df.astype({'Sector': 'category', 'Industry': 'category'})
 
-    # Create DataFrame from RS data
-    stock_df = pd.DataFrame(rs_data)
 
-    return stock_df
+@staged('ibd_rs.stock_rs_df')
+def stock_rs_df(prices, rs_df, info, lookbacks=None):
+    """
+    Create the stock DataFrame of `build_stock_rs_df` from an RS panel.
+
+    Parameters
+    ----------
+    prices : pd.Series
+        Latest price of each stock, indexed by ticker.
+
+    rs_df : pd.DataFrame
+        RS panel (dates x tickers). The last row is taken as the current RS.
 
+    info : dict
+        A dictionary where each key is a stock ticker and the value is a
+        dictionary with the 'sector' and 'industry' of the ticker.
 
+    lookbacks : dict or list, optional
+        The lookback offsets of the past RS columns. Default is `LOOKBACKS`.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame containing stock information and RS values, with the same
+        columns as the one returned by `build_stock_rs_df`.
+    """
+    tickers = list(rs_df.columns)
+    snapshots = lookback_snapshots(
+        rs_df, LOOKBACKS if lookbacks is None else lookbacks, current='RS')
+
+    return pd.DataFrame({
+        'Ticker': tickers,
+        'Price': prices[tickers].round(2).to_numpy(),
+        'Sector': [info[ticker]['sector'] for ticker in tickers],
+        'Industry': [info[ticker]['industry'] for ticker in tickers],
+        **{col: snapshots[col].to_numpy() for col in snapshots.columns},
+    })
+
+
+@staged('ibd_rs.rankings')
 def rankings(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
-             rating_method='rank', rs_window='12mo'):
+             rating_method='rank', rs_window='12mo', chunk_size=None,
+             lookbacks=None, compact=False):
     """
     Generates stock and industry ranking tables based on Relative Strength (RS)
     compared to a reference index.
@@ -355,8 +803,11 @@ def rankings(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
     tickers : list
         List of stock tickers to analyze.
 
-    ticker_ref : str, optional
+    ticker_ref : str or list of str, optional
         The reference index ticker symbol. Default is '^GSPC' (S&P 500).
+        If a list is given (e.g., ['^GSPC', '^NDX', '^RUT']), the stock
+        prices are downloaded once and the tables are generated against
+        each index.
 
     period : str, optional
         Duration for fetching historical stock data. Default is '2y' (two
@@ -373,9 +824,28 @@ def rankings(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
     rs_window : str, optional
         Period for calculating RS. Either '3mo' or '12mo'. Default is '12mo'.
 
+    chunk_size : int, optional
+        Number of tickers to download and compute at a time, for large
+        universes. Default is None (all tickers at once). See
+        `build_stock_rs_df`.
+
+    lookbacks : dict or list, optional
+        The lookback offsets of the past RS columns and their ratings, e.g.,
+        ``[pd.DateOffset(months=n) for n in range(1, 13)]`` for 12 monthly
+        snapshots. Default is `LOOKBACKS` (1, 3 and 6 months ago).
+
+    compact : bool, optional
+        If True, the prices and RS are float32, the ratings int8 (0 for no
+        rating) and 'Sector' and 'Industry' categorical. Default is False.
+        See `build_stock_rs_df`.
+
     Returns
     -------
-    tuple of pd.DataFrame
+    tuple of pd.DataFrame or dict
+        The stock and industry ranking tables (or, if `ticker_ref` is a
+        list, a dictionary of such tuples keyed by the reference index
+        ticker):
+
         1. Stock Rankings DataFrame:
             - 'Rank': Stock rank based on RS
             - 'Ticker': Stock ticker
@@ -405,24 +875,790 @@ def rankings(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
             - 'Rating (3 Months Ago)': Rating three months ago
             - 'Rating (6 Months Ago)': Rating six months ago
     """
-    stock_df = build_stock_rs_df(tickers, ticker_ref,
-                                 period, interval, rs_window)
-    stock_df = stock_df.sort_values(by='RS', ascending=False)
+    stock_df = build_stock_rs_df(tickers, ticker_ref, period, interval,
+                                 rs_window, chunk_size, lookbacks, compact)
+    if isinstance(ticker_ref, str):
+        return rank_stock_rs_df(stock_df, rating_method, compact)
+    return {ref: rank_stock_rs_df(df, rating_method, compact)
+            for ref, df in stock_df.items()}
+
+
+@staged('ibd_rs.multi_rankings')
+def multi_rankings(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
+                   rating_methods=('rank', 'qcut'), rs_windows=('12mo', '3mo'),
+                   lookbacks=None, compact=False):
+    """
+    Generates the ranking tables of `rankings` for several RS windows and
+    rating methods from one download of the prices and the info.
+
+    The RS panel is computed once per window, and the stock table is sorted
+    and grouped by industry once per window; only the ratings are computed
+    for each method.
+
+    Parameters
+    ----------
+    tickers : list
+        List of stock tickers to analyze.
+
+    ticker_ref : str or list of str, optional
+        The reference index ticker symbol, or a list of them. Default is
+        '^GSPC' (S&P 500).
+
+    period : str, optional
+        Duration for fetching historical stock data. Default is '2y' (two
+        years).
+
+    interval : str, optional
+        Time interval between data points. Can be '1d' (daily), '1wk'
+        (weekly), or '1mo' (monthly). Default is '1d'.
+
+    rating_methods : list of str, optional
+        Methods for calculating stock ratings ('rank' and/or 'qcut').
+        Default is ('rank', 'qcut').
+
+    rs_windows : list of str, optional
+        Periods for calculating RS ('12mo' and/or '3mo'). Default is
+        ('12mo', '3mo').
+
+    lookbacks : dict or list, optional
+        The lookback offsets of the past RS columns. Default is `LOOKBACKS`.
+
+    compact : bool, optional
+        If True, use compact dtypes (see `rankings`). Default is False.
+
+    Returns
+    -------
+    dict
+        A dictionary where each key is a tuple of (rs_window,
+        rating_method), or of (ticker_ref, rs_window, rating_method) if
+        `ticker_ref` is a list, and the value is the tuple of the stock and
+        industry ranking tables, as returned by `rankings`.
+    """
+    # Batch download stock data and info once for all configurations
+    refs = _ref_list(ticker_ref)
+    df = download_closes(tickers, refs, period, interval, compact=compact)
+    info = yfu.download_tickers_info(tickers, ['sector', 'industry'])
+
+    closes = df[tickers]
+    prices = closes.ffill().iloc[-1]
+
+    tables = {}
+    for rs_window in rs_windows:
+        with stage('ibd_rs.relative_strength'):
+            rs_dfs = rs_matrices(closes, df[refs], interval, rs_window)
+        for ref, rs_df in rs_dfs.items():
+            stock_df = stock_rs_df(prices, rs_df, info, lookbacks)
+            if compact:
+                stock_df = _categorize(stock_df)
+            for method, table in _rank_stock_rs_df(
+                    stock_df, rating_methods, compact).items():
+                key = (rs_window, method)
+                tables[key if isinstance(ticker_ref, str) else
+                       (ref,) + key] = table
+
+    return tables
+
+
+@staged('ibd_rs.rankings_from_closes')
+def rankings_from_closes(closes, info, tickers=None, ticker_ref='^GSPC',
+                         interval='1d', rating_method='rank',
+                         rs_window='12mo', lookbacks=None, compact=False):
+    """
+    Generates the ranking tables of `rankings` from closing prices and stock
+    info that were already downloaded (e.g., once for the jobs of
+    `batch.run_batch`).
+
+    Parameters
+    ----------
+    closes : pd.DataFrame
+        Closing prices (dates x tickers) including the reference index, as
+        returned by `download_closes`.
+
+    info : dict
+        A dictionary where each key is a stock ticker and the value is a
+        dictionary with the 'sector' and 'industry' of the ticker.
+
+    tickers : list, optional
+        List of stock tickers to rank. Defaults to all the columns of
+        `closes` except `ticker_ref`.
+
+    ticker_ref : str or list of str, optional
+        The reference index ticker symbol, or a list of them. Default is
+        '^GSPC' (S&P 500).
+
+    interval : str, optional
+        Time interval between data points. Can be '1d' (daily), '1wk'
+        (weekly), or '1mo' (monthly). Default is '1d'.
+
+    rating_method : str, optional
+        Method for calculating stock ratings. Can be either 'rank' or 'qcut'.
+        Default is 'rank'.
+
+    rs_window : str, optional
+        Period for calculating RS. Either '3mo' or '12mo'. Default is '12mo'.
 
-    rs_columns = ['RS', '1 Month Ago', '3 Months Ago', '6 Months Ago']
-    stock_df = append_ratings(stock_df, rs_columns, method=rating_method)
+    lookbacks : dict or list, optional
+        The lookback offsets of the past RS columns. Default is `LOOKBACKS`.
 
+    compact : bool, optional
+        If True, use compact dtypes (see `rankings`). Default is False.
+
+    Returns
+    -------
+    tuple of pd.DataFrame or dict
+        The stock and industry ranking tables, as returned by `rankings`.
+    """
+    refs = _ref_list(ticker_ref)
+    if tickers is None:
+        tickers = [t for t in closes.columns if t not in refs]
+    if compact:
+        closes = closes.astype(np.float32)
+
+    stock_dfs = _stock_rs_dfs(closes, info, tickers, refs, interval,
+                              rs_window, lookbacks)
+    tables = {
+        ref: rank_stock_rs_df(_categorize(df) if compact else df,
+                              rating_method, compact)
+        for ref, df in stock_dfs.items()
+    }
+    if isinstance(ticker_ref, str):
+        return tables[ticker_ref]
+    return tables
+
+
+@staged('ibd_rs.rank_stock_rs_df')
+def rank_stock_rs_df(stock_df, rating_method='rank', compact=False):
+    """
+    Generates the stock and industry ranking tables of `rankings` from a
+    stock DataFrame created by `build_stock_rs_df`.
+
+    Parameters
+    ----------
+    stock_df : pd.DataFrame
+        DataFrame containing stock information and RS values.
+
+    rating_method : str, optional
+        Method for calculating stock ratings. Can be either 'rank' or 'qcut'.
+        Default is 'rank'.
+
+    compact : bool, optional
+        If True, the rating columns are int8 with 0 for no rating instead of
+        nullable Int64. Default is False.
+
+    Returns
+    -------
+    tuple of pd.DataFrame
+        The stock and industry ranking tables, as returned by `rankings`.
+    """
+    return _rank_stock_rs_df(stock_df, [rating_method],
+                             compact)[rating_method]
+
+
+def _rank_stock_rs_df(stock_df, rating_methods, compact=False):
+    """
+    `rank_stock_rs_df` for several rating methods, sorting and grouping by
+    industry only once; return a dict of the tables of each method.
+    """
+    stock_df = stock_df.sort_values(by='RS', ascending=False)
+
+    # The current RS and the lookback columns that follow it
+    rs_columns = list(stock_df.columns[stock_df.columns.get_loc('RS'):])
     columns =  ['Sector', 'Ticker'] + rs_columns
     industry_df = groupby_industry(stock_df, columns, key='RS')
-
     industry_df = industry_df.sort_values(by='RS', ascending=False)
-    industry_df = append_ratings(industry_df, rs_columns, method=rating_method)
 
-    industry_df = industry_df.rename(columns={
-        'Ticker': 'Tickers',
-    })
+    tables = {}
+    for method in rating_methods:
+        rated_stock_df = append_ratings(stock_df.copy(), rs_columns,
+                                        method=method, compact=compact)
+        rated_industry_df = append_ratings(industry_df.copy(), rs_columns,
+                                           method=method, compact=compact)
+        rated_industry_df = rated_industry_df.rename(columns={
+            'Ticker': 'Tickers',
+        })
+        tables[method] = rated_stock_df, rated_industry_df
+
+    return tables
+
+
+@staged('ibd_rs.rating_history')
+def rating_history(tickers, ticker_ref='^GSPC', period='2y', interval='1d',
+                   rating_method='rank', rs_window='12mo', compact=False):
+    """
+    Calculate the RS rating of every ticker on every date of the download
+    window.
+
+    The whole RS panel is computed at once and each date is rated by one
+    vectorized cross-sectional rank, so the rating history of a universe
+    costs about as much as a single `rankings` call.
+
+    Parameters
+    ----------
+    tickers : list
+        List of stock tickers to analyze.
+
+    ticker_ref : str, optional
+        The reference index ticker symbol. Default is '^GSPC' (S&P 500).
+
+    period : str, optional
+        Duration for fetching historical stock data. Default is '2y' (two
+        years).
+
+    interval : str, optional
+        Time interval between data points. Can be '1d' (daily), '1wk'
+        (weekly), or '1mo' (monthly). Default is '1d'.
+
+    rating_method : str, optional
+        Method for calculating stock ratings. Can be either 'rank' or 'qcut'.
+        Default is 'rank'.
+
+    rs_window : str, optional
+        Period for calculating RS. Either '3mo' or '12mo'. Default is '12mo'.
+
+    compact : bool, optional
+        If True, the closes and the RS panel are float32, which halves the
+        memory of long histories. Default is False.
 
-    return stock_df, industry_df
+    Returns
+    -------
+    pd.DataFrame
+        An int8 DataFrame of ratings (dates x tickers) ranging from 1 (worst)
+        to 99 (best); 0 means no rating.
+    """
+    df = download_closes(tickers, ticker_ref, period, interval,
+                         compact=compact)
+    with stage('ibd_rs.relative_strength'):
+        rs_df = rs_matrix_func(rs_window)(df[tickers], df[ticker_ref],
+                                          interval)
+    return cross_sectional_ratings(rs_df, rating_method)
+
+
+#------------------------------------------------------------------------------
+# Incremental Update
+#------------------------------------------------------------------------------
+
+class _RowBuffer:
+    """
+    The last rows of an array, with appends in amortized O(row) time.
+
+    The rows are kept in a buffer with room for as many rows again, so an
+    append writes one row, and dropping the first rows or the last one only
+    moves the bounds. When the room runs out, the kept rows are copied to a
+    new buffer, once every (number of kept rows) appends.
+    """
+    def __init__(self, values):
+        # The initial array is not written to (e.g., a view of the closes)
+        self._buffer = np.asarray(values)
+        self._start, self._stop = 0, len(self._buffer)
+        self._owned = False
+
+    @property
+    def values(self):
+        """The kept rows (a view of the buffer)."""
+        return self._buffer[self._start:self._stop]
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def append(self, row):
+        """Append a row."""
+        if not self._owned or self._stop == len(self._buffer):
+            values = self.values
+            self._buffer = np.empty((2 * len(values) + 1,) + values.shape[1:],
+                                    dtype=values.dtype)
+            self._buffer[:len(values)] = values
+            self._start, self._stop = 0, len(values)
+            self._owned = True
+        self._buffer[self._stop] = row
+        self._stop += 1
+
+    def pop(self):
+        """Drop the last row."""
+        self._stop -= 1
+
+    def keep(self, n):
+        """Drop the first rows but the last `n` ones."""
+        self._start = max(self._start, self._stop - n)
+
+
+class RSUpdater:
+    """
+    Keep IBD RS rankings up to date by feeding new closing prices.
+
+    `rankings` downloads the whole history and recomputes the RS of every
+    date on each call. An RSUpdater computes the RS panel once and then keeps
+    only the state needed to extend it: the last four quarters of closes for
+    the 12-month RS, the last EMA and cumulative-sum rows for the 3-month RS,
+    and the recent RS rows used by the lookback columns. Each new bar costs
+    O(tickers) work (amortized: the state arrays have room for new rows and
+    are copied only when it runs out).
+
+    A new row with the same date as the last one replaces it, so the current
+    (partial) bar can be refreshed during market hours.
+
+    The RS values equal those of a full recomputation over the same history,
+    provided the initial history covers at least four quarters. Since Yahoo
+    adjusts past prices after splits and dividends, re-create the updater
+    from a fresh download from time to time.
+
+    Parameters
+    ----------
+    closes : pd.DataFrame
+        Closing prices (dates x tickers) including the reference index, as
+        returned by `download_closes`.
+
+    info : dict
+        A dictionary where each key is a stock ticker and the value is a
+        dictionary with the 'sector' and 'industry' of the ticker.
+
+    tickers : list, optional
+        List of stock tickers to rank. Defaults to all the columns of
+        `closes` except `ticker_ref`.
+
+    ticker_ref : str, optional
+        The reference index ticker symbol. Default is '^GSPC' (S&P 500).
+
+    interval : str, optional
+        Time interval between data points. Can be '1d' (daily), '1wk'
+        (weekly), or '1mo' (monthly). Default is '1d'.
+
+    rating_method : str, optional
+        Method for calculating stock ratings. Can be either 'rank' or 'qcut'.
+        Default is 'rank'.
+
+    rs_window : str, optional
+        Period for calculating RS. Either '3mo' or '12mo'. Default is '12mo'.
+
+    lookbacks : dict or list, optional
+        The lookback offsets of the past RS columns. Default is `LOOKBACKS`.
+
+    Examples
+    --------
+    ::
+
+        updater = RSUpdater.download(tickers, period='2y')
+
+        # later, e.g., once a day or every few minutes during the session
+        updater.refresh()
+        stock_df, industry_df = updater.rankings()
+    """
+    def __init__(self, closes, info, tickers=None, ticker_ref='^GSPC',
+                 interval='1d', rating_method='rank', rs_window='12mo',
+                 lookbacks=None):
+        if tickers is None:
+            tickers = [t for t in closes.columns if t != ticker_ref]
+        self.tickers = list(tickers)
+        self.ticker_ref = ticker_ref
+        self.info = info
+        self.interval = interval
+        self.rating_method = rating_method
+        self.rs_window = rs_window
+        self.lookbacks = LOOKBACKS if lookbacks is None else lookbacks
+
+        self._quarter = QUARTER_BARS[interval]
+        self._columns = [ticker_ref] + self.tickers
+
+        rs_df = rs_matrix_func(rs_window)(closes[self.tickers],
+                                          closes[ticker_ref], interval)
+        self._index = rs_df.index[:0]
+        self._dates = _RowBuffer(rs_df.index.to_numpy(dtype=object))
+        self._rs = _RowBuffer(rs_df.to_numpy())
+
+        # Column 0 of the state arrays is the reference index
+        values = _to_values(closes[self._columns])
+        self._length = len(values)
+        self._closes = _RowBuffer(values)
+        self._ffilled = _RowBuffer(_ffill_values(values))
+        if rs_window == '3mo':
+            ema = _ema_values(_pct_change_values(values, 1), self._quarter)
+            self._ema = _RowBuffer(ema)
+            self._cumsum = _RowBuffer(np.cumsum(ema, axis=0))
+        self._trim()
+
+    @classmethod
+    def download(cls, tickers, ticker_ref='^GSPC', period='2y',
+                 interval='1d', rating_method='rank', rs_window='12mo',
+                 lookbacks=None):
+        """
+        Create an RSUpdater from downloaded closing prices and stock info.
+
+        Parameters are the same as those of `rankings`.
+        """
+        closes = download_closes(tickers, ticker_ref, period, interval)
+        info = yfu.download_tickers_info(tickers, ['sector', 'industry'])
+        return cls(closes, info, tickers, ticker_ref,
+                   interval, rating_method, rs_window, lookbacks)
+
+    def refresh(self, period='5d'):
+        """
+        Download the latest bars and feed them to `update`.
+
+        Parameters
+        ----------
+        period : str, optional
+            Duration of the recent data to download. Default is '5d'.
+
+        Returns
+        -------
+        RSUpdater
+            This updater.
+        """
+        closes = download_closes(self.tickers, self.ticker_ref,
+                                 period, self.interval, max_age=0)
+        return self.update(closes)
+
+    @staged('ibd_rs.RSUpdater.update')
+    def update(self, closes):
+        """
+        Feed new rows of closing prices.
+
+        Rows dated before the last known date are ignored, a row with the
+        last known date replaces it, and later rows are appended.
+
+        Parameters
+        ----------
+        closes : pd.DataFrame
+            Closing prices (dates x tickers) including the reference index.
+            Missing tickers are treated as NaN (no new price).
+
+        Returns
+        -------
+        RSUpdater
+            This updater.
+        """
+        closes = closes.reindex(columns=self._columns)
+        for date, row in zip(closes.index, _to_values(closes)):
+            if len(self._dates) and date < self._dates[-1]:
+                continue
+            if len(self._dates) and date == self._dates[-1]:
+                self._pop()
+            self._append(date, row)
+        self._trim()
+        return self
+
+    def rs_df(self):
+        """
+        Return the recent RS panel (dates x tickers) kept by the updater.
+        """
+        return pd.DataFrame(self._rs.values, index=self._date_index(),
+                            columns=self.tickers)
+
+    def rankings(self):
+        """
+        Generate the stock and industry ranking tables from the current
+        state.
+
+        Returns
+        -------
+        tuple of pd.DataFrame
+            The stock and industry ranking tables, as returned by `rankings`.
+        """
+        prices = pd.Series(self._ffilled[-1, 1:], index=self.tickers)
+        stock_df = stock_rs_df(prices, self.rs_df(), self.info,
+                               self.lookbacks)
+        return rank_stock_rs_df(stock_df, self.rating_method)
+
+    def _date_index(self, extra=()):
+        """Return the dates of the RS rows (plus `extra` dates) as an index."""
+        return pd.Index(list(self._dates.values) + list(extra),
+                        dtype=self._index.dtype, name=self._index.name)
+
+    def _append(self, date, row):
+        """Extend the state and the RS panel by one row of closes."""
+        ffilled, rs, ema, cumsum = self._next_row(row)
+        self._closes.append(row)
+        self._ffilled.append(ffilled)
+        if self.rs_window == '3mo':
+            self._ema.append(ema)
+            self._cumsum.append(cumsum)
+        self._length += 1
+
+        self._rs.append(rs)
+        self._dates.append(date)
+
+    def _next_row(self, row):
+        """
+        Return the forward-filled closes, the RS, and (for the 3-month RS)
+        the EMA and cumulative-sum rows of a row of closes following the
+        state, without storing them.
+        """
+        first = self._length == 0
+        ffilled = row if first else np.where(np.isnan(row),
+                                             self._ffilled[-1], row)
+        ema = cumsum = None
+
+        if self.rs_window == '12mo':
+            p1, p2, p3, p4 = (
+                _pct_change_values(np.vstack([self._ffilled[-periods],
+                                              ffilled]), 1)[-1]
+                if periods else np.zeros_like(ffilled)
+                for periods in (min(self._length, self._quarter * n)
+                                for n in (1, 2, 3, 4))
+            )
+            growth = (2 * p1 + p2 + p3 + p4) / 5
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = (1 + growth[1:]) / (1 + growth[0]) * 100
+        else:
+            span = self._quarter
+            closes = row[np.newaxis] if first else np.vstack(
+                [self._closes[-1], row])
+            growth = _pct_change_values(closes, 1)[-1:]
+            ema = _ema_values(growth, span,
+                              None if first else self._ema[-1])
+            cumsum = ema[0] if first else self._cumsum[-1] + ema[0]
+            total = cumsum
+            if self._length + 1 > span:
+                total = cumsum - self._cumsum[-span]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = (total[1:] + 1) / np.abs(total[0] + 1) * 100
+
+        return ffilled, np.round(rs, 2), ema, cumsum
+
+    def _pop(self):
+        """Remove the last row of the state and the RS panel."""
+        self._closes.pop()
+        self._ffilled.pop()
+        if self.rs_window == '3mo':
+            self._ema.pop()
+            self._cumsum.pop()
+        self._rs.pop()
+        self._dates.pop()
+        self._length -= 1
+
+    def _trim(self):
+        """Drop the rows of the state that are no longer needed."""
+        # One more row than needed, so that the last row can be replaced
+        self._closes.keep(2)
+        self._ffilled.keep(4 * self._quarter + 2)
+        if self.rs_window == '3mo':
+            self._ema.keep(2)
+            self._cumsum.keep(self._quarter + 2)
+        if len(self._dates):
+            # Keep the rows back to the oldest lookback
+            offsets = (self.lookbacks.values()
+                       if isinstance(self.lookbacks, dict) else self.lookbacks)
+            oldest = min((self._dates[-1] - offset for offset in offsets),
+                         default=self._dates[-1])
+            start = np.searchsorted(self._dates.values, oldest,
+                                    side='right') - 2
+            n = len(self._dates) - max(start, 0)
+            self._rs.keep(n)
+            self._dates.keep(n)
+
+
+#------------------------------------------------------------------------------
+# Intraday Streaming
+#------------------------------------------------------------------------------
+
+class RSStream:
+    """
+    Keep live RS ratings during the session from streaming price updates.
+
+    The daily history up to the last completed session stays in an
+    `RSUpdater`, and the stream holds the latest price of every ticker in
+    the session, i.e., the partial daily bar. Price updates (ticks, or the
+    closes of minute bars) overwrite those prices, and the universe is
+    re-rated at most once every `rerate_every` seconds: the RS of the
+    partial bar is computed from the state of the updater as if it were the
+    next daily bar, without storing it, and then rated. A re-rating costs
+    O(tickers) work, about a millisecond for thousands of tickers.
+
+    Tickers without a price in the session keep their last close. At the
+    end of the session, `close_session` feeds the partial bar to the
+    updater as a completed daily bar.
+
+    Parameters
+    ----------
+    updater : RSUpdater
+        The RS state of the daily ('1d') history. If its last bar is of the
+        session (e.g., the partial bar of a download during the session),
+        that bar is taken as the initial prices of the session.
+
+    rerate_every : float, optional
+        Minimum number of seconds between the re-ratings done by `push`.
+        Default is 1.0; 0 re-rates on every push.
+
+    session : str or pd.Timestamp, optional
+        The date of the session. Default is today.
+
+    Examples
+    --------
+    ::
+
+        stream = RSStream.download(tickers, period='2y', rerate_every=5)
+
+        # in the handler of a market data feed
+        ratings = stream.push({'NVDA': 131.2, 'AAPL': 227.5, '^GSPC': 5731.})
+        if ratings is not None:     # re-rated (at most every 5 seconds)
+            print(ratings.nlargest(10))
+
+        # the closes of the latest minute bars (dates x tickers)
+        stream.push(minute_closes)
+
+        # after the close
+        stream.close_session()
+    """
+    def __init__(self, updater, rerate_every=1.0, session=None):
+        if updater.interval != '1d':
+            raise ValueError("the updater must be of daily ('1d') bars")
+        self.updater = updater
+        self.rerate_every = rerate_every
+        self.session = pd.Timestamp(
+            pd.Timestamp.now() if session is None else session).normalize()
+
+        columns = updater._columns
+        self._index = pd.Index(columns)
+        self._positions = {ticker: i for i, ticker in enumerate(columns)}
+        self._prices = np.full(len(columns), np.nan)
+        if len(updater._dates) and updater._dates[-1] >= self.session:
+            self._prices = updater._closes[-1].astype(float)
+            updater._pop()
+
+        self._ratings = None
+        self._rated_at = None
+        self._changed = True
+
+    @classmethod
+    def download(cls, tickers, ticker_ref='^GSPC', period='2y',
+                 rating_method='rank', rs_window='12mo', lookbacks=None,
+                 rerate_every=1.0):
+        """
+        Create an RSStream from downloaded daily closing prices and stock
+        info.
+
+        Parameters are the same as those of `rankings`, plus
+        `rerate_every`.
+        """
+        updater = RSUpdater.download(tickers, ticker_ref, period, '1d',
+                                     rating_method, rs_window, lookbacks)
+        return cls(updater, rerate_every)
+
+    def push(self, prices, now=None):
+        """
+        Ingest price updates, and re-rate the universe if it is due.
+
+        Parameters
+        ----------
+        prices : dict, pd.Series or pd.DataFrame
+            The latest prices keyed by ticker (e.g., ticks), or bars (dates x
+            tickers, e.g., the closes of minute bars) whose last valid price
+            of each ticker is taken. Unknown tickers and missing (NaN or
+            None) prices are ignored.
+
+        now : float, optional
+            The current `time.monotonic()` time. Default is now.
+
+        Returns
+        -------
+        pd.Series or None
+            The ratings, as returned by `rerate`, if the universe was
+            re-rated; otherwise None.
+        """
+        if isinstance(prices, pd.DataFrame):
+            prices = pd.Series(_ffill_values(_to_values(prices))[-1],
+                               index=prices.columns)
+        if isinstance(prices, pd.Series):
+            positions = self._index.get_indexer(prices.index)
+            values = prices.to_numpy(dtype=float)
+            valid = (positions >= 0) & ~np.isnan(values)
+            self._prices[positions[valid]] = values[valid]
+        else:
+            for ticker, price in prices.items():
+                i = self._positions.get(ticker)
+                if i is not None and not pd.isna(price):
+                    self._prices[i] = price
+        self._changed = True
+
+        if now is None:
+            now = time.monotonic()
+        if self._rated_at is None or now - self._rated_at >= self.rerate_every:
+            return self.rerate(now)
+        return None
+
+    @staged('ibd_rs.RSStream.rerate')
+    def rerate(self, now=None):
+        """
+        Rate the universe with the current prices of the session.
+
+        Parameters
+        ----------
+        now : float, optional
+            The current `time.monotonic()` time. Default is now.
+
+        Returns
+        -------
+        pd.Series
+            int8 ratings indexed by ticker, ranging from 1 (worst) to 99
+            (best); 0 means no rating (e.g., no RS).
+        """
+        rs = self.rs().to_numpy()
+        ratings = batch_ratings(rs[:, np.newaxis],
+                                self.updater.rating_method)[:, 0]
+        self._ratings = pd.Series(ratings, index=self.updater.tickers,
+                                  name='Rating (RS)')
+        self._rated_at = time.monotonic() if now is None else now
+        self._changed = False
+        return self._ratings
+
+    def ratings(self):
+        """
+        Return the latest ratings, re-rating first if prices came in since.
+        """
+        if self._changed or self._ratings is None:
+            return self.rerate()
+        return self._ratings
+
+    def rs(self):
+        """
+        Return the RS of the partial bar of the session, indexed by ticker.
+        """
+        _, rs, _, _ = self.updater._next_row(self._prices)
+        return pd.Series(rs, index=self.updater.tickers, name='RS')
+
+    def rankings(self):
+        """
+        Generate the stock and industry ranking tables with the partial bar
+        of the session as the last bar.
+
+        Returns
+        -------
+        tuple of pd.DataFrame
+            The stock and industry ranking tables, as returned by `rankings`.
+        """
+        updater = self.updater
+        ffilled, rs, _, _ = updater._next_row(self._prices)
+        rs_df = pd.DataFrame(
+            np.vstack([updater._rs.values, rs]),
+            index=updater._date_index([self.session]),
+            columns=updater.tickers)
+        prices = pd.Series(ffilled[1:], index=updater.tickers)
+        stock_df = stock_rs_df(prices, rs_df, updater.info, updater.lookbacks)
+        return rank_stock_rs_df(stock_df, updater.rating_method)
+
+    def close_session(self, next_session=None):
+        """
+        Store the partial bar as the daily bar of the session, and start the
+        next session.
+
+        Parameters
+        ----------
+        next_session : str or pd.Timestamp, optional
+            The date of the next session. Default is the next business day.
+        """
+        if not np.isnan(self._prices).all():
+            self.updater.update(pd.DataFrame(
+                [self._prices], index=pd.DatetimeIndex([self.session]),
+                columns=self.updater._columns))
+        self.session = (self.session + pd.offsets.BDay(1)
+                        if next_session is None
+                        else pd.Timestamp(next_session).normalize())
+        self._prices = np.full(len(self._index), np.nan)
+        self._ratings = None
+        self._rated_at = None
+        self._changed = True
 
 
 #------------------------------------------------------------------------------
@@ -440,10 +1676,13 @@ def test_rankings(min_rating=80, rating_method='qcut',
 
     out_dir: str, optional
         The output directory to store CSV tables. Defaults to 'out'.
+
+    The tables are also appended to the default `results.ResultsStore`.
     '''
     import os
     from datetime import datetime
     from . import stock_indices as si
+    from .results import ResultsStore
 
     code = 'SPX'
     tickers = si.get_tickers(code)
@@ -465,11 +1704,14 @@ def test_rankings(min_rating=80, rating_method='qcut',
     print("\n\n***")
     today = datetime.now().strftime('%Y%m%d')
     os.makedirs(out_dir, exist_ok=True)
+    store = ResultsStore()
     for table, kind in zip([rank_stock, rank_indust],
                            ['stocks', 'industries']):
         filename = f'rs_{kind}_{rs_window}_{rating_method}_{today}.csv'
         table.to_csv(os.path.join(out_dir, filename), index=False)
         print(f'Your "{filename}" is in the "{out_dir}" folder.')
+        store.append(f'{code}/rs_{rs_window}_{rating_method}/{kind}', table)
+    print(f'The tables are appended to "{store.path}".')
     print("***\n")
 
 
@@ -0,0 +1,368 @@
+"""
+Opt-in instrumentation of the ranking pipelines.
+
+The downloads and computations of `ibd_rs`, `rsm`, `ibd_fin`, `yf_utils` and
+`ranking_utils` run inside named stages (e.g., 'yf.download',
+'yf_utils.download_tickers_info', 'ibd_rs.relative_strength',
+'ranking_utils.groupby_industry'). When the instrumentation is enabled, the
+wall time, the number of calls and (optionally) the peak memory of each
+stage are recorded; when it is disabled, a stage costs a flag check.
+
+Usage:
+~~~~~~
+::
+
+    from rs_rating import ibd_rs, instrument
+
+    with instrument.recording(memory=True) as stats:
+        ibd_rs.rankings(tickers)
+    print(instrument.to_prometheus())
+
+Callbacks (e.g., to feed a metrics client) receive every finished stage::
+
+    instrument.add_callback(lambda name, seconds, peak: print(name, seconds))
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+__all__ = [
+    'stage',
+    'staged',
+    'enable',
+    'disable',
+    'is_enabled',
+    'recording',
+    'reset',
+    'get_stats',
+    'add_callback',
+    'remove_callback',
+    'to_json',
+    'to_prometheus',
+]
+
+import contextlib
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+
+_enabled = False
+_memory = False
+_started_tracemalloc = False
+_stats = {}
+_callbacks = []
+_lock = threading.Lock()
+# Stages with memory tracing open in any thread: the traced peak is
+# process-wide, so it is passed to all of them before each reset
+_open_stages = []
+_memory_lock = threading.Lock()
+_NULL_STAGE = contextlib.nullcontext()
+
+
+#------------------------------------------------------------------------------
+# Stages
+#------------------------------------------------------------------------------
+
+def stage(name):
+    """
+    Return a context manager that records the enclosed code as a stage.
+
+    Parameters
+    ----------
+    name: str
+        Name of the stage, e.g., 'ibd_rs.relative_strength'.
+
+    Returns
+    -------
+    context manager
+        A no-op context manager if the instrumentation is disabled.
+
+    Examples
+    --------
+    >>> with recording() as stats:
+    ...     with stage('example'):
+    ...         pass
+    >>> stats['example']['calls']
+    1
+
+    The peak memory of a stage includes what other threads allocate while
+    it is open, and is kept when a stage opens in another thread:
+
+    >>> def inner():
+    ...     with stage('inner'):
+    ...         pass
+    >>> with recording(memory=True) as stats:
+    ...     with stage('outer'):
+    ...         block = bytearray(2 * 10**7)
+    ...         del block
+    ...         thread = threading.Thread(target=inner)
+    ...         thread.start()
+    ...         thread.join()
+    >>> stats['outer']['peak_memory_bytes'] >= 10**7
+    True
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def staged(name):
+    """
+    Decorator that records every call of a function as a stage.
+
+    Parameters
+    ----------
+    name: str
+        Name of the stage.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _Stage:
+    """Context manager recording the time and peak memory of a stage."""
+    __slots__ = ('name', 'start', 'mem_start', 'peak')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if _memory and tracemalloc.is_tracing():
+            with _memory_lock:
+                current = _update_peaks()
+                self.mem_start = self.peak = current
+                _open_stages.append(self)
+        else:
+            self.mem_start = None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        peak = None
+        if self.mem_start is not None:
+            with _memory_lock:
+                _update_peaks()
+                if self in _open_stages:
+                    _open_stages.remove(self)
+            peak = self.peak - self.mem_start
+
+        with _lock:
+            stat = _stats.setdefault(self.name, {
+                'calls': 0, 'seconds': 0., 'peak_memory_bytes': None})
+            stat['calls'] += 1
+            stat['seconds'] += seconds
+            if peak is not None:
+                stat['peak_memory_bytes'] = max(
+                    stat['peak_memory_bytes'] or 0, peak)
+            callbacks = list(_callbacks)
+        for callback in callbacks:
+            callback(self.name, seconds, peak)
+        return False
+
+
+def _update_peaks():
+    """
+    Pass the traced peak since the last reset to the open stages of all
+    threads, reset it, and return the current traced memory (called with
+    `_memory_lock` held).
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    for s in _open_stages:
+        s.peak = max(s.peak, peak)
+    tracemalloc.reset_peak()
+    return current
+
+
+#------------------------------------------------------------------------------
+# Control
+#------------------------------------------------------------------------------
+
+def enable(memory=False):
+    """
+    Enable the instrumentation.
+
+    Parameters
+    ----------
+    memory: bool, optional
+        Whether to record the peak memory of the stages with `tracemalloc`
+        (which slows Python allocations down). Defaults to False.
+    """
+    global _enabled, _memory, _started_tracemalloc
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _enabled = True
+
+
+def disable():
+    """
+    Disable the instrumentation (the recorded statistics are kept).
+    """
+    global _enabled, _memory, _started_tracemalloc
+    _enabled = False
+    _memory = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled():
+    """
+    Return whether the instrumentation is enabled.
+    """
+    return _enabled
+
+
+@contextlib.contextmanager
+def recording(memory=False, callback=None):
+    """
+    Context manager that records the stages run inside it.
+
+    The statistics are reset on entry, and the instrumentation is restored
+    to its previous state on exit.
+
+    Parameters
+    ----------
+    memory: bool, optional
+        Whether to record the peak memory of the stages. Defaults to False.
+    callback: callable, optional
+        A function called as ``callback(name, seconds, peak_memory_bytes)``
+        at the end of each stage inside the context.
+
+    Yields
+    ------
+    dict
+        The statistics of the stages (see `get_stats`), updated in place.
+    """
+    was_enabled, had_memory = _enabled, _memory
+    reset()
+    if callback is not None:
+        add_callback(callback)
+    enable(memory or had_memory)
+    try:
+        yield _stats
+    finally:
+        disable()
+        if was_enabled:
+            enable(had_memory)
+        if callback is not None:
+            remove_callback(callback)
+
+
+def reset():
+    """
+    Clear the recorded statistics.
+    """
+    with _lock:
+        _stats.clear()
+
+
+def get_stats():
+    """
+    Return the recorded statistics.
+
+    Returns
+    -------
+    dict
+        A dictionary where each key is a stage name and the value is a
+        dictionary of 'calls', 'seconds' (total wall time) and
+        'peak_memory_bytes' (the largest peak over the calls, or None if
+        the memory was not recorded).
+    """
+    with _lock:
+        return {name: dict(stat) for name, stat in _stats.items()}
+
+
+def add_callback(callback):
+    """
+    Call ``callback(name, seconds, peak_memory_bytes)`` at the end of each
+    stage while the instrumentation is enabled.
+    """
+    with _lock:
+        _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    """
+    Remove a callback added with `add_callback`.
+    """
+    with _lock:
+        _callbacks.remove(callback)
+
+
+#------------------------------------------------------------------------------
+# Export
+#------------------------------------------------------------------------------
+
+def to_json(**kwargs):
+    """
+    Return the recorded statistics as a JSON string.
+
+    Parameters
+    ----------
+    **kwargs
+        Keyword arguments of `json.dumps` (e.g., indent=2).
+    """
+    return json.dumps(get_stats(), **kwargs)
+
+
+def to_prometheus(prefix='rs_rating'):
+    """
+    Return the recorded statistics in the Prometheus text format.
+
+    Parameters
+    ----------
+    prefix: str, optional
+        Prefix of the metric names. Defaults to 'rs_rating'.
+
+    Examples
+    --------
+    >>> with recording():
+    ...     with stage('example'):
+    ...         pass
+    >>> print(to_prometheus().splitlines()[2])
+    rs_rating_stage_calls_total{stage="example"} 1
+    """
+    stats = get_stats()
+    metrics = [
+        ('stage_calls_total', 'counter', 'Number of calls of the stage.',
+         'calls'),
+        ('stage_seconds_total', 'counter', 'Total wall time of the stage.',
+         'seconds'),
+        ('stage_peak_memory_bytes', 'gauge',
+         'Largest traced peak memory of a call of the stage.',
+         'peak_memory_bytes'),
+    ]
+    lines = []
+    for metric, kind, help_text, key in metrics:
+        samples = [(name, stat[key]) for name, stat in sorted(stats.items())
+                   if stat[key] is not None]
+        if not samples:
+            continue
+        lines.append(f'# HELP {prefix}_{metric} {help_text}')
+        lines.append(f'# TYPE {prefix}_{metric} {kind}')
+        for name, value in samples:
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'{prefix}_{metric}{{stage="{label}"}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+#------------------------------------------------------------------------------
+# Unit Test
+#------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
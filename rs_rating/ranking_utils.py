@@ -2,18 +2,32 @@
 Utilities for Ranking tables
 """
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/10/06 (initial version) ~ 2024/10/08 (last revision)"
+__date__ = "2024/10/06 (initial version) ~ 2026/10/17 (last revision)"
 
 __all__ = [
     'append_ratings',
+    'batch_ratings',
+    'calc_ratings',
+    'cross_sectional_ratings',
     'groupby_industry',
+    'KLLSketch',
+    'lookback_snapshots',
+    'RatingBreakpoints',
 ]
+import json
+import warnings
+
+import numpy as np
 import pandas as pd
 
+from .instrument import staged
+
 
 #------------------------------------------------------------------------------
 
-def append_ratings(stock_df, columns, rating_columns=None, method='rank'):
+@staged('ranking_utils.append_ratings')
+def append_ratings(stock_df, columns, rating_columns=None, method='rank',
+                   compact=False):
     """
     Calculates and appends rating rankings to the stock DataFrame for RS
     values and their historical comparisons.
@@ -35,6 +49,10 @@ def append_ratings(stock_df, columns, rating_columns=None, method='rank'):
         Method to calculate ratings. Either 'rank' or 'qcut'. Defaults to
         'rank'.
 
+    compact: bool, optional
+        If True, the rating columns are int8 with 0 for no rating, instead
+        of nullable Int64 with NA. Defaults to False.
+
     Returns
     -------
     pd.DataFrame
@@ -49,8 +67,13 @@ def append_ratings(stock_df, columns, rating_columns=None, method='rank'):
     if len(columns) != len(rating_columns):
         raise ValueError("The length of columns and rating_columns must match.")
 
-    for col, rating_col_name in zip(columns, rating_columns):
-        stock_df[rating_col_name] = calc_ratings(stock_df[col], method)
+    # Rate all columns in one pass
+    block = stock_df[list(columns)]
+    ratings = batch_ratings(block.to_numpy(dtype=_float_dtype(block)),
+                            method, axis=0)
+    for j, rating_col_name in enumerate(rating_columns):
+        stock_df[rating_col_name] = (ratings[:, j] if compact else
+                                     _nullable_ratings(ratings[:, j]))
 
     return stock_df
 
@@ -79,18 +102,658 @@ def calc_ratings(series, method='rank'):
     ------
     ValueError
         If the method is not 'rank' or 'qcut'.
+
+    Examples
+    --------
+    >>> calc_ratings(pd.Series([1, np.inf, 3, -np.inf, 2])).tolist()
+    [40, 99, 79, 21, 60]
+    >>> calc_ratings(pd.Series([1, np.inf, 3, -np.inf, 2]), 'qcut').tolist()
+    [2, 52, 52, <NA>, 27]
+    """
+    ratings = batch_ratings(series.to_numpy(dtype=float)[:, np.newaxis],
+                            method, axis=0)
+    return pd.Series(_nullable_ratings(ratings[:, 0]),
+                     index=series.index, name=series.name)
+
+
+def batch_ratings(values, method='rank', axis=0):
+    """
+    Calculate the ratings of a whole 2D block of values at once.
+
+    Every column (axis=0, e.g., the RS columns of a stock table) or every
+    row (axis=1, e.g., the dates of an RS panel) is rated on its own, with
+    the same semantics as `calc_ratings`, but all of them are rated by one
+    vectorized NumPy argsort pass.
+
+    Parameters
+    ----------
+    values: np.ndarray or pd.DataFrame
+        The 2D block of values to rate. float32 values are rated without
+        being converted to float64.
+
+    method: str, optional
+        The method to use for calculating ratings.
+        Either 'rank' (default) for rank-based ratings or
+        'qcut' for quantile-based ratings.
+
+    axis: int, optional
+        0 to rate each column against its rows, or 1 to rate each row
+        against its columns. Defaults to 0.
+
+    Returns
+    -------
+    np.ndarray or pd.DataFrame
+        int8 ratings of the same shape (and index and columns for a
+        DataFrame), ranging from 1 (worst) to 99 (best). Entries without a
+        rating (e.g., NaN values) are 0.
+
+    Raises
+    ------
+    ValueError
+        If the method is not 'rank' or 'qcut', or the axis is not 0 or 1.
+
+    Examples
+    --------
+    >>> batch_ratings(np.array([[101., 3.], [99., 1.], [100., np.nan]]))
+    array([[99, 99],
+           [34, 50],
+           [66,  0]], dtype=int8)
+    """
+    if axis not in (0, 1):
+        raise ValueError("axis must be either 0 or 1")
+    if isinstance(values, pd.DataFrame):
+        ratings = batch_ratings(values.to_numpy(dtype=_float_dtype(values)),
+                                method, axis)
+        return pd.DataFrame(ratings, index=values.index,
+                            columns=values.columns)
+
+    values = np.asarray(values)
+    if values.dtype != np.float32:
+        values = values.astype(float)
+    if axis == 0:
+        return _rate_rows(np.ascontiguousarray(values.T), method).T
+    return _rate_rows(values, method)
+
+
+def _float_dtype(df):
+    """float32 if all the columns of a DataFrame are float32, else float64."""
+    if len(df.columns) and (df.dtypes == np.float32).all():
+        return np.float32
+    return np.float64
+
+
+def _nullable_ratings(ratings):
+    """Convert int8 ratings (0 for no rating) to an Int64 array with NA."""
+    return pd.arrays.IntegerArray(ratings.astype(np.int64), ratings == 0)
+
+
+@staged('ranking_utils.cross_sectional_ratings')
+def cross_sectional_ratings(rs_df, method='rank'):
+    """
+    Calculate the rating of every ticker on every date of an RS panel.
+
+    Each row (date) of the panel is rated against the other tickers of the
+    same row, with the same semantics as `calc_ratings`. All rows are ranked
+    together by one vectorized NumPy pass instead of one `calc_ratings` call
+    per date.
+
+    Parameters
+    ----------
+    rs_df: pd.DataFrame
+        RS panel with dates as the index and tickers as the columns.
+
+    method: str, optional
+        The method to use for calculating ratings.
+        Either 'rank' (default) for rank-based ratings or
+        'qcut' for quantile-based ratings.
+
+    Returns
+    -------
+    pd.DataFrame
+        An int8 DataFrame of ratings with the same index and columns as
+        `rs_df`, ranging from 1 (worst) to 99 (best). Entries without a
+        rating (e.g., NaN RS values) are 0.
+
+    Raises
+    ------
+    ValueError
+        If the method is not 'rank' or 'qcut'.
+
+    Examples
+    --------
+    >>> rs_df = pd.DataFrame({'A': [101., 95.], 'B': [99., 97.],
+    ...                       'C': [100., np.nan]})
+    >>> cross_sectional_ratings(rs_df)
+        A   B   C
+    0  99  34  66
+    1  50  99   0
     """
+    return batch_ratings(rs_df, method, axis=1)
+
+
+def _rate_rows(values, method):
+    """
+    Rate each row of a 2D float array; return int8 ratings (0 for NaN).
+    """
+    if method not in ('rank', 'qcut'):
+        raise ValueError("method must be either 'rank' or 'qcut'")
+    if values.size == 0:
+        return np.zeros(values.shape, dtype=np.int8)
+
     if method == 'rank':
-        ratings = series.rank(pct=True).mul(98) + 1
-    elif method == 'qcut':
-        ratings = pd.qcut(series, 99, labels=False, duplicates='drop') + 1
+        ratings = _pct_rank_rows(values) * 98 + 1
     else:
-        raise ValueError("method must be either 'rank' or 'qcut'")
-    return ratings.round().astype('Int64')  # Use Int64 to allow NaN
+        ratings = _qcut_rows(values, 99)
+    ratings = np.round(ratings)
+    return np.where(np.isnan(ratings), 0, ratings).astype(np.int8)
+
+
+def _pct_rank_rows(values):
+    """
+    Row-wise `Series.rank(pct=True)` (average ranks for ties, NaN kept).
+    """
+    n_rows, n = values.shape
+    order = np.argsort(values, axis=1, kind='stable')   # NaNs go last
+    sorted_values = np.take_along_axis(values, order, axis=1)
+
+    # Positions of the first and the last element of each group of ties
+    pos = np.broadcast_to(np.arange(n), values.shape)
+    first = np.ones(values.shape, dtype=bool)
+    first[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+    last = np.ones(values.shape, dtype=bool)
+    last[:, :-1] = first[:, 1:]
+    start = np.maximum.accumulate(np.where(first, pos, 0), axis=1)
+    end = np.minimum.accumulate(np.where(last, pos, n - 1)[:, ::-1],
+                                axis=1)[:, ::-1]
+
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, (start + end) / 2 + 1, axis=1)
+
+    isnan = np.isnan(values)
+    counts = (~isnan).sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = ranks / counts
+    pct[isnan] = np.nan
+    return pct
+
+
+def _qcut_rows(values, q):
+    """
+    Row-wise `pd.qcut(row, q, labels=False, duplicates='drop') + 1`.
+
+    The rows with infinite values are rated by `pd.qcut` itself, as its
+    quantile edges around them (NaN where inf - inf is taken) and its
+    search over those edges are not reproduced here.
+    """
+    n_rows, n = values.shape
+    edges, unique = _qcut_edges_rows(values, q)
+    n_bins = unique.sum(axis=1, keepdims=True)
+
+    # Count the unique edges less than each value (searchsorted 'left'):
+    # sort values and edges together; a stable sort puts values before
+    # equal edges.
+    combined = np.concatenate([values, edges], axis=1)
+    order = np.argsort(combined, axis=1, kind='stable')
+    is_edge = order >= n
+    weights = np.where(
+        is_edge,
+        np.take_along_axis(unique, np.where(is_edge, order - n, 0), axis=1),
+        False)
+    counts = np.empty(order.shape, dtype=np.int64)
+    np.put_along_axis(counts, order, np.cumsum(weights, axis=1), axis=1)
+    ids = counts[:, :n]
+
+    # Include the lowest edge; values outside the bins get no rating
+    ids[values == edges[:, :1]] = 1
+    ratings = ids.astype(float)
+    ratings[np.isnan(values) | (ids == n_bins) | (ids == 0)] = np.nan
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)   # inf - inf
+        for i in np.flatnonzero(np.isinf(values).any(axis=1)):
+            ratings[i] = pd.qcut(values[i], q, labels=False,
+                                 duplicates='drop') + 1
+    return ratings
+
+
+def _qcut_edges_rows(values, q):
+    """
+    Return the quantile edges of each row, as computed by `pd.qcut`, and a
+    mask of the unique ones (duplicate edges are dropped by qcut).
+    """
+    qs = np.linspace(0, 1, q + 1)
+    np.putmask(qs, q * qs != np.arange(q + 1), np.nextafter(qs, 1))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)   # all-NaN rows
+        edges = np.nanquantile(values, qs, axis=1).T
+    unique = np.ones(edges.shape, dtype=bool)
+    unique[:, 1:] = edges[:, 1:] != edges[:, :-1]
+    return edges, unique
+
+
+#------------------------------------------------------------------------------
+
+class RatingBreakpoints:
+    """
+    Frozen rating breakpoints of a universe, to rate new values in
+    O(log N) without ranking the universe again.
+
+    The breakpoints are the values at which the rating steps up: with
+    method 'rank', the smallest value of the universe rated 2, 3, ..., 99;
+    with method 'qcut', the unique quantile edges of `pd.qcut`. A value is
+    rated by a binary search over them. Values of the universe get the same
+    ratings as `calc_ratings`; a new value gets the rating of the universe
+    values at or just below it ('rank') or of the quantile bin it falls in
+    ('qcut', clipped to the lowest and highest bins).
+
+    Parameters
+    ----------
+    edges: array-like
+        The sorted breakpoints.
+
+    method: str, optional
+        Either 'rank' (default) or 'qcut'.
+
+    Examples
+    --------
+    >>> rs = pd.Series([95., 99., 100., 101., 103.])
+    >>> bp = RatingBreakpoints.from_values(rs)
+    >>> list(bp.rate(rs)) == list(calc_ratings(rs))
+    True
+    >>> bp.rate([90., 100.5, 110., np.nan])
+    array([ 1, 60, 99,  0], dtype=int8)
+    >>> RatingBreakpoints.from_json(bp.to_json()).rate(100.5)
+    np.int8(60)
+    """
+    def __init__(self, edges, method='rank'):
+        if method not in ('rank', 'qcut'):
+            raise ValueError("method must be either 'rank' or 'qcut'")
+        self.edges = np.asarray(edges, dtype=float)
+        self.method = method
+
+    @classmethod
+    def from_values(cls, values, method='rank'):
+        """
+        Compute the breakpoints of a universe.
+
+        Parameters
+        ----------
+        values: array-like
+            RS values of the universe (NaNs are ignored).
+
+        method: str, optional
+            Either 'rank' (default) or 'qcut'.
+
+        Returns
+        -------
+        RatingBreakpoints
+            The breakpoints of the universe.
+        """
+        values = np.asarray(values, dtype=float)
+        values = np.sort(values[~np.isnan(values)])
+        if not len(values):
+            raise ValueError("No values to compute the breakpoints from.")
+
+        if method == 'rank':
+            # The smallest value rated r or more, for r = 2, ..., 99
+            ratings = _rate_rows(values[np.newaxis], 'rank')[0]
+            pos = np.searchsorted(ratings, np.arange(2, 100))
+            edges = np.append(values, np.inf)[pos]
+        elif method == 'qcut':
+            edges, unique = _qcut_edges_rows(values[np.newaxis], 99)
+            edges = edges[0][unique[0]]
+        else:
+            raise ValueError("method must be either 'rank' or 'qcut'")
+        return cls(edges, method)
+
+    def rate(self, values):
+        """
+        Rate values against the breakpoints.
+
+        Parameters
+        ----------
+        values: float or array-like
+            RS values to rate.
+
+        Returns
+        -------
+        np.int8 or np.ndarray
+            int8 ratings from 1 (worst) to 99 (best), 0 for NaN values.
+        """
+        values = np.asarray(values, dtype=float)
+        if self.method == 'rank':
+            ratings = np.searchsorted(self.edges, values, side='right') + 1
+        else:
+            ratings = np.clip(np.searchsorted(self.edges, values),
+                              1, max(len(self.edges) - 1, 1))
+        return np.where(np.isnan(values), 0, ratings).astype(np.int8)[()]
+
+    def to_dict(self):
+        """Return the breakpoints as a JSON-serializable dictionary."""
+        return {'method': self.method, 'edges': self.edges.tolist()}
+
+    @classmethod
+    def from_dict(cls, d):
+        """Create the breakpoints from the dictionary of `to_dict`."""
+        return cls(d['edges'], d['method'])
+
+    def to_json(self):
+        """Return the breakpoints as a JSON string."""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, s):
+        """Create the breakpoints from the JSON string of `to_json`."""
+        return cls.from_dict(json.loads(s))
+
+
+class KLLSketch:
+    """
+    Mergeable KLL quantile sketch of RS values, for ratings over shards.
+
+    Each worker builds a sketch from the RS values of its shard of tickers;
+    the sketches are merged centrally (or serialized and sent back), and
+    the merged sketch rates any value against the global distribution. The
+    sketch keeps levels of sorted samples, the samples of level h standing
+    for 2**h values each; a level over its capacity is compacted by keeping
+    every other sample (from a random offset) one level up. The memory is
+    O(k) no matter how many values are added, and the rank error shrinks
+    as 1/k (typically within a rating point for the default k=200).
+
+    Parameters
+    ----------
+    k: int, optional
+        Capacity of the top level, controlling the accuracy. Defaults to
+        200.
+
+    seed: int, optional
+        Seed of the random compaction offsets.
+
+    Examples
+    --------
+    >>> rng = np.random.default_rng(0)
+    >>> rs = pd.Series(rng.normal(100, 20, 20000))
+    >>> shards = [KLLSketch(seed=i).update(part)
+    ...           for i, part in enumerate(np.array_split(rs, 4))]
+    >>> sketch = KLLSketch.from_json(shards[0].to_json())
+    >>> for shard in shards[1:]:
+    ...     sketch = sketch.merge(shard)
+    >>> sketch.n
+    20000
+    >>> exact = calc_ratings(rs).to_numpy(dtype=int)
+    >>> int(np.abs(sketch.rate(rs).astype(int) - exact).max()) <= 1
+    True
+    """
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """
+        Add values (e.g., the RS columns of a shard) to the sketch.
+
+        Parameters
+        ----------
+        values: array-like
+            Values to add, of any shape. NaNs are ignored.
+
+        Returns
+        -------
+        KLLSketch
+            The sketch itself.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one.
+
+        Parameters
+        ----------
+        other: KLLSketch
+            The sketch to merge. It is not modified.
+
+        Returns
+        -------
+        KLLSketch
+            The sketch itself.
+        """
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def rank(self, values):
+        """
+        Estimate the fraction of the values that are less than or equal to
+        each of `values`.
+        """
+        items, cum = self._cumulative()
+        pos = np.searchsorted(items, np.asarray(values, dtype=float),
+                              side='right')
+        return np.append(0, cum)[pos] / max(self.n, 1)
+
+    def quantile(self, qs):
+        """
+        Estimate quantiles with the linear interpolation of `np.quantile`.
+        """
+        items, cum = self._cumulative()
+        qs = np.asarray(qs, dtype=float)
+
+        # Samples at the 0-based positions around q * (n - 1)
+        pos = qs * (self.n - 1)
+        lo = np.floor(pos)
+        at = lambda p: items[np.minimum(np.searchsorted(cum, p, side='right'),
+                                        len(items) - 1)]
+        v_lo, v_hi = at(lo), at(np.minimum(lo + 1, self.n - 1))
+        quantiles = v_lo + (pos - lo) * (v_hi - v_lo)
+        quantiles = np.where(qs <= 0, self.min, quantiles)
+        return np.where(qs >= 1, self.max, quantiles)
+
+    def breakpoints(self, method='rank'):
+        """
+        Compute the rating breakpoints of the sketched distribution.
+
+        Parameters
+        ----------
+        method: str, optional
+            Either 'rank' (default) or 'qcut'.
+
+        Returns
+        -------
+        RatingBreakpoints
+            Breakpoints to rate values against the sketched distribution.
+        """
+        if not self.n:
+            raise ValueError("No values to compute the breakpoints from.")
+        if method == 'rank':
+            # The smallest sample rated r or more, for r = 2, ..., 99
+            items, cum = self._cumulative()
+            ratings = np.round(cum / self.n * 98 + 1)
+            pos = np.searchsorted(ratings, np.arange(2, 100))
+            edges = np.append(items, np.inf)[pos]
+        elif method == 'qcut':
+            qs = np.linspace(0, 1, 100)
+            edges = np.unique(self.quantile(qs))
+        else:
+            raise ValueError("method must be either 'rank' or 'qcut'")
+        return RatingBreakpoints(edges, method)
+
+    def rate(self, values, method='rank'):
+        """
+        Rate values against the sketched distribution.
+
+        Returns
+        -------
+        np.int8 or np.ndarray
+            int8 ratings from 1 (worst) to 99 (best), 0 for NaN values.
+        """
+        return self.breakpoints(method).rate(values)
+
+    def to_dict(self):
+        """Return the sketch as a JSON-serializable dictionary."""
+        return {
+            'k': self.k,
+            'n': self.n,
+            'min': self.min if self.n else None,
+            'max': self.max if self.n else None,
+            'levels': [items.tolist() for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, d, seed=None):
+        """Create a sketch from the dictionary of `to_dict`."""
+        sketch = cls(d['k'], seed)
+        sketch.n = d['n']
+        if sketch.n:
+            sketch.min, sketch.max = d['min'], d['max']
+        sketch.levels = [np.asarray(items, dtype=float)
+                         for items in d['levels']]
+        return sketch
+
+    def to_json(self):
+        """Return the sketch as a JSON string."""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, s, seed=None):
+        """Create a sketch from the JSON string of `to_json`."""
+        return cls.from_dict(json.loads(s), seed)
+
+    def _capacity(self, h):
+        """Capacity of level h (shrinking geometrically below the top)."""
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        """Compact the lowest full levels until the sketch fits."""
+        while (sum(map(len, self.levels))
+               > sum(map(self._capacity, range(len(self.levels))))):
+            h = next(h for h, items in enumerate(self.levels)
+                     if len(items) > self._capacity(h))
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[h])
+            n_pairs = len(items) // 2 * 2
+            offset = self._rng.integers(2)
+            self.levels[h + 1] = np.concatenate(
+                [self.levels[h + 1], items[offset:n_pairs:2]])
+            self.levels[h] = items[n_pairs:]
+
+    def _cumulative(self):
+        """Return the sorted samples and their cumulative weights."""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.**h)
+                                  for h, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
 
 
 #------------------------------------------------------------------------------
 
+def lookback_snapshots(panel, lookbacks, current=None, end_date=None):
+    """
+    Take the values of all columns of a panel at several lookback dates.
+
+    Each lookback date is resolved to a row position once with a binary
+    search of the dates, and the rows are gathered for all columns at once
+    from the forward-filled panel, so many lookbacks cost about as much as
+    one. The value of a column at a date is that of
+    ``panel[column].asof(date)``.
+
+    Parameters
+    ----------
+    panel: pd.DataFrame
+        Values (dates x tickers) with a sorted DatetimeIndex, e.g., an RS
+        panel.
+
+    lookbacks: dict or list
+        The lookback offsets from `end_date` (pd.DateOffset): a dictionary
+        of offsets keyed by the column names of the result, or a list of
+        offsets named like '1 Week Ago' and '3 Months Ago'.
+
+    current: str, optional
+        If given, the values at `end_date` are included as the first column
+        of the result under this name (e.g., 'RS').
+
+    end_date: pd.Timestamp, optional
+        The date the lookbacks are taken from. Defaults to the last date of
+        `panel`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The snapshots (tickers x lookbacks), indexed by the columns of
+        `panel`, float32 if the panel is. Dates before the first row give
+        NaN.
+
+    Examples
+    --------
+    >>> panel = pd.DataFrame({'A': [1., np.nan, 3.], 'B': [4., 5., np.nan]},
+    ...     index=pd.to_datetime(['2024-01-31', '2024-02-29', '2024-03-29']))
+    >>> lookback_snapshots(panel, [pd.DateOffset(months=1),
+    ...                            pd.DateOffset(months=3)], current='RS')
+        RS  1 Month Ago  3 Months Ago
+    A  3.0          1.0           NaN
+    B  5.0          5.0           NaN
+    """
+    if not isinstance(lookbacks, dict):
+        lookbacks = {_lookback_name(offset): offset for offset in lookbacks}
+    if end_date is None:
+        end_date = panel.index[-1]
+
+    names = list(lookbacks)
+    dates = [end_date - offset for offset in lookbacks.values()]
+    if current is not None:
+        names.insert(0, current)
+        dates.insert(0, end_date)
+
+    # Positions of the last rows at or before the dates
+    positions = panel.index.searchsorted(pd.DatetimeIndex(dates),
+                                         side='right') - 1
+    dtype = _float_dtype(panel)
+    snapshots = np.full((len(names), panel.shape[1]), np.nan, dtype=dtype)
+    valid = positions >= 0
+    if valid.any():
+        ffilled = panel.iloc[:positions.max() + 1].ffill()
+        snapshots[valid] = ffilled.to_numpy(dtype=dtype)[positions[valid]]
+
+    return pd.DataFrame(snapshots.T, index=panel.columns, columns=names)
+
+
+def _lookback_name(offset):
+    """
+    Name the column of a lookback offset, e.g., '3 Months Ago' for
+    ``pd.DateOffset(months=3)``.
+    """
+    kwds = getattr(offset, 'kwds', {})
+    if len(kwds) != 1:
+        return f'{offset} Ago'
+    unit, n = next(iter(kwds.items()))
+    unit = unit.rstrip('s').capitalize()
+    return f"{n} {unit}{'' if n == 1 else 's'} Ago"
+
+
+#------------------------------------------------------------------------------
+
+@staged('ranking_utils.groupby_industry')
 def groupby_industry(stock_df, columns, key='RS'):
     """
     Groups the stock DataFrame by industry and performs aggregation only on
@@ -114,33 +777,54 @@ def groupby_industry(stock_df, columns, key='RS'):
     pd.DataFrame
         Aggregated DataFrame grouped by industry.
     """
-    def get_sorted_items(items, column):
-        """Sorts items (e.g., Tickers or Names) based on RS values."""
-        return ','.join(
-            sorted(
-                map(str, items),  # Convert items to strings before joining
-                key=lambda t: stock_df.loc[stock_df[column] == t, key].values[0]
-                    if len(stock_df.loc[stock_df[column] == t, key].values) > 0
-                    else float('-inf'),  # Set default value if no matching RS
-                reverse=True
-            )
-        )
-
     agg_funcs = {}
+    sorted_items = {}
 
     # Process only the specified columns in `columns`
     for col in columns:
         if col in ['Ticker', 'Name']:
-            agg_funcs[col] = lambda i, c=col: get_sorted_items(i, c)
+            sorted_items[col] = _join_sorted_items(stock_df, col, key)
+            agg_funcs[col] = 'first'    # replaced by the sorted items below
         elif pd.api.types.is_numeric_dtype(stock_df[col]):
             agg_funcs[col] = lambda x: round(x.mean(), 2)
         else:
             agg_funcs[col] = 'first'
 
     # Perform aggregation
-    industry_df = stock_df.groupby('Industry').agg(agg_funcs).reset_index()
+    industry_df = stock_df.groupby('Industry', observed=True).agg(
+        agg_funcs).reset_index()
+    industries = industry_df['Industry']
+    if isinstance(industries.dtype, pd.CategoricalDtype):
+        industries = industries.astype(industries.dtype.categories.dtype)
+    for col, items in sorted_items.items():
+        industry_df[col] = industries.map(items)
 
     return industry_df
 
+
+def _join_sorted_items(stock_df, column, key):
+    """
+    Join the items (e.g., Tickers or Names) of each industry into a string,
+    sorted by their `key` values in descending order.
+
+    The rows are sorted once (stable, with NaN keys last) and then grouped,
+    instead of sorting each industry with a lookup of every item.
+    """
+    items = stock_df[column]
+
+    # The key of an item is that of its first row
+    first = ~items.duplicated().to_numpy()
+    keys = items.map(pd.Series(stock_df[key].to_numpy()[first],
+                               index=items.to_numpy()[first]))
+
+    order = keys.reset_index(drop=True).sort_values(
+        ascending=False, kind='stable', na_position='last').index
+    sorted_df = pd.DataFrame({
+        'Industry': stock_df['Industry'].to_numpy()[order],
+        column: items.to_numpy()[order].astype(str),
+    })
+    return sorted_df.groupby('Industry', sort=False,
+                             observed=True)[column].agg(','.join)
+
 #------------------------------------------------------------------------------
 
@@ -0,0 +1,292 @@
+"""
+Process-wide rate limiting of Yahoo Finance requests.
+
+Every request that fetches data of a single ticker (info, financials) goes
+through the shared `RateLimiter`, a token bucket whose rate adapts to the
+responses of the upstream with AIMD (additive increase, multiplicative
+decrease): the rate ramps up while responses are healthy and is cut back
+when the upstream throttles (HTTP 429) or fails.
+
+Main Classes and Functions:
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+- RateLimiter: Adaptive token bucket.
+- rate_limiter: Return the shared RateLimiter.
+- set_rate_limiter: Replace the shared RateLimiter (e.g., to tune the rates
+  or to test against a local stub server).
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+__all__ = [
+    'RateLimiter',
+    'rate_limiter',
+    'set_rate_limiter',
+    'is_throttled',
+    'is_transient',
+]
+
+import asyncio
+import contextlib
+import threading
+import time
+
+
+#------------------------------------------------------------------------------
+# Adaptive Token Bucket
+#------------------------------------------------------------------------------
+
+class RateLimiter:
+    """
+    Token bucket with AIMD rate adaptation, shared by threads.
+
+    Each request takes a token; tokens are refilled at `rate` per second up
+    to `burst`. A request that finds the bucket empty reserves the next
+    token and sleeps until it is due, so concurrent callers are served in
+    order. Each healthy response adds `increase` to the rate (up to
+    `max_rate`); a throttled response multiplies it by `decrease` and pauses
+    all requests for `cooldown` seconds, and a transient error multiplies
+    it by `error_decrease` (down to `min_rate`).
+
+    Parameters
+    ----------
+    rate: float, optional
+        Initial rate in requests per second. Defaults to 2.
+    min_rate: float, optional
+        Lower bound of the rate. Defaults to 0.2.
+    max_rate: float, optional
+        Upper bound of the rate. Defaults to 10.
+    burst: float, optional
+        Capacity of the bucket. Defaults to 1.
+    increase: float, optional
+        Rate added per healthy response. Defaults to 0.1.
+    decrease: float, optional
+        Factor of the rate on a throttled response. Defaults to 0.5.
+    error_decrease: float, optional
+        Factor of the rate on a transient error. Defaults to 0.9.
+    cooldown: float, optional
+        Seconds to pause all requests after a throttled response. Further
+        throttled responses during the pause do not cut the rate again.
+        Defaults to 5.
+    clock: callable, optional
+        Monotonic clock in seconds. Defaults to `time.monotonic`.
+    sleep: callable, optional
+        Function to sleep a number of seconds. Defaults to `time.sleep`.
+
+    Examples
+    --------
+    >>> t = [0.]
+    >>> limiter = RateLimiter(rate=2, clock=lambda: t[0],
+    ...                       sleep=lambda s: t.__setitem__(0, t[0] + s))
+    >>> for _ in range(3):
+    ...     limiter.acquire()
+    >>> t[0]
+    1.0
+    >>> limiter.on_throttle()
+    >>> limiter.rate
+    1.0
+    >>> limiter.acquire()
+    >>> t[0]
+    7.0
+    """
+    def __init__(self, rate=2., min_rate=.2, max_rate=10., burst=1.,
+                 increase=.1, decrease=.5, error_decrease=.9, cooldown=5.,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.error_decrease = error_decrease
+        self.cooldown = cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._resume_at = self._updated
+
+    def reserve(self):
+        """
+        Take a token and return the seconds to wait before using it.
+
+        Returns
+        -------
+        float
+            Seconds until the reserved token is due (0 if it is available).
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            return (max(0., self._resume_at - now)
+                    + max(0., -self._tokens) / self.rate)
+
+    def acquire(self):
+        """
+        Block until a request is allowed.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Wait on the event loop until a request is allowed.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """
+        Report a healthy response (additive increase of the rate).
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        """
+        Report a throttled response (multiplicative decrease of the rate and
+        a pause of all requests).
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._resume_at:
+                return      # already backing off from this burst of 429s
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.)
+            self._resume_at = now + self.cooldown
+
+    def on_error(self):
+        """
+        Report a transient error (mild multiplicative decrease of the rate).
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = max(self.min_rate, self.rate * self.error_decrease)
+
+    def report(self, exc=None):
+        """
+        Report the outcome of a request.
+
+        Parameters
+        ----------
+        exc: Exception, optional
+            The exception raised by the request, or None if it succeeded.
+            Exceptions that are neither throttling nor transient (e.g., an
+            unknown symbol) count as healthy responses.
+        """
+        if exc is not None and is_throttled(exc):
+            self.on_throttle()
+        elif exc is not None and is_transient(exc):
+            self.on_error()
+        else:
+            self.on_success()
+
+    @contextlib.contextmanager
+    def request(self):
+        """
+        Context manager that acquires a token before the enclosed request
+        and reports its outcome after it.
+        """
+        self.acquire()
+        try:
+            yield
+        except Exception as e:
+            self.report(e)
+            raise
+        self.report()
+
+    @contextlib.asynccontextmanager
+    async def request_async(self):
+        """
+        Asynchronous context manager that acquires a token before the
+        enclosed request and reports its outcome after it.
+        """
+        await self.acquire_async()
+        try:
+            yield
+        except Exception as e:
+            self.report(e)
+            raise
+        self.report()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update."""
+        elapsed = max(0., now - max(self._updated, self._resume_at))
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = max(now, self._updated)
+
+
+def is_throttled(exc):
+    """
+    Return whether an exception means the upstream is throttling requests.
+
+    Examples
+    --------
+    >>> is_throttled(Exception('Too Many Requests. Rate limited.'))
+    True
+    >>> is_throttled(KeyError('symbol'))
+    False
+    """
+    status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    return (status == 429 or type(exc).__name__ == 'YFRateLimitError'
+            or 'Too Many Requests' in str(exc))
+
+
+def is_transient(exc):
+    """
+    Return whether an exception is a transient failure of the upstream
+    (a server error, a timeout or a connection error).
+    """
+    status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if isinstance(status, int):
+        return status >= 500
+    return isinstance(exc, (OSError, TimeoutError))
+
+
+#------------------------------------------------------------------------------
+# Shared Rate Limiter
+#------------------------------------------------------------------------------
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def rate_limiter():
+    """
+    Return the process-wide RateLimiter, creating it if needed.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter()
+        return _shared
+
+
+def set_rate_limiter(limiter):
+    """
+    Replace the process-wide RateLimiter.
+
+    Parameters
+    ----------
+    limiter: RateLimiter or None
+        The new shared rate limiter. If None, a default one is created on
+        the next call of `rate_limiter`.
+    """
+    global _shared
+    with _shared_lock:
+        _shared = limiter
+
+
+#------------------------------------------------------------------------------
+# Unit Test
+#------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,325 @@
+"""
+Historical Results Store
+------------------------
+
+Keeps the stock and industry tables of every ranking run, so that the
+history of a ticker's or an industry's rating can be queried without
+parsing one CSV file per day.
+
+Each dataset (e.g., 'SPX/rs_12mo_rank/stocks') is a table partitioned by
+the date of the run: appending the tables of a date replaces what was
+stored for that date, so a run can be repeated. The rows are indexed by
+date and by their key column (the ticker or the industry), so a snapshot
+of a date and the history of a few tickers over hundreds of dates are each
+one indexed read. The store is a SQLite file in `cache.cache_dir`, like
+the price cache.
+
+Usage:
+~~~~~~
+::
+
+    from rs_rating import ibd_rs
+    from rs_rating.results import ResultsStore
+
+    store = ResultsStore()
+    stock_df, industry_df = ibd_rs.rankings(tickers)
+    store.append('SPX/rs_12mo_rank/stocks', stock_df)
+    store.append('SPX/rs_12mo_rank/industries', industry_df)
+
+    # NVDA's ratings over the last 200 runs
+    nvda = store.history('SPX/rs_12mo_rank/stocks', 'NVDA',
+                         columns=['Rating (RS)'],
+                         start=store.dates('SPX/rs_12mo_rank/stocks')[-200])
+    # The industry table of the latest run
+    industry_df = store.snapshot('SPX/rs_12mo_rank/industries')
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+__all__ = [
+    'ResultsStore',
+]
+
+import json
+
+import pandas as pd
+
+from .cache import _SQLiteCache
+
+
+# Key columns indexed for `ResultsStore.history`, in order of preference
+KEY_COLUMNS = ['Ticker', 'Industry']
+
+
+def _quote(name):
+    """Quote a column name for SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _date_text(date):
+    """Return the partition date as 'YYYY-MM-DD'."""
+    if date is None:
+        date = pd.Timestamp.now()
+    return pd.Timestamp(date).strftime('%Y-%m-%d')
+
+
+def _sql_type(dtype):
+    """Return the SQLite column type of a pandas dtype."""
+    if pd.api.types.is_bool_dtype(dtype) or \
+            pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+#------------------------------------------------------------------------------
+# Results Store
+#------------------------------------------------------------------------------
+
+class ResultsStore(_SQLiteCache):
+    """
+    Date-partitioned store of ranking tables.
+
+    Every dataset is a SQLite table with the columns of the appended
+    DataFrames plus the date of the partition and the position of the row
+    in it. Columns that appear in later runs are added to the table (NULL
+    in earlier partitions), and the pandas dtypes of the last run are
+    restored on reading.
+
+    Parameters
+    ----------
+    path: str, optional
+        Path of the SQLite file. Defaults to 'results.sqlite' in
+        `cache.cache_dir`.
+    """
+    filename = 'results.sqlite'
+    schema = '''
+        CREATE TABLE IF NOT EXISTS datasets (
+            name TEXT PRIMARY KEY,
+            tbl TEXT NOT NULL,
+            key TEXT,
+            dtypes TEXT NOT NULL
+        );
+    '''
+
+    def datasets(self):
+        """
+        Return the names of the stored datasets.
+
+        Returns
+        -------
+        list of str
+            The dataset names in alphabetical order.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT name FROM datasets ORDER BY name').fetchall()
+        return [name for name, in rows]
+
+    def dates(self, name):
+        """
+        Return the dates of the stored partitions of a dataset.
+
+        Parameters
+        ----------
+        name: str
+            Name of the dataset.
+
+        Returns
+        -------
+        pd.DatetimeIndex
+            The dates in increasing order (empty for an unknown dataset).
+        """
+        meta = self._meta(name)
+        if meta is None:
+            return pd.DatetimeIndex([], name='Date')
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT DISTINCT _date FROM {meta["tbl"]} '
+                'ORDER BY _date').fetchall()
+        return pd.DatetimeIndex([date for date, in rows], name='Date')
+
+    def append(self, name, df, date=None, key=None):
+        """
+        Store a table as the partition of a date, replacing what was stored
+        for that date.
+
+        Parameters
+        ----------
+        name: str
+            Name of the dataset (e.g., 'SPX/rs_12mo_rank/stocks').
+        df: pd.DataFrame
+            The table (e.g., the stock or industry table of `ibd_rs.rankings`
+            or the table of `rsm.ranking`).
+        date: str or pd.Timestamp, optional
+            Date of the partition. Defaults to today.
+        key: str, optional
+            Column indexed for `history`, fixed by the first append.
+            Defaults to 'Ticker', or 'Industry' if there is no 'Ticker'
+            column.
+        """
+        date = _date_text(date)
+        dtypes = {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+
+        with self._connect() as conn:
+            meta = self._meta(name, conn)
+            if meta is None:
+                if key is None:
+                    key = next((c for c in KEY_COLUMNS if c in dtypes), None)
+                tbl = self._create(conn, name, key, df)
+                meta = {'tbl': tbl, 'key': key, 'dtypes': {}}
+            tbl = meta['tbl']
+            for col in dtypes:
+                if col not in meta['dtypes']:
+                    if meta['dtypes']:
+                        conn.execute(
+                            f'ALTER TABLE {tbl} ADD COLUMN {_quote(col)} '
+                            f'{_sql_type(df[col].dtype)}')
+            meta['dtypes'].update(dtypes)
+            conn.execute('UPDATE datasets SET dtypes = ? WHERE name = ?',
+                         (json.dumps(meta['dtypes']), name))
+
+            values = df.astype(object).where(df.notna(), None)
+            columns = ', '.join(['_date', '_row'] +
+                                [_quote(col) for col in dtypes])
+            marks = ', '.join('?' * (len(dtypes) + 2))
+            conn.execute(f'DELETE FROM {tbl} WHERE _date = ?', (date,))
+            conn.executemany(
+                f'INSERT INTO {tbl} ({columns}) VALUES ({marks})',
+                ((date, i) + row for i, row in
+                 enumerate(values.itertuples(index=False, name=None))))
+
+    def snapshot(self, name, date=None, columns=None):
+        """
+        Load the partition of a date.
+
+        Parameters
+        ----------
+        name: str
+            Name of the dataset.
+        date: str or pd.Timestamp, optional
+            Date of the partition. Defaults to the latest one.
+        columns: list of str, optional
+            Columns to load. Defaults to all columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            The table in the order it was appended (empty if the dataset or
+            the partition is not stored).
+        """
+        meta = self._meta(name)
+        if meta is None:
+            return pd.DataFrame()
+        with self._connect() as conn:
+            if date is None:
+                date, = conn.execute(
+                    f'SELECT MAX(_date) FROM {meta["tbl"]}').fetchone()
+            else:
+                date = _date_text(date)
+            columns = list(meta['dtypes']) if columns is None else columns
+            df = pd.read_sql_query(
+                f'SELECT {", ".join(map(_quote, columns))} '
+                f'FROM {meta["tbl"]} WHERE _date = ? ORDER BY _row',
+                conn, params=(date,))
+        return self._restore(df, meta['dtypes'])
+
+    def history(self, name, keys, columns=None, start=None, end=None):
+        """
+        Load the rows of some tickers (or industries) over the stored dates.
+
+        Parameters
+        ----------
+        name: str
+            Name of the dataset.
+        keys: str or list of str
+            Values of the key column of the dataset (tickers for the stock
+            tables and industries for the industry tables).
+        columns: list of str, optional
+            Columns to load besides the key. Defaults to all columns.
+        start, end: str or pd.Timestamp, optional
+            The first and last dates to load. Default to all dates.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows sorted by date and key, with the date of each row in
+            the 'Date' column.
+
+        Raises
+        ------
+        ValueError
+            If the dataset has no key column.
+        """
+        meta = self._meta(name)
+        if meta is None:
+            return pd.DataFrame()
+        key = meta['key']
+        if key is None:
+            raise ValueError(f"dataset '{name}' has no key column")
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        if columns is None:
+            columns = list(meta['dtypes'])
+        columns = [key] + [c for c in columns if c != key]
+        start = '0000-00-00' if start is None else _date_text(start)
+        end = '9999-99-99' if end is None else _date_text(end)
+
+        dfs = []
+        with self._connect() as conn:
+            # Stay below SQLite's limit on the number of host parameters
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i+500]
+                dfs.append(pd.read_sql_query(
+                    f'SELECT _date AS Date, '
+                    f'{", ".join(map(_quote, columns))} '
+                    f'FROM {meta["tbl"]} '
+                    f'WHERE {_quote(key)} IN ({",".join("?" * len(chunk))}) '
+                    'AND _date BETWEEN ? AND ?',
+                    conn, params=chunk + [start, end]))
+        df = pd.concat(dfs, ignore_index=True) if len(dfs) > 1 else dfs[0]
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.sort_values(['Date', key], ignore_index=True)
+        return self._restore(df, meta['dtypes'])
+
+    def _meta(self, name, conn=None):
+        """Return the table, key column and dtypes of a dataset, or None."""
+        if conn is None:
+            with self._connect() as conn:
+                return self._meta(name, conn)
+        row = conn.execute(
+            'SELECT tbl, key, dtypes FROM datasets WHERE name = ?',
+            (name,)).fetchone()
+        if row is None:
+            return None
+        tbl, key, dtypes = row
+        return {'tbl': tbl, 'key': key, 'dtypes': json.loads(dtypes)}
+
+    def _create(self, conn, name, key, df):
+        """Create the table of a new dataset and return its name."""
+        count, = conn.execute('SELECT COUNT(*) FROM datasets').fetchone()
+        tbl = f'dataset_{count}'
+        columns = ', '.join(f'{_quote(str(col))} {_sql_type(dtype)}'
+                            for col, dtype in df.dtypes.items())
+        conn.execute(f'CREATE TABLE {tbl} (_date TEXT NOT NULL, '
+                     f'_row INTEGER NOT NULL, {columns})')
+        conn.execute(f'CREATE INDEX {tbl}_date ON {tbl} (_date)')
+        if key is not None:
+            conn.execute(f'CREATE INDEX {tbl}_key ON {tbl} '
+                         f'({_quote(key)}, _date)')
+        conn.execute('INSERT INTO datasets VALUES (?, ?, ?, ?)',
+                     (name, tbl, key, '{}'))
+        return tbl
+
+    @staticmethod
+    def _restore(df, dtypes):
+        """Restore the stored pandas dtypes of the loaded columns."""
+        for col in df.columns:
+            if col not in dtypes:
+                continue
+            try:
+                df[col] = df[col].astype(dtypes[col])
+            except (TypeError, ValueError):
+                # e.g., NULLs of an int column missing in older partitions
+                pass
+        return df
@@ -35,20 +35,32 @@ See Also:
 """
 __version__ = "4.9"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/23 (initial version) ~ 2025/07/19 (last revision)"
+__date__ = "2024/08/23 (initial version) ~ 2026/10/17 (last revision)"
 
 __all__ = [
     'mansfield_relative_strength',
     'dorsey_relative_strength',
     'ranking',
+    'ranking_from_prices',
 ]
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
 from . import yf_utils as yfu
-from .ranking_utils import append_ratings
+from .instrument import staged
+from .ranking_utils import append_ratings, lookback_snapshots
+
+
+# The lookback columns of the ranking table ('1 Week Ago', ...)
+LOOKBACKS = [pd.DateOffset(weeks=1), *(pd.DateOffset(months=n)
+                                       for n in (1, 3, 6, 9))]
+
+# The info and financials fields used by the ranking
+INFO_FIELDS = ['quoteType', 'previousClose',
+               'trailingEps', 'revenuePerShare', 'trailingPE',
+               'marketCap', 'sharesOutstanding', 'sector', 'industry',]
+FINANCIALS_FIELDS = ['Basic EPS', 'Operating Revenue']
 
 
 #------------------------------------------------------------------------------
@@ -67,6 +79,7 @@ def exponential_moving_average(values, window, min_periods=1, adjust=False):
 # Relative (Price) Stength
 #------------------------------------------------------------------------------
 
+@staged('rsm.mansfield_relative_strength')
 def mansfield_relative_strength(closes, closes_index, window, ma='SMA'):
     """
     Calculate Mansfield Relative Strength (RSM) for given close prices, index
@@ -75,8 +88,9 @@ def mansfield_relative_strength(closes, closes_index, window, ma='SMA'):
 
     Parameters
     ----------
-    closes: pandas.Series
-        Series of closing prices for the stock.
+    closes: pandas.Series or pandas.DataFrame
+        Series of closing prices for the stock, or a DataFrame of them with
+        one column per stock.
     closes_index: pandas.Series
         Series of closing prices for the benchmark index.
     window: int
@@ -87,9 +101,10 @@ def mansfield_relative_strength(closes, closes_index, window, ma='SMA'):
 
     Returns
     -------
-    pandas.Series
+    pandas.Series or pandas.DataFrame
         Series containing the calculated Mansfield Relative Strength (RSM)
-        values with given moving average method.
+        values with given moving average method (a DataFrame if `closes` is
+        one).
 
     Examples
     --------
@@ -132,23 +147,25 @@ def dorsey_relative_strength(closes, closes_index):
 
     Parameters
     ----------
-    closes: pandas.Series
-        Series of closing prices for the stock.
+    closes: pandas.Series or pandas.DataFrame
+        Series of closing prices for the stock, or a DataFrame of them with
+        one column per stock.
 
     closes_index: pandas.Series
         Series of closing prices for the benchmark index.
 
     Returns
     -------
-    pandas.Series
+    pandas.Series or pandas.DataFrame
         Series containing the calculated Dorsey Relative Strength (RSD) values.
     """
-    return (closes / closes_index) * 100
+    return closes.div(closes_index, axis=0) * 100
 
 #------------------------------------------------------------------------------
 # EPS Relative Strength
 #------------------------------------------------------------------------------
 
+@staged('rsm.relative_strength_vs_benchmark')
 def relative_strength_vs_benchmark(metric_series, bench_series, window=4):
     """
     Calculate the relative strength of a financial metric relative to a
@@ -213,8 +230,10 @@ def relative_strength_vs_benchmark(metric_series, bench_series, window=4):
 # Ranking
 #------------------------------------------------------------------------------
 
+@staged('rsm.ranking')
 def ranking(tickers, ticker_ref='^GSPC',
-            period='2y', interval='1wk', ma="SMA"):
+            period='2y', interval='1wk', ma="SMA", chunk_size=None,
+            lookbacks=None, compact=False):
     """
     Rank stocks based on their Mansfield Relative Strength (RSM) against an
     index benchmark.
@@ -238,11 +257,124 @@ def ranking(tickers, ticker_ref='^GSPC',
     ma: str, optional
         Moving average type ('SMA', 'EMA'). Default to 'SMA'.
 
+    chunk_size: int, optional
+        If given, the prices are downloaded and processed for `chunk_size`
+        stocks at a time, keeping only the closes and volumes of one chunk
+        in memory. The benchmark is downloaded once, and every chunk is
+        aligned to its dates. Default to None (all stocks at once).
+
+    lookbacks: dict or list, optional
+        The lookback offsets of the past RS columns (see
+        `ranking_utils.lookback_snapshots`). Default to `LOOKBACKS` (1 week,
+        and 1, 3, 6 and 9 months ago).
+
+    compact: bool, optional
+        If True, the closes, volumes and RSM are float32, the ratings int8
+        (0 for no rating) and 'Sector' and 'Industry' categorical, which
+        about halves the memory of the panels. Default to False.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame containing the ranked stocks.
+    """
+    # Validate the options before downloading
+    _ranking_windows(interval, ma)
+
+    # Fetch info for stocks
+    info = yfu.download_tickers_info(tickers, INFO_FIELDS)
+    tickers = _equity_tickers(tickers, info)
+
+    # Fetch data for stocks and index (only the closes and volumes are used)
+    fields = ['Close', 'Volume']
+    if chunk_size is None:
+        df_all = yfu.download_prices([ticker_ref] + tickers, period=period,
+                                     interval=interval, fields=fields)
+        df_ref = df_all.xs(ticker_ref, level='Ticker', axis=1)
+        print("Num of downloaded stocks: "
+              f"{len(df_all.columns.get_level_values('Ticker').unique())}")
+        chunks = [(tickers, df_all)]
+    else:
+        df_ref = yfu.download_prices([ticker_ref], period=period,
+                                     interval=interval, fields=fields)
+        df_ref = df_ref.xs(ticker_ref, level='Ticker', axis=1)
+        chunks = yfu.download_price_chunks(tickers, chunk_size, period,
+                                           interval, fields,
+                                           index=df_ref.index)
+
+    # Fetch financials data for stocks
+    financials = yfu.download_financials(tickers, FINANCIALS_FIELDS)
+
+    return _rank_chunks(chunks, df_ref, info, financials,
+                        interval, ma, lookbacks, compact)
+
+
+@staged('rsm.ranking_from_prices')
+def ranking_from_prices(prices, info, financials, tickers=None,
+                        ticker_ref='^GSPC', interval='1wk', ma="SMA",
+                        lookbacks=None, compact=False):
+    """
+    Rank stocks like `ranking`, from prices, info and financials that were
+    already downloaded (e.g., once for the jobs of `batch.run_batch`).
+
+    Parameters
+    ----------
+    prices: pandas.DataFrame
+        Prices of the stocks and the benchmark, as returned by
+        `yf_utils.download_prices`, with at least the 'Close' and 'Volume'
+        fields.
+
+    info: dict
+        A dictionary where each key is a stock ticker and the value is a
+        dictionary of the `INFO_FIELDS` of the ticker.
+
+    financials: dict
+        A dictionary where each key is a stock ticker and the value is a
+        DataFrame of the `FINANCIALS_FIELDS` of the ticker.
+
+    tickers: list of str, optional
+        List of stock tickers to rank. Default to all the stocks of
+        `prices` except `ticker_ref`.
+
+    ticker_ref: str, optional
+        Ticker symbol of the benchmark. Default to '^GSPC' (S&P 500)
+
+    interval: str, optional
+        Interval of the prices ('1d', '1wk'). Default to '1wk' (one week).
+
+    ma: str, optional
+        Moving average type ('SMA', 'EMA'). Default to 'SMA'.
+
+    lookbacks: dict or list, optional
+        The lookback offsets of the past RS columns. Default to
+        `LOOKBACKS`.
+
+    compact: bool, optional
+        If True, use compact dtypes (see `ranking`). Default to False.
+
     Returns
     -------
     pandas.DataFrame
         DataFrame containing the ranked stocks.
     """
+    _ranking_windows(interval, ma)
+    if tickers is None:
+        tickers = prices.columns.get_level_values('Ticker').unique()
+        tickers = [t for t in tickers if t != ticker_ref]
+    tickers = _equity_tickers(tickers, info)
+
+    # The benchmarks of the financials are weighted over the ranked stocks
+    financials = {t: financials[t] for t in tickers if t in financials}
+    df_ref = prices.xs(ticker_ref, level='Ticker', axis=1)
+    return _rank_chunks([(tickers, prices)], df_ref, info, financials,
+                        interval, ma, lookbacks, compact)
+
+
+def _ranking_windows(interval, ma):
+    """
+    Return the MA function and the RS, MA and volume MA windows of
+    `ranking`.
+    """
     # Select the MA function based on the 'ma' parameter
     try:
         ma_func = {
@@ -260,26 +392,21 @@ def ranking(tickers, ticker_ref='^GSPC',
     except KeyError:
         raise ValueError("Invalid interval. " "Must be '1d', or '1wk'.")
 
-    # Fetch info for stocks
-    info = yfu.download_tickers_info(
-        tickers,
-        ['quoteType', 'previousClose',
-         'trailingEps', 'revenuePerShare', 'trailingPE',
-         'marketCap', 'sharesOutstanding', 'sector', 'industry',]
-    )
+    return ma_func, rs_win, ma_wins, vma_win
+
+
+def _equity_tickers(tickers, info):
+    """Keep the tickers of stocks (equities) with info."""
     tickers = [t for t in tickers if t in info]
-    tickers = [t for t in tickers if info[t]['quoteType'] == 'EQUITY']
+    return [t for t in tickers if info[t]['quoteType'] == 'EQUITY']
 
-    # Fetch data for stocks and index
-    df_all = yf.download([ticker_ref] + tickers, period=period, interval=interval,
-                         auto_adjust=True)
-    df_ref = df_all.xs(ticker_ref, level='Ticker', axis=1)
-    print("Num of downloaded stocks: "
-          f"{len(df_all.columns.get_level_values('Ticker').unique())}")
 
-    # Fetch financials data for stocks
-    financials = yfu.download_financials(tickers, ['Basic EPS',
-                                                   'Operating Revenue'])
+def _rank_chunks(chunks, df_ref, info, financials, interval, ma,
+                 lookbacks, compact):
+    """
+    Create the ranking table of `ranking` from chunks of (tickers, prices).
+    """
+    ma_func, rs_win, ma_wins, vma_win = _ranking_windows(interval, ma)
 
     epses_index = yfu.calc_weighted_metric(financials, info,
                                            'Basic EPS', 'sharesOutstanding')
@@ -287,60 +414,69 @@ def ranking(tickers, ticker_ref='^GSPC',
                                           'Operating Revenue', 'marketCap')
     #print(epses_index)
 
-    rows = []
-    price_ma = {}
-    for ticker in tickers:
-        df = df_all.xs(ticker, level='Ticker', axis=1)
-        rsm = mansfield_relative_strength(df['Close'], df_ref['Close'],
-                                          rs_win, ma=ma)
-
-        for win in ma_wins:
-            price_ma[f'{win}'] = ma_func(df['Close'], win).round(2)
-        vol_div_vma = (df['Volume'] / ma_func(df['Volume'], vma_win)).round(2)
-
-        epses = financials[ticker]['Basic EPS']
-        eps_rs = relative_strength_vs_benchmark(epses, epses_index)
-        revs = financials[ticker]['Operating Revenue']
-        rev_rs = relative_strength_vs_benchmark(revs, revs_index)
-
-        pe = info[ticker]['trailingPE']
-        if not isinstance(pe, float):
-            print(f"info[{ticker}]['trailingPE']: {pe}")
-            pe = np.nan
-
-        end_date = rsm.index[-1]
-
-        # Construct DataFrame for current stock
-        row = {
-            'Ticker': ticker,
-            'Sector': info[ticker]['sector'],
-            'Industry': info[ticker]['industry'],
-            'RS': rsm.asof(end_date),
-            '1 Week Ago': rsm.asof(end_date - pd.DateOffset(weeks=1)),
-            '1 Month Ago': rsm.asof(end_date - pd.DateOffset(months=1)),
-            '3 Months Ago': rsm.asof(end_date - pd.DateOffset(months=3)),
-            '6 Months Ago': rsm.asof(end_date - pd.DateOffset(months=6)),
-            '9 Months Ago': rsm.asof(end_date - pd.DateOffset(months=9)),
-            'Price': df['Close'].asof(end_date).round(2),
-            **{f'MA{w}': price_ma[f'{w}'].iloc[-1] for w in ma_wins},
-            f'Volume / VMA{vma_win}': vol_div_vma.iloc[-1],
-            'EPS RS (%)': eps_rs.iloc[-1],
-            'TTM EPS': info[ticker]['trailingEps'],
-            'Rev RS (%)': rev_rs.iloc[-1],
-            'TTM RPS': info[ticker]['revenuePerShare'],
-            'TTM PE': round(pe, 2),
-        }
-        rows.append(row)
-
-    # Combine rows into a single DataFrame
-    ranking_df = pd.DataFrame(rows)
+    if lookbacks is None:
+        lookbacks = LOOKBACKS
+
+    frames = []
+    for chunk, df_all in chunks:
+        # Compute the RSM panel and the MAs of all stocks in the chunk at once
+        closes = df_all['Close'][chunk]
+        volumes = df_all['Volume'][chunk]
+        closes_ref = df_ref['Close']
+        if compact:
+            closes = closes.astype(np.float32)
+            volumes = volumes.astype(np.float32)
+            closes_ref = closes_ref.astype(np.float32)
+        rsm = mansfield_relative_strength(closes, closes_ref, rs_win, ma=ma)
+        if compact:
+            rsm = rsm.astype(np.float32)
+        snapshots = lookback_snapshots(rsm, lookbacks, current='RS')
+        vol_div_vma = (volumes / ma_func(volumes, vma_win)).round(2)
+
+        eps_rs, rev_rs, pes = [], [], []
+        for ticker in chunk:
+            epses = financials[ticker]['Basic EPS']
+            eps_rs.append(
+                relative_strength_vs_benchmark(epses, epses_index).iloc[-1])
+            revs = financials[ticker]['Operating Revenue']
+            rev_rs.append(
+                relative_strength_vs_benchmark(revs, revs_index).iloc[-1])
+
+            pe = info[ticker]['trailingPE']
+            if not isinstance(pe, float):
+                print(f"info[{ticker}]['trailingPE']: {pe}")
+                pe = np.nan
+            pes.append(round(pe, 2))
+
+        # Construct DataFrame for the stocks of the chunk
+        frames.append(pd.DataFrame({
+            'Ticker': chunk,
+            'Sector': [info[ticker]['sector'] for ticker in chunk],
+            'Industry': [info[ticker]['industry'] for ticker in chunk],
+            **{col: snapshots[col].to_numpy() for col in snapshots.columns},
+            'Price': closes.ffill().iloc[-1].round(2).to_numpy(),
+            **{f'MA{w}': ma_func(closes, w).round(2).iloc[-1].to_numpy()
+               for w in ma_wins},
+            f'Volume / VMA{vma_win}': vol_div_vma.iloc[-1].to_numpy(),
+            'EPS RS (%)': eps_rs,
+            'TTM EPS': [info[ticker]['trailingEps'] for ticker in chunk],
+            'Rev RS (%)': rev_rs,
+            'TTM RPS': [info[ticker]['revenuePerShare'] for ticker in chunk],
+            'TTM PE': pes,
+        }))
+
+    # Combine the chunks into a single DataFrame
+    ranking_df = pd.concat(frames, ignore_index=True)
+    if compact:
+        ranking_df = ranking_df.astype({'Sector': 'category',
+                                        'Industry': 'category'})
 
     # Sort by current RS
     ranking_df = ranking_df.sort_values(by='RS', ascending=False)
 
     # Rating based on Relative Strength
     rs_columns = ['RS',]
-    ranking_df = append_ratings(ranking_df, rs_columns)
+    ranking_df = append_ratings(ranking_df, rs_columns, compact=compact)
 
     ranking_df = move_columns_to_end(
         ranking_df,
@@ -386,6 +522,7 @@ def move_columns_to_end(df, columns_to_move):
 def main(period='2y', ma="EMA", out_dir='out'):
     import os
     from datetime import datetime
+    from .results import ResultsStore
     from .stock_indices import get_tickers
 
     code = 'SPX+DJIA+NDX+SOX'
@@ -409,6 +546,9 @@ def main(period='2y', ma="EMA", out_dir='out'):
     filename = f'{code}_stocks_{period}_{ma}_{today}.csv'
     rank.to_csv(os.path.join(out_dir, filename), index=False)
     print(f'Your "{filename}" is in the "{out_dir}" folder.')
+    store = ResultsStore()
+    store.append(f'{code}/rsm_{period}_{ma}/stocks', rank)
+    print(f'The table is appended to "{store.path}".')
     print("***\n")
 
 
@@ -0,0 +1,521 @@
+"""
+Ranking Server
+--------------
+
+Serves IBD RS rankings from a long-lived process. The closes, info and
+ratings of a universe stay in memory (in an `ibd_rs.RSUpdater`), are
+refreshed on a schedule from the latest bars only, and queries are answered
+over HTTP on a TCP port or a Unix socket. The tables are indexed and
+encoded to JSON at each refresh, so a query is a lookup plus a join of
+pre-encoded rows rather than a download and a recomputation.
+
+Endpoints (GET, JSON responses):
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+- ``/top?n=20&by=Rating (RS)``: the top-n stocks by a column (defaults to
+  the stock table order, i.e., by RS).
+- ``/ticker/NVDA``: the row of a ticker.
+- ``/industry/Semiconductors``: the members of an industry, in rank order.
+- ``/industries``: the industry table.
+- ``/screen?min_Rating (RS)=80&Sector=Technology&n=50``: the stocks within
+  ``min_<column>`` / ``max_<column>`` bounds and equal to ``<column>=value``
+  (repeat a parameter for several values), optionally sorted ``by`` a
+  column and limited to ``n`` rows.
+- ``/status``: the date of the last bar and the time of the last refresh.
+
+Usage:
+~~~~~~
+::
+
+    python -m rs_rating.server SPX --port 8000 --refresh 300
+    curl 'http://127.0.0.1:8000/top?n=10'
+
+    python -m rs_rating.server SPX+NDX --unix /tmp/rs_rating.sock
+    curl --unix-socket /tmp/rs_rating.sock 'http://localhost/ticker/NVDA'
+"""
+__author__ = "York <york.jong@gmail.com>"
+__date__ = "2026/10/17 (initial version) ~ 2026/10/17 (last revision)"
+
+__all__ = [
+    'RankingState',
+    'RankingService',
+    'make_server',
+    'serve',
+]
+
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from . import ibd_rs
+
+
+logger = logging.getLogger(__name__)
+
+
+#------------------------------------------------------------------------------
+# Ranking State
+#------------------------------------------------------------------------------
+
+def _encode_rows(df):
+    """Encode every row of a table as a JSON object."""
+    return [json.dumps(row) for row in json.loads(df.to_json(
+        orient='records', date_format='iso'))]
+
+
+def _join(rows, positions):
+    """Join the pre-encoded rows at positions into a JSON array."""
+    return '[' + ','.join(rows[i] for i in positions) + ']'
+
+
+def _count(n):
+    """Return a number of stocks as an int, rejecting negative ones."""
+    n = int(n)
+    if n < 0:
+        raise ValueError(f"n must be non-negative, got {n}")
+    return n
+
+
+class RankingState:
+    """
+    Immutable, indexed snapshot of the stock and industry tables.
+
+    The rows are encoded to JSON once, the numeric columns are kept as
+    NumPy arrays for screens, and the rank order of every numeric column is
+    sorted in advance, so each query returns a JSON string in well under a
+    millisecond for a universe of thousands of stocks.
+
+    Parameters
+    ----------
+    stock_df: pd.DataFrame
+        The stock table, as returned by `ibd_rs.rankings`.
+    industry_df: pd.DataFrame
+        The industry table, as returned by `ibd_rs.rankings`.
+    date: pd.Timestamp, optional
+        The date of the last bar of the tables.
+    """
+    def __init__(self, stock_df, industry_df, date=None):
+        self.stock_df = stock_df.reset_index(drop=True)
+        self.industry_df = industry_df.reset_index(drop=True)
+        self.date = date
+        self.updated_at = time.time()
+
+        self._rows = _encode_rows(self.stock_df)
+        self._industry_rows = _encode_rows(self.industry_df)
+        self._tickers = {t: i for i, t in enumerate(self.stock_df['Ticker'])}
+        self._industries = {}
+        for i, industry in enumerate(self.stock_df['Industry']):
+            self._industries.setdefault(industry, []).append(i)
+
+        # Numeric columns with their descending orders, and the codes of
+        # the other columns, for screens
+        self._values, self._orders, self._codes = {}, {}, {}
+        for col in self.stock_df.columns:
+            series = self.stock_df[col]
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+                self._orders[col] = np.argsort(-values, kind='stable')
+            else:
+                values, uniques = pd.factorize(series.astype(object))
+                self._codes[col] = {u: i for i, u in enumerate(uniques)}
+            self._values[col] = values
+
+    def status(self):
+        """Return the date of the last bar and the time of the refresh."""
+        return json.dumps({
+            'date': None if self.date is None else str(self.date.date()),
+            'updated_at': self.updated_at,
+            'stocks': len(self._rows),
+            'industries': len(self._industry_rows),
+        })
+
+    def top(self, n=20, by=None):
+        """
+        Return the top-n stocks by a numeric column.
+
+        Parameters
+        ----------
+        n: int, optional
+            Number of stocks. Defaults to 20.
+        by: str, optional
+            The column to sort by (descending, NaN last). Defaults to the
+            order of the stock table (by RS).
+
+        Returns
+        -------
+        str
+            A JSON array of the rows.
+
+        Raises
+        ------
+        ValueError
+            If `n` is negative or `by` is not a numeric column.
+        """
+        n = _count(n)
+        if by is None:
+            return _join(self._rows, range(min(n, len(self._rows))))
+        return _join(self._rows, self._order(by)[:n])
+
+    def ticker(self, symbol):
+        """
+        Return the row of a ticker as a JSON object.
+
+        Raises
+        ------
+        KeyError
+            If the ticker is not ranked.
+        """
+        return self._rows[self._tickers[symbol]]
+
+    def industry(self, name):
+        """
+        Return the members of an industry in rank order as a JSON array.
+
+        Raises
+        ------
+        KeyError
+            If no ranked stock belongs to the industry.
+        """
+        return _join(self._rows, self._industries[name])
+
+    def industries(self):
+        """Return the industry table as a JSON array."""
+        return _join(self._industry_rows, range(len(self._industry_rows)))
+
+    def screen(self, filters, by=None, n=None):
+        """
+        Return the stocks matching all filters.
+
+        Parameters
+        ----------
+        filters: dict
+            ``min_<column>`` and ``max_<column>`` keys bound numeric
+            columns (inclusive); a ``<column>`` key takes a value or a list
+            of values of the column.
+        by: str, optional
+            The numeric column to sort by (descending). Defaults to the
+            order of the stock table.
+        n: int, optional
+            The maximum number of stocks. Defaults to all.
+
+        Returns
+        -------
+        str
+            A JSON array of the rows.
+
+        Raises
+        ------
+        ValueError
+            If a filter names an unknown column or bounds a non-numeric
+            one, or `n` is negative.
+        """
+        mask = np.ones(len(self._rows), dtype=bool)
+        for key, value in filters.items():
+            bound, col = None, key
+            if key.startswith(('min_', 'max_')) and key not in self._values:
+                bound, col = key[:3], key[4:]
+            if col not in self._values:
+                raise ValueError(f"unknown column '{col}'")
+            values = self._values[col]
+            if bound is not None:
+                if col not in self._orders:
+                    raise ValueError(f"column '{col}' is not numeric")
+                with np.errstate(invalid='ignore'):
+                    mask &= (values >= float(value) if bound == 'min'
+                             else values <= float(value))
+            else:
+                choices = value if isinstance(value, list) else [value]
+                if col in self._orders:
+                    choices = [float(c) for c in choices]
+                else:
+                    codes = self._codes[col]
+                    choices = [codes[c] for c in choices if c in codes]
+                mask &= np.isin(values, choices)
+
+        order = np.arange(len(mask)) if by is None else self._order(by)
+        positions = order[mask[order]]
+        return _join(self._rows, positions if n is None
+                     else positions[:_count(n)])
+
+    def _order(self, by):
+        """Return the descending order of a numeric column."""
+        if by not in self._orders:
+            raise ValueError(f"'{by}' is not a numeric column")
+        return self._orders[by]
+
+
+#------------------------------------------------------------------------------
+# Ranking Service
+#------------------------------------------------------------------------------
+
+class RankingService:
+    """
+    Keep the rankings of a universe in memory and refresh them on a
+    schedule.
+
+    The state is built by `start` from a full download, then a background
+    thread feeds the latest bars to the `ibd_rs.RSUpdater` every
+    `refresh_every` seconds and rebuilds the updater from a full download
+    every `rebuild_every` seconds (to pick up price adjustments). Each
+    refresh swaps in a new `RankingState`, so queries never wait for it; if
+    a refresh fails, the previous state is kept.
+
+    Parameters
+    ----------
+    tickers: list of str
+        The stock tickers to rank.
+    ticker_ref: str, optional
+        The reference index ticker symbol. Defaults to '^GSPC'.
+    period: str, optional
+        Duration of the initial download. Defaults to '2y'.
+    interval: str, optional
+        Interval of the bars ('1d', '1wk' or '1mo'). Defaults to '1d'.
+    rating_method: str, optional
+        'rank' or 'qcut'. Defaults to 'rank'.
+    rs_window: str, optional
+        '12mo' or '3mo'. Defaults to '12mo'.
+    lookbacks: dict or list, optional
+        The lookback offsets of the past RS columns. Defaults to
+        `ibd_rs.LOOKBACKS`.
+    refresh_every: float, optional
+        Seconds between refreshes. Defaults to 300.
+    rebuild_every: float, optional
+        Seconds between full rebuilds. Defaults to a day.
+    """
+    def __init__(self, tickers, ticker_ref='^GSPC', period='2y',
+                 interval='1d', rating_method='rank', rs_window='12mo',
+                 lookbacks=None, refresh_every=300, rebuild_every=86400):
+        self.tickers = list(tickers)
+        self.ticker_ref = ticker_ref
+        self.period = period
+        self.interval = interval
+        self.rating_method = rating_method
+        self.rs_window = rs_window
+        self.lookbacks = lookbacks
+        self.refresh_every = refresh_every
+        self.rebuild_every = rebuild_every
+
+        self.state = None
+        self._updater = None
+        self._built_at = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Build the initial state and start the refresh thread."""
+        self.rebuild()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='rs_rating-refresh')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def rebuild(self):
+        """Rebuild the updater from a full download and publish it."""
+        updater = ibd_rs.RSUpdater.download(
+            self.tickers, self.ticker_ref, self.period, self.interval,
+            self.rating_method, self.rs_window, self.lookbacks)
+        with self._lock:
+            self._updater = updater
+            self._built_at = time.time()
+            self._publish()
+
+    def refresh(self):
+        """Feed the latest bars to the updater and publish the result."""
+        with self._lock:
+            self._updater.refresh()
+            self._publish()
+
+    def _publish(self):
+        """Swap in the state of the current updater."""
+        stock_df, industry_df = self._updater.rankings()
+        date = self._updater.rs_df().index[-1]
+        self.state = RankingState(stock_df, industry_df, date)
+
+    def _run(self):
+        """Refresh (or rebuild) until stopped."""
+        while not self._stop.wait(self.refresh_every):
+            try:
+                if time.time() - self._built_at >= self.rebuild_every:
+                    self.rebuild()
+                else:
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"Refresh failed, keeping the last state: {e}")
+
+
+#------------------------------------------------------------------------------
+# HTTP Server
+#------------------------------------------------------------------------------
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Route GET requests to the current `RankingState`."""
+    protocol_version = 'HTTP/1.1'
+    # Send the headers and the body in one write (flushed per request)
+    wbufsize = 64 * 1024
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = [unquote(part) for part in url.path.strip('/').split('/')]
+        params = {key: values[0] if len(values) == 1 else values
+                  for key, values in parse_qs(url.query).items()}
+        state = self.server.service.state
+
+        try:
+            status, body = 200, self._query(state, route, params)
+        except KeyError as e:
+            status, body = 404, json.dumps({'error': f'not found: {e}'})
+        except (ValueError, TypeError) as e:
+            status, body = 400, json.dumps({'error': str(e)})
+
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _query(state, route, params):
+        """Return the JSON response of a route."""
+        name, args = route[0], route[1:]
+        if name == 'status':
+            return state.status()
+        if name == 'top' and not args:
+            return state.top(params.pop('n', 20), params.pop('by', None))
+        if name == 'ticker' and len(args) == 1:
+            return state.ticker(args[0])
+        if name == 'industry' and len(args) == 1:
+            return state.industry(args[0])
+        if name == 'industries' and not args:
+            return state.industries()
+        if name == 'screen' and not args:
+            by, n = params.pop('by', None), params.pop('n', None)
+            return state.screen(params, by, n)
+        raise KeyError('/' + '/'.join(route))
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+    """A threading HTTP server on a Unix socket."""
+    daemon_threads = True
+
+
+def make_server(service, host='127.0.0.1', port=8000, unix_socket=None,
+                verbose=False):
+    """
+    Create an HTTP server answering queries from a RankingService.
+
+    Parameters
+    ----------
+    service: RankingService
+        The started service.
+    host: str, optional
+        Host of the TCP server. Defaults to '127.0.0.1'.
+    port: int, optional
+        Port of the TCP server (0 for any free port). Defaults to 8000.
+    unix_socket: str, optional
+        Path of a Unix socket to serve on instead of TCP.
+    verbose: bool, optional
+        Whether to log every request. Defaults to False.
+
+    Returns
+    -------
+    socketserver.BaseServer
+        The server; call its `serve_forever` method.
+    """
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = _UnixHTTPServer(unix_socket, _RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def serve(tickers, host='127.0.0.1', port=8000, unix_socket=None,
+          verbose=False, **kwargs):
+    """
+    Start a RankingService and serve its queries until interrupted.
+
+    Parameters
+    ----------
+    tickers: list of str
+        The stock tickers to rank.
+    host, port, unix_socket, verbose:
+        See `make_server`.
+    **kwargs:
+        Keyword arguments of `RankingService` (e.g., 'ticker_ref',
+        'rs_window', 'rating_method' and 'refresh_every').
+    """
+    service = RankingService(tickers, **kwargs).start()
+    server = make_server(service, host, port, unix_socket, verbose)
+    address = unix_socket or f'http://{host}:{server.server_address[1]}'
+    print(f'Serving {len(service.tickers)} tickers on {address}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        if unix_socket is not None and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+
+#------------------------------------------------------------------------------
+# Command Line
+#------------------------------------------------------------------------------
+
+def main(argv=None):
+    import argparse
+    from .stock_indices import get_tickers
+
+    parser = argparse.ArgumentParser(
+        description='Serve IBD RS rankings from memory.')
+    parser.add_argument('code', help="index code(s), e.g., 'SPX+NDX'")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix', help='path of a Unix socket')
+    parser.add_argument('--ticker-ref', default='^GSPC')
+    parser.add_argument('--rs-window', default='12mo',
+                        choices=['12mo', '3mo'])
+    parser.add_argument('--rating-method', default='rank',
+                        choices=['rank', 'qcut'])
+    parser.add_argument('--refresh', type=float, default=300,
+                        help='seconds between refreshes')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    serve(get_tickers(args.code), args.host, args.port, args.unix,
+          args.verbose, ticker_ref=args.ticker_ref,
+          rs_window=args.rs_window, rating_method=args.rating_method,
+          refresh_every=args.refresh)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,7 @@ Usage Examples:
     index_name = get_name('^NDX')
 """
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/06 (initial version) ~ 2024/10/04 (last revision)"
+__date__ = "2024/08/06 (initial version) ~ 2026/10/17 (last revision)"
 
 __all__ = [
     'get_tickers',
@@ -43,10 +43,8 @@ __all__ = [
 import functools
 from io import StringIO
 
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-import yfinance as yf
+# requests, bs4, pandas and yfinance are imported by the functions that
+# fetch data, so that get_name and the code tables import fast
 
 
 #------------------------------------------------------------------------------
@@ -72,6 +70,10 @@ def table_from_wikipedia(article, class_, id):
     pandas.DataFrame
         The retrieved table.
     """
+    import pandas as pd
+    import requests
+    from bs4 import BeautifulSoup
+
     url = f"https://en.wikipedia.org/wiki/{article}"
     response = requests.get(url)
     response.raise_for_status()
@@ -141,6 +143,8 @@ def table_from_bullishbears(article):
     pd.DataFrame
         The first table found in the specified URL, parsed into a Pandas DataFrame.
     """
+    import pandas as pd
+
     url = f'https://bullishbears.com/{article}'
     return pd.read_html(url)[0]
 
@@ -214,6 +218,9 @@ def us_listed_tickers():
     >>> 'AAPL' in tickers
     True
     """
+    import requests
+    from bs4 import BeautifulSoup
+
     # URL of the target page
     url = 'https://statementdog.com/us-stock-list'
 
@@ -545,6 +552,7 @@ def get_name(index_symbol):
     }
     if index_symbol in dic:
         return dic[index_symbol]
+    import yfinance as yf
     try:
         if yf.Ticker(index_symbol).info['quoteType'] in ('ETF', 'INDEX'):
             return yf.Ticker(index_symbol).info['shortName']
@@ -5,24 +5,32 @@ This module contains various utility functions for retrieving and processing
 stock data using the Yahoo Finance API via the `yfinance` library.
 """
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/26 (initial version) ~ 2025/07/19 (last revision)"
+__date__ = "2024/08/26 (initial version) ~ 2026/10/17 (last revision)"
 
 __all__ = [
     'calc_weighted_metric',
+    'download_prices',
+    'download_price_chunks',
     'fetch_financials',
     'download_financials',
     'download_tickers_info',
+    'fetch_info',
+    'download_financials_async',
+    'download_tickers_info_async',
 ]
 
+import asyncio
 import sys
 import time
-import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from . import cache
+from .instrument import stage, staged
+from .rate_limit import rate_limiter
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -33,6 +41,7 @@ logger.setLevel(logging.DEBUG)
 # Weighted Average Metric (e.g., EPS, Revenue)
 #------------------------------------------------------------------------------
 
+@staged('yf_utils.calc_weighted_metric')
 def calc_weighted_metric(financials, tickers_info, metric, weight_field,
                          threshold=0.7):
     """
@@ -145,11 +154,212 @@ def calc_weighted_metric(financials, tickers_info, metric, weight_field,
     return weighted_avg_metric
 
 
+#------------------------------------------------------------------------------
+# Price Downloading (through the local price store)
+#------------------------------------------------------------------------------
+
+@staged('yf_utils.download_prices')
+def download_prices(tickers, period='2y', interval='1d', fields=None,
+                    max_age=None, store=None):
+    """
+    Download the OHLCV bars of multiple tickers through the local price
+    store.
+
+    The bars are read from a `cache.PriceStore`. Only what is missing is
+    downloaded and merged into the store: the full period for tickers not
+    stored yet (or stored for a shorter period), and the bars since the last
+    stored one for the others. Tickers fetched within `max_age` are not
+    downloaded at all.
+
+    The bar before the last stored one is downloaded again and compared with
+    the stored one. If it differs, the past prices were adjusted (e.g., for
+    a split or a dividend) and the full period of the ticker is downloaded
+    again.
+
+    Parameters
+    ----------
+    tickers: list of str
+        List of ticker symbols.
+    period: str, optional
+        Period of the bars ('1mo', '6mo', '1y', '2y', '5y', 'ytd', 'max',
+        etc.). Defaults to '2y'.
+    interval: str, optional
+        Interval of the bars. Only '1d', '1wk' and '1mo' bars are stored;
+        other intervals are downloaded directly. Defaults to '1d'.
+    fields: list of str, optional
+        Fields to return ('Open', 'High', 'Low', 'Close', 'Volume').
+        Defaults to all fields.
+    max_age: float, optional
+        Maximum age in seconds of stored bars that are used without a
+        download. Defaults to None, which means bars fetched earlier on the
+        same day are used.
+    store: cache.PriceStore, optional
+        The store to use. Defaults to the shared store, or a direct download
+        if the caches are disabled.
+
+    Returns
+    -------
+    pd.DataFrame
+        The bars, in the layout of ``yf.download(..., auto_adjust=True)``
+        (dates x (Price, Ticker)).
+    """
+    import yfinance as yf
+
+    if store is None:
+        store = cache.price_store()
+    if store is None or interval not in store.intervals:
+        with stage('yf.download'):
+            df = yf.download(tickers, period=period, interval=interval,
+                             auto_adjust=True)
+        return df if fields is None else df[sorted(fields)]
+
+    now = time.time()
+    start = period_start(period)
+    since = pd.Timestamp.min if start is None else start
+    coverage = store.coverage(tickers, interval)
+
+    # Group the tickers by what needs to be downloaded
+    full, deltas = [], {}
+    for ticker in tickers:
+        if ticker not in coverage or coverage[ticker][0] > since:
+            full.append(ticker)
+            continue
+        _, fetched_at, dates = coverage[ticker]
+        if _is_fresh(fetched_at, now, max_age):
+            continue
+        # The last bar may be partial; the one before it is the check bar
+        delta_start = dates[max(len(dates) - 2, 0)] if len(dates) else since
+        deltas.setdefault(delta_start, []).append(ticker)
+
+    for delta_start, group in deltas.items():
+        with stage('yf.download'):
+            df = yf.download(group, start=delta_start, interval=interval,
+                             auto_adjust=True)
+        readjusted = _readjusted_tickers(store, df, interval, delta_start)
+        if readjusted:
+            logger.info(f"Past prices were adjusted: {readjusted}")
+            df = df.drop(columns=readjusted, level='Ticker')
+            full += readjusted
+        store.merge(df, interval, fetched_at=now)
+
+    if full:
+        with stage('yf.download'):
+            df = yf.download(full, period=period, interval=interval,
+                             auto_adjust=True)
+        store.merge(df, interval, since=since, fetched_at=now, replace=True)
+
+    return store.load(tickers, interval, start, fields)
+
+
+def download_price_chunks(tickers, chunk_size, period='2y', interval='1d',
+                          fields=None, max_age=None, index=None):
+    """
+    Download the bars of many tickers chunk by chunk.
+
+    Only one chunk of `chunk_size` tickers is downloaded and held at a time,
+    so the peak memory of processing a large universe chunk by chunk does
+    not grow with the number of tickers.
+
+    Parameters
+    ----------
+    tickers: list of str
+        List of ticker symbols.
+    chunk_size: int
+        Number of tickers per chunk.
+    period: str, optional
+        Period of the bars. Defaults to '2y'.
+    interval: str, optional
+        Interval of the bars. Defaults to '1d'.
+    fields: list of str, optional
+        Fields to keep ('Open', 'High', 'Low', 'Close', 'Volume'). Defaults
+        to all fields.
+    max_age: float, optional
+        Maximum age in seconds of stored bars that are used without a
+        download. See `download_prices`.
+    index: pd.DatetimeIndex, optional
+        Dates to reindex every chunk to (e.g., the dates of a reference
+        index), so that all chunks share the same dates.
+
+    Yields
+    ------
+    tuple of (list of str, pd.DataFrame)
+        The tickers of a chunk and their bars, in the layout of
+        `download_prices`.
+    """
+    for i in range(0, len(tickers), chunk_size):
+        chunk = tickers[i:i+chunk_size]
+        df = download_prices(chunk, period, interval, fields, max_age)
+        if index is not None:
+            df = df.reindex(index)
+        yield chunk, df
+
+
+def period_start(period, end=None):
+    """
+    Return the first date of a yfinance period.
+
+    Parameters
+    ----------
+    period: str
+        Period string such as '5d', '3mo', '2y', 'ytd' or 'max'.
+    end: pd.Timestamp, optional
+        The end of the period. Defaults to today.
+
+    Returns
+    -------
+    pd.Timestamp or None
+        The first date of the period, or None for 'max'.
+
+    Examples
+    --------
+    >>> period_start('2y', pd.Timestamp('2024-10-04'))
+    Timestamp('2022-10-04 00:00:00')
+    >>> period_start('ytd', pd.Timestamp('2024-10-04'))
+    Timestamp('2024-01-01 00:00:00')
+    """
+    if end is None:
+        end = pd.Timestamp.today().normalize()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(end.year, 1, 1)
+    for unit, key in (('mo', 'months'), ('wk', 'weeks'),
+                      ('d', 'days'), ('y', 'years')):
+        if period.endswith(unit) and period[:-len(unit)].isdigit():
+            return end - pd.DateOffset(**{key: int(period[:-len(unit)])})
+    raise ValueError(f"Invalid period: {period!r}")
+
+
+def _is_fresh(fetched_at, now, max_age):
+    """Whether data fetched at `fetched_at` can be used without a fetch."""
+    if max_age is None:
+        return time.localtime(fetched_at)[:3] == time.localtime(now)[:3]
+    return now - fetched_at < max_age
+
+
+def _readjusted_tickers(store, df, interval, date, rtol=1e-4):
+    """
+    Return the tickers of `df` whose close on `date` differs from the stored
+    one, i.e., whose past prices have been adjusted since they were stored.
+    """
+    if df.empty or date not in df.index:
+        return []
+    tickers = list(df.columns.get_level_values('Ticker').unique())
+    stored = store.load(tickers, interval, start=date, fields=['Close'])
+    if date not in stored.index:
+        return []
+    old = stored.loc[date, 'Close']
+    new = df.loc[date, 'Close'].reindex(old.index)
+    changed = np.abs(new - old) > rtol * np.abs(old)
+    return list(old.index[changed.to_numpy()])
+
+
 #------------------------------------------------------------------------------
 # Stock Data Downloading
 #------------------------------------------------------------------------------
 
-def fetch_financials(symbol, fields=None, frequency='quarterly'):
+def fetch_financials(symbol, fields=None, frequency='quarterly',
+                     return_raw=False):
     """
     Fetch the financials for a single ticker symbol using yfinance.
 
@@ -162,66 +372,103 @@ def fetch_financials(symbol, fields=None, frequency='quarterly'):
         Defaults to None.
     frequency: str
         The frequency of the financial data ('quarterly' or 'annual').
+    return_raw: bool, optional
+        Whether to also return all fields of the fetched financials (None if
+        the fetch failed). Defaults to False.
 
     Returns
     -------
     DataFrame
-        DataFrame containing the ticker's financials
+        DataFrame containing the ticker's financials. If `return_raw` is
+        True, a tuple of this DataFrame and the DataFrame of all fields is
+        returned.
     """
-    # Add random delay to reduce the risk of being rate-limited
-    time.sleep(random.uniform(.5, .9))  # Delay between .5 and .9 seconds
+    import yfinance as yf
 
     try:
         ticker = yf.Ticker(symbol)
-        try:
-            financials = {
-                'quarterly': ticker.quarterly_financials.T,
-                'annual': ticker.financials.T,
-            }[frequency]
-        except KeyError:
-            raise ValueError("\nFrequency must be 'quarterly' or 'annual'.")
-
-        financials = financials.sort_index(ascending=True)
-
-        if financials.empty:
-            logger.warning(f"\n{symbol}: Financials data is empty, "
-                           "returning NaN-filled DataFrame.")
-            if fields:
-                return pd.DataFrame({field: [np.nan] for field in fields})
-            else:
-                return pd.DataFrame()
+        # Only the requested statement is fetched
+        attr = _financials_attr(frequency)
 
-        if fields:
-            # Check for missing fields and keep only those that exist
-            missing_fields = [field for field in fields
-                              if field not in financials.columns]
-            if missing_fields:
-                logger.warning(
-                    f"\n{symbol}: Missing fields: "
-                    f"{str(missing_fields)} will be filled with NaN.")
+        # Go through the shared rate limiter to avoid being rate-limited
+        with rate_limiter().request(), stage('yf.Ticker.financials'):
+            raw = getattr(ticker, attr)
+        raw = raw.T.sort_index(ascending=True)
+        financials = select_financials(symbol, raw, fields)
 
-            # Ensure all requested fields are present,
-            # adding NaNs for missing fields
-            for field in fields:
-                if field not in financials.columns:
-                    financials[field] = np.nan
+    except Exception as e:
+        logger.error(f"\nError fetching financials for {symbol}: {e}")
+        raw, financials = None, pd.DataFrame(np.nan, index=[0],
+                                             columns=fields)
+    return (financials, raw) if return_raw else financials
 
-            # Filter financials to include only requested fields
-            financials = financials[fields]
 
-        return financials
+def _financials_attr(frequency):
+    """Return the `yf.Ticker` attribute of the financials of a frequency."""
+    try:
+        return {
+            'quarterly': 'quarterly_financials',
+            'annual': 'financials',
+        }[frequency]
+    except KeyError:
+        raise ValueError("\nFrequency must be 'quarterly' or 'annual'.")
 
-    except Exception as e:
-        logger.error(f"\nError fetching financials for {symbol}: {e}")
-        return pd.DataFrame(np.nan, index=[0], columns=fields)
 
+def select_financials(symbol, financials, fields=None):
+    """
+    Select fields from the financials of a ticker.
+
+    Parameters
+    ----------
+    symbol: str
+        Ticker symbol (used in warnings).
+    financials: DataFrame
+        The ticker's financials, one row per period.
+    fields: list, optional
+        List of fields to return. Missing fields are filled with NaN. If
+        None, all fields will be returned.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame containing the selected fields. If `financials` is empty,
+        a NaN-filled DataFrame (or an empty one if `fields` is None).
+    """
+    if financials.empty:
+        logger.warning(f"\n{symbol}: Financials data is empty, "
+                       "returning NaN-filled DataFrame.")
+        if fields:
+            return pd.DataFrame({field: [np.nan] for field in fields})
+        else:
+            return pd.DataFrame()
+
+    if fields:
+        # Check for missing fields and keep only those that exist
+        missing_fields = [field for field in fields
+                          if field not in financials.columns]
+        if missing_fields:
+            logger.warning(
+                f"\n{symbol}: Missing fields: "
+                f"{str(missing_fields)} will be filled with NaN.")
+
+        # Filter financials to include only requested fields, adding NaNs
+        # for missing fields
+        financials = financials.reindex(columns=fields)
+
+    return financials
 
+
+@staged('yf_utils.download_financials')
 def download_financials(symbols, fields=None, frequency='quarterly',
-                        max_workers=3, progress=True):
+                        max_workers=3, progress=True, financials_store=None):
     """
     Downloads the financials (quarterly or annual) of multiple stocks and
     returns the specified fields.
 
+    Financials are read from the local financials store, and only symbols
+    whose next report is expected to be out are fetched again (see
+    `cache.FinancialsStore`).
+
     Parameters
     ----------
     symbols: list of str
@@ -236,6 +483,9 @@ def download_financials(symbols, fields=None, frequency='quarterly',
         Maximum number of threads to use for parallel requests. Defaults to 8.
     progress: bool, optional
         Whether to show a progress bar. Defaults to True.
+    financials_store: cache.FinancialsStore, optional
+        The financials store to use. Defaults to the shared store (none if
+        the caches are disabled).
 
     Returns
     -------
@@ -256,11 +506,25 @@ def download_financials(symbols, fields=None, frequency='quarterly',
     >>> len(epses) >= 4
     True
     """
+    if financials_store is None:
+        financials_store = cache.financials_store()
+
     financials_dict = {}
+    if financials_store is not None and frequency in ('quarterly', 'annual'):
+        stored, symbols = financials_store.get(symbols, frequency)
+        for symbol, raw in stored.items():
+            financials = select_financials(symbol, raw, fields)
+            if not financials.empty:
+                financials_dict[symbol] = financials
+    if not symbols:
+        return financials_dict
+
+    fetched = {}
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_symbol = {
-            executor.submit(fetch_financials, symbol, fields, frequency):
+            executor.submit(fetch_financials, symbol, fields, frequency,
+                            True):
             symbol for symbol in symbols
         }
 
@@ -269,9 +533,12 @@ def download_financials(symbols, fields=None, frequency='quarterly',
         for future in as_completed(future_to_symbol):
             symbol = future_to_symbol[future]
             try:
-                financials = future.result()  # Blocking call, waits for the result
+                # Blocking call, waits for the result
+                financials, raw = future.result()
                 if not financials.empty:
                     financials_dict[symbol] = financials
+                if raw is not None:
+                    fetched[symbol] = raw
 
                 if progress:
                     iteration += 1
@@ -280,14 +547,23 @@ def download_financials(symbols, fields=None, frequency='quarterly',
             except Exception as e:
                 logger.error(f"Error fetching financials for {symbol}: {e}")
 
+    if financials_store is not None and fetched:
+        financials_store.put(fetched, frequency)
+
     return financials_dict
 
 
-def download_tickers_info(symbols, fields=None, max_workers=3, progress=True):
+@staged('yf_utils.download_tickers_info')
+def download_tickers_info(symbols, fields=None, max_workers=3, progress=True,
+                          info_cache=None):
     """
     Downloads the basic information of multiple stocks and returns the
     specified fields.
 
+    When `fields` is given, symbols whose fields are all fresh in the local
+    info cache are served from it, and only the other symbols are fetched
+    (see `cache.InfoCache` for the time-to-live of each field).
+
     Parameters
     ----------
     symbols: list of str
@@ -298,6 +574,9 @@ def download_tickers_info(symbols, fields=None, max_workers=3, progress=True):
         Maximum number of threads to use for parallel requests
     progress: bool
         Whether to show a progress bar
+    info_cache: cache.InfoCache, optional
+        The info cache to use. Defaults to the shared cache (none if the
+        caches are disabled).
 
     Returns
     -------
@@ -314,57 +593,23 @@ def download_tickers_info(symbols, fields=None, max_workers=3, progress=True):
     >>> info['AAPL']['longName']
     'Apple Inc.'
     """
-    def fetch_info(symbol):
-        """
-        Fetch the info for a single ticker symbol using yfinance.
-
-        Parameters
-        ----------
-        symbol: str
-            Ticker symbol as a string
-        Returns
-        -------
-        dict
-            Dictionary containing the ticker's info
-        """
-        # Add random delay to reduce the risk of being rate-limited
-        time.sleep(random.uniform(.5, .9))  # Delay between .5 and .9 seconds
+    if info_cache is None:
+        info_cache = cache.info_cache()
 
-        try:
-            info = yf.Ticker(symbol).info
-            if fields is None:
-                return info
-            if 'symbol' not in info or info['symbol'] != symbol:
-                return {}
-            if 'quoteType' not in info:
-                return {}
-
-            inf = {}
-            # Filter info dictionary to include only requested fields
-            for key in fields:
-                try:
-                    inf[key] = info[key]
-                except KeyError:
-                    if key in ('previousClose', 'trailingEps',
-                               'revenuePerShare', 'trailingPE',
-                               'marketCap', 'sharesOutstanding'):
-                        inf[key] = np.nan  # Default for numeric fields
-                    elif key in ['quoteType', 'sector', 'industry']:
-                        inf[key] = ''  # Default for string fields
-                    else:
-                        inf[key] = None  # Default for other data types
-                        logger.error(
-                            f"\nError fetching data for {symbol}: {e}")
-        except Exception as e:
-            logger.error(f"\nError fetching data for {symbol}: {e}")
-        return inf
+    if fields is not None and info_cache is not None:
+        info_dict, symbols = info_cache.get(symbols, fields)
+    else:
+        info_dict = {}
+    if not symbols:
+        return info_dict
 
-    info_dict = {}
+    fetched = {}
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Submit fetch_info tasks for all symbols to the thread pool
         future_to_symbol = {
-            executor.submit(fetch_info, symbol): symbol for symbol in symbols
+            executor.submit(fetch_info, symbol, fields, True): symbol
+            for symbol in symbols
         }
 
         iteration = 0
@@ -372,9 +617,11 @@ def download_tickers_info(symbols, fields=None, max_workers=3, progress=True):
         for future in as_completed(future_to_symbol):
             symbol = future_to_symbol[future]
             try:
-                info = future.result()  # Blocking call, waits for the result
+                # Blocking call, waits for the result
+                info, raw_info = future.result()
                 if info:
                     info_dict[symbol] = info
+                    fetched[symbol] = {**raw_info, **info}
 
                 if progress:
                     iteration += 1
@@ -383,9 +630,90 @@ def download_tickers_info(symbols, fields=None, max_workers=3, progress=True):
             except Exception as e:
                 logger.error(f"Error fetching info for {symbol}: {e}")
 
+    if info_cache is not None and fetched:
+        info_cache.put(fetched)
+
     return info_dict
 
 
+def fetch_info(symbol, fields=None, return_raw=False):
+    """
+    Fetch the info for a single ticker symbol using yfinance.
+
+    Parameters
+    ----------
+    symbol: str
+        Ticker symbol as a string
+    fields: list, optional
+        List of fields to return. If None, all fields will be returned.
+        Missing fields are filled with a default value (NaN for numeric
+        fields, '' for string fields, and None for others).
+    return_raw: bool, optional
+        Whether to also return the unfiltered info. Defaults to False.
+
+    Returns
+    -------
+    dict
+        Dictionary containing the ticker's info. Empty if the info is not
+        valid for the requested fields. If `return_raw` is True, a tuple of
+        this dictionary and the unfiltered info is returned.
+    """
+    import yfinance as yf
+
+    inf, info = {}, {}
+    try:
+        # Go through the shared rate limiter to avoid being rate-limited
+        with rate_limiter().request(), stage('yf.Ticker.info'):
+            info = yf.Ticker(symbol).info
+        inf = select_info(symbol, info, fields)
+    except Exception as e:
+        logger.error(f"\nError fetching data for {symbol}: {e}")
+    return (inf, info) if return_raw else inf
+
+
+def select_info(symbol, info, fields=None):
+    """
+    Select fields from the info of a ticker.
+
+    Parameters
+    ----------
+    symbol: str
+        Ticker symbol as a string
+    info: dict
+        The unfiltered info of the ticker.
+    fields: list, optional
+        List of fields to return. If None, all fields will be returned.
+        Missing fields are filled with a default value (NaN for numeric
+        fields, '' for string fields, and None for others).
+
+    Returns
+    -------
+    dict
+        Dictionary containing the selected fields. Empty if the info is not
+        valid for the requested fields.
+    """
+    if fields is None:
+        return info
+
+    inf = {}
+    if info.get('symbol') == symbol and 'quoteType' in info:
+        # Filter info dictionary to include only requested fields
+        for key in fields:
+            try:
+                inf[key] = info[key]
+            except KeyError:
+                if key in ('previousClose', 'trailingEps',
+                           'revenuePerShare', 'trailingPE',
+                           'marketCap', 'sharesOutstanding'):
+                    inf[key] = np.nan  # Default for numeric fields
+                elif key in ['quoteType', 'sector', 'industry']:
+                    inf[key] = ''  # Default for string fields
+                else:
+                    inf[key] = None  # Default for other data types
+                    logger.error(f"\n{symbol}: Missing field: {key}")
+    return inf
+
+
 def print_progress_bar(iteration, total, length=48, fill='*', suffix=''):
     """
     Call in a loop to create a terminal progress bar with the percentage in
@@ -435,6 +763,190 @@ def print_progress_bar(iteration, total, length=48, fill='*', suffix=''):
         sys.stdout.flush()
 
 
+#------------------------------------------------------------------------------
+# Asynchronous Downloading
+#------------------------------------------------------------------------------
+
+async def download_tickers_info_async(symbols, fields=None, max_concurrency=8,
+                                      timeout=30., info_cache=None):
+    """
+    Asynchronous version of `download_tickers_info`.
+
+    yfinance is blocking, so each fetch runs in a worker thread after
+    waiting for the shared rate limiter on the event loop, which is never
+    blocked. At most `max_concurrency` fetches are in flight. Cancelling the
+    download cancels the pending fetches (the info fetched so far is still
+    kept in the info cache), and a fetch that times out is abandoned without
+    waiting for its thread.
+
+    Parameters
+    ----------
+    symbols: list of str
+        List of ticker symbols, e.g., ['AAPL', 'MSFT', 'TSLA']
+    fields: list, optional
+        List of fields to return. If None, all fields will be returned.
+    max_concurrency: int, optional
+        Maximum number of fetches in flight. Defaults to 8.
+    timeout: float, optional
+        Timeout in seconds of each fetch. Defaults to 30.
+    info_cache: cache.InfoCache, optional
+        The info cache to use. Defaults to the shared cache (none if the
+        caches are disabled).
+
+    Returns
+    -------
+    dict:
+        A dictionary where each key is a stock ticker, and the value is a
+        dictionary of the specified fields.
+
+    Examples
+    --------
+    >>> info = asyncio.run(download_tickers_info_async(['AAPL', 'MSFT']))
+    >>> info['AAPL']['longName']
+    'Apple Inc.'
+    """
+    if info_cache is None:
+        info_cache = cache.info_cache()
+
+    if fields is not None and info_cache is not None:
+        info_dict, symbols = await asyncio.to_thread(
+            info_cache.get, symbols, fields)
+    else:
+        info_dict = {}
+    if not symbols:
+        return info_dict
+
+    fetched = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def fetch(symbol):
+        async with semaphore:
+            info, raw_info = await _fetch_info_async(
+                symbol, fields, timeout, executor)
+        if info:
+            info_dict[symbol] = info
+            fetched[symbol] = {**raw_info, **info}
+
+    try:
+        await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Keep what was fetched, even if the download was cancelled
+        if info_cache is not None and fetched:
+            await asyncio.shield(asyncio.to_thread(info_cache.put, fetched))
+
+    return info_dict
+
+
+async def download_financials_async(symbols, fields=None,
+                                    frequency='quarterly', max_concurrency=8,
+                                    timeout=30., financials_store=None):
+    """
+    Asynchronous version of `download_financials`.
+
+    Each fetch runs like those of `download_tickers_info_async`.
+
+    Parameters
+    ----------
+    symbols: list of str
+        List of ticker symbols, e.g., ['AAPL', 'MSFT', 'TSLA']
+    fields: list, optional
+        List of fields to return. If None, all fields will be returned.
+    frequency: str
+        The frequency of the financial data ('quarterly' or 'annual').
+        Defaults to 'quarterly'.
+    max_concurrency: int, optional
+        Maximum number of fetches in flight. Defaults to 8.
+    timeout: float, optional
+        Timeout in seconds of each fetch. Defaults to 30.
+    financials_store: cache.FinancialsStore, optional
+        The financials store to use. Defaults to the shared store (none if
+        the caches are disabled).
+
+    Returns
+    -------
+    dict:
+        A dictionary where each key is a stock ticker, and the value is a
+        DataFrame of the ticker's financials.
+    """
+    attr = _financials_attr(frequency)
+    if financials_store is None:
+        financials_store = cache.financials_store()
+
+    financials_dict = {}
+    if financials_store is not None:
+        stored, symbols = await asyncio.to_thread(
+            financials_store.get, symbols, frequency)
+        for symbol, raw in stored.items():
+            financials = select_financials(symbol, raw, fields)
+            if not financials.empty:
+                financials_dict[symbol] = financials
+    if not symbols:
+        return financials_dict
+
+    import yfinance as yf
+
+    fetched = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def fetch(symbol):
+        try:
+            async with semaphore:
+                raw = await _run_rate_limited(
+                    lambda: getattr(yf.Ticker(symbol), attr),
+                    timeout, executor)
+            fetched[symbol] = raw = raw.T.sort_index(ascending=True)
+            financials = select_financials(symbol, raw, fields)
+            if not financials.empty:
+                financials_dict[symbol] = financials
+        except asyncio.TimeoutError:
+            logger.error(f"\nTimeout fetching financials for {symbol}")
+        except Exception as e:
+            logger.error(f"\nError fetching financials for {symbol}: {e}")
+
+    try:
+        await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Keep what was fetched, even if the download was cancelled
+        if financials_store is not None and fetched:
+            await asyncio.shield(asyncio.to_thread(
+                financials_store.put, fetched, frequency))
+
+    return financials_dict
+
+
+async def _fetch_info_async(symbol, fields, timeout, executor):
+    """
+    Asynchronous version of ``fetch_info(symbol, fields, return_raw=True)``.
+    """
+    import yfinance as yf
+
+    inf, info = {}, {}
+    try:
+        info = await _run_rate_limited(lambda: yf.Ticker(symbol).info,
+                                       timeout, executor)
+        inf = select_info(symbol, info, fields)
+    except asyncio.TimeoutError:
+        logger.error(f"\nTimeout fetching data for {symbol}")
+    except Exception as e:
+        logger.error(f"\nError fetching data for {symbol}: {e}")
+    return inf, info
+
+
+async def _run_rate_limited(func, timeout, executor):
+    """
+    Run a blocking request in `executor` through the shared rate limiter,
+    raising asyncio.TimeoutError if it takes longer than `timeout` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    async with rate_limiter().request_async():
+        return await asyncio.wait_for(
+            loop.run_in_executor(executor, func), timeout)
+
+
 #------------------------------------------------------------------------------
 # Unit Test
 #------------------------------------------------------------------------------
@@ -22,7 +22,7 @@ setup(
     author_email = 'york.jong@gmail.com',
     description = 'Stock Rating and Ranking based on Relative Strength',
     long_description = open('README.md').read(),
-    python_requires = '>=3.6',
+    python_requires = '>=3.9',
     packages = find_packages(),
     install_requires = [
         'pandas',